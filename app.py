@@ -21,252 +21,121 @@ This prototype demonstrates the core functionality with synthetic data.
 Production version integrates with India's RBI-regulated Account Aggregator network.
 """
 
+import time
+_RUN_START = time.perf_counter()  # first phase of the startup profile: imports
+
+import functools
+import os
+import sys
 import streamlit as st
 import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-import plotly.graph_objects as go
 import warnings
+from collections import deque
+from itertools import islice
 warnings.filterwarnings('ignore')
 
-# Additional imports for negotiation engine
-import time
-from datetime import datetime, timedelta
+# Headless engine: data, model and agent logic (usable without Streamlit)
+from aura.data import DATA_PATH, load_data as aura_load_data
+from aura.lookup import BorrowerLookup, TYPEAHEAD_LIMIT
+from aura.model import TRAINING_COLS
+from aura.artifacts import artifact_key, load_or_train
+from aura.score_cache import ScoreCache
+from aura.aggregates import dataset_version, portfolio_aggregates
+from aura.agents import (
+    ALERT_PAGE_SIZE, COACHING_COLS, SCORING_COLS, agent_output_from_score, credit_coach_agent_logic, query_alerts,
+)
+from aura.clock import SystemClock, format_timestamp
+from aura.negotiation import NegotiationEngine, decide_offer, decision_reason
+from aura.negotiation_store import (
+    NEGOTIATION_DB, NEGOTIATION_JOURNAL, JournaledNegotiationStore, MemoryNegotiationStore, SQLiteNegotiationStore,
+)
+from aura.profiling import PhaseTimer
+
+# Phases of this script run; the first run per process is kept as the startup profile
+RUN_PROFILE = PhaseTimer(_RUN_START)
+RUN_PROFILE.mark("imports")
 
 # ============================================================================
 # LIVE NEGOTIATION: Backend / Session State Helpers
 # ============================================================================
 
+@st.cache_resource
+def get_shared_negotiation_store(path):
+    """One SQLite connection per server process, shared by every session."""
+    return SQLiteNegotiationStore(path)
+
+@st.cache_resource
+def get_shared_negotiation_journal(path):
+    """One journaled store per server process (recovered from its snapshot + journal on first use)."""
+    return JournaledNegotiationStore(path)
+
+@st.cache_resource
+def get_negotiation_clock():
+    """One clock per server process, so timestamps keep increasing across reruns and sessions."""
+    return SystemClock()
+
+# Negotiation engine over the configured store: durable SQLite when
+# AURA_NEGOTIATION_DB is set, an event-sourced journal when
+# AURA_NEGOTIATION_JOURNAL is set, otherwise per-session memory
+def get_negotiation_engine():
+    if NEGOTIATION_DB:
+        store = get_shared_negotiation_store(NEGOTIATION_DB)
+    elif NEGOTIATION_JOURNAL:
+        store = get_shared_negotiation_journal(NEGOTIATION_JOURNAL)
+    else:
+        store = st.session_state.setdefault("negotiation_store", MemoryNegotiationStore())
+    return NegotiationEngine(store, clock=get_negotiation_clock())
+
 # Initialize session state keys (safe to call repeatedly)
 def init_negotiation_state():
-    st.session_state.setdefault("negotiations", {})           # dict: user_id -> negotiation details
-    st.session_state.setdefault("funds_recovered", 0)         # total amount agent recovered
     st.session_state.setdefault("active_user", None)          # current user in demo
-    st.session_state.setdefault("negotiation_log", [])        # chronological log entries
-    st.session_state.setdefault("agent_decision_log", [])     # autonomous agent decisions (reason trace)
+    get_negotiation_engine()
 
 # Create demo borrower (idempotent with custom params)
 def get_or_create_demo_user(user_id="USR1001", name="Gulam", wallet=2000, missed_amount=2000, offer_amount=500, expiry_days=7):
-    # If you already have df with 'user_id', you can map to actual row. For demo, create a mini dict.
-    if user_id not in st.session_state.get("negotiations", {}):
-        demo = {
-            "user_id": user_id,
-            "name": name,
-            "wallet": wallet,
-            "missed_amount": missed_amount,
-            "offer_amount": offer_amount,
-            "expiry_days": expiry_days,
-            "status": "pending",
-            "started_at": datetime.utcnow().isoformat(),
-            "accepted_at": None,
-            "last_message": None,
-            "chat_history": []  # store conversation thread
-        }
-        st.session_state["negotiations"][user_id] = demo
+    engine = get_negotiation_engine()
+    if user_id not in engine.store:
         st.session_state["active_user"] = user_id
-        st.session_state["negotiation_log"].append(
-            (datetime.utcnow().isoformat(), f"Demo user {user_id} created")
-        )
-    return st.session_state["negotiations"][user_id]
+    return engine.get_or_create_demo_user(user_id, name, wallet, missed_amount, offer_amount, expiry_days)
 
 # Seed multiple demo users with varied profiles
 def seed_demo_users():
-    profiles = [
-        {"user_id": "USR1001", "name": "Gulam", "wallet": 2000, "missed_amount": 2000, "offer_amount": 500, "expiry_days": 7},
-        {"user_id": "USR1002", "name": "Priya", "wallet": 1500, "missed_amount": 1800, "offer_amount": 400, "expiry_days": 10},
-        {"user_id": "USR1003", "name": "Raj", "wallet": 3000, "missed_amount": 2500, "offer_amount": 800, "expiry_days": 5},
-        {"user_id": "USR1004", "name": "Anjali", "wallet": 1200, "missed_amount": 1500, "offer_amount": 350, "expiry_days": 14},
-    ]
-    for profile in profiles:
-        get_or_create_demo_user(**profile)
+    get_negotiation_engine().seed_demo_users()
 
 # Start negotiation (idempotent start)
 def start_negotiation(user_id, offer_amount=None, expiry_days=None, agent_message=None, decision_reason=None):
-    init_negotiation_state()
-    negos = st.session_state["negotiations"]
-    if user_id not in negos:
-        get_or_create_demo_user(user_id)
-    entry = negos[user_id]
-    # If already restructured, do nothing
-    if entry["status"] == "restructured":
-        return entry
-    # populate/overwrite offer fields if provided
-    if offer_amount is not None:
-        entry["offer_amount"] = int(offer_amount)
-    if expiry_days is not None:
-        entry["expiry_days"] = int(expiry_days)
-    entry["status"] = "offer_sent"
-    entry["started_at"] = entry.get("started_at") or datetime.utcnow().isoformat()
-    entry["last_message"] = agent_message or (
-        f"Hi {entry['name']}, you missed your payment. I see you have ₹{entry['wallet']:,}. "
-        f"If you pay ₹{entry['offer_amount']:,} today, I can extend the rest for {entry['expiry_days']} days. Do you accept?"
-    )
-    # Append agent message to chat history for continuity
-    entry.setdefault("chat_history", [])
-    entry["chat_history"].append({
-        "role": "agent",
-        "message": entry["last_message"],
-        "timestamp": datetime.utcnow().isoformat()
-    })
-    st.session_state["negotiation_log"].append(
-        (datetime.utcnow().isoformat(), f"Offer sent to {user_id}: ₹{entry['offer_amount']}")
-    )
-    if decision_reason:
-        st.session_state["agent_decision_log"].append({
-            "user_id": user_id,
-            "offer": entry['offer_amount'],
-            "expiry": entry['expiry_days'],
-            "reason": decision_reason,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-    return entry
+    return get_negotiation_engine().start_negotiation(user_id, offer_amount, expiry_days, agent_message, decision_reason)
 
 # Accept offer (idempotent and safe)
 def accept_offer(user_id):
-    init_negotiation_state()
-    negos = st.session_state["negotiations"]
-    if user_id not in negos:
-        raise ValueError("No negotiation exists for user_id=" + str(user_id))
-    entry = negos[user_id]
-    # If already accepted/restructured, return unchanged (no double counting)
-    if entry.get("status") == "restructured":
-        return entry
-    # Only accept if offer was sent (simple happy path guard)
-    if entry.get("status") not in ("offer_sent", "pending"):
-        # still allow accept for demo, but log it
-        st.session_state["negotiation_log"].append(
-            (datetime.utcnow().isoformat(), f"Accept invoked for {user_id} but status was {entry.get('status')}")
-        )
-    # update accepted
-    entry["status"] = "restructured"
-    entry["accepted_at"] = datetime.utcnow().isoformat()
-    # increment funds_recovered by the offered immediate payment, safe-guarded
-    recovered = entry.get("offer_amount", 0)
-    # detect if already counted (add a flag)
-    if not entry.get("_counted"):
-        st.session_state["funds_recovered"] = int(st.session_state.get("funds_recovered", 0)) + int(recovered)
-        entry["_counted"] = True
-    # Add to chat history
-    entry["chat_history"] = entry.get("chat_history", [])
-    entry["chat_history"].append({
-        "role": "borrower",
-        "message": "I accept the offer. Thank you!",
-        "timestamp": datetime.utcnow().isoformat()
-    })
-    st.session_state["negotiation_log"].append(
-        (datetime.utcnow().isoformat(), f"{user_id} accepted offer; recovered ₹{recovered}")
-    )
-    return entry
+    return get_negotiation_engine().accept_offer(user_id)
 
 # Add message to chat history
 def add_chat_message(user_id, role, message):
-    if user_id in st.session_state["negotiations"]:
-        entry = st.session_state["negotiations"][user_id]
-        entry["chat_history"] = entry.get("chat_history", [])
-        entry["chat_history"].append({
-            "role": role,
-            "message": message,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        st.session_state["negotiation_log"].append(
-            (datetime.utcnow().isoformat(), f"{user_id} ({role}): {message[:50]}...")
-        )
+    get_negotiation_engine().add_chat_message(user_id, role, message)
+
+# One page of a user's conversation (oldest first) and its length
+def chat_page(user_id, offset, limit):
+    return get_negotiation_engine().store.chat_page(user_id, offset, limit)
+
+def chat_count(user_id):
+    return get_negotiation_engine().store.chat_count(user_id)
 
 # Simple getter for summary info
 def negotiation_summary():
-    init_negotiation_state()
-    total = st.session_state.get("funds_recovered", 0)
-    negotiations = st.session_state.get("negotiations", {})
-    counts = {"pending":0, "offer_sent":0, "restructured":0, "rejected":0}
-    for v in negotiations.values():
-        counts[v.get("status","pending")] = counts.get(v.get("status","pending"), 0) + 1
-    return {"total_recovered": total, "counts": counts, "negotiations": negotiations, "log": st.session_state.get("negotiation_log", []), "decisions": st.session_state.get("agent_decision_log", [])}
+    return get_negotiation_engine().negotiation_summary()
 
 # ---------------------------------------------------------------------------
-# Agent Policy & Autonomous Functions
+# Agent Policy & Autonomous Functions (decide_offer lives in aura.negotiation)
 # ---------------------------------------------------------------------------
-import re
-
-def decide_offer(entry):
-    """Policy function selecting offer & expiry with rationale.
-    Heuristic tiers based on wallet and missed_amount.
-    """
-    wallet = entry.get('wallet', 0)
-    missed = entry.get('missed_amount', 0)
-    # Base offer: 25% of missed, capped by wallet, min 250
-    raw_offer = int(max(250, min(wallet, missed * 0.25)))
-    # Risk proxy: ratio missed/wallet (higher ratio => more constrained)
-    ratio = missed / wallet if wallet else 1
-    if ratio > 1.2:
-        expiry = 14
-        strategy = "High burden detected; extending window to encourage partial recovery." 
-    elif ratio > 0.8:
-        expiry = 10
-        strategy = "Moderate burden; balanced short extension." 
-    else:
-        expiry = 7
-        strategy = "Low relative burden; shorter grace to maintain momentum."
-    message = (
-        f"Hello {entry['name']}. I assessed your situation: missed ₹{missed:,} vs wallet ₹{wallet:,}. "
-        f"If you can clear ₹{raw_offer:,} today, I will extend the remaining balance for {expiry} days." 
-        " Does this work for you?"
-    )
-    reason = f"offer={raw_offer} expiry={expiry} ratio={ratio:.2f}; {strategy}"
-    return raw_offer, expiry, message, reason
 
 def auto_negotiate_all():
     """Scan pending users and autonomously initiate negotiations using policy."""
-    init_negotiation_state()
-    actions = 0
-    for user_id, entry in st.session_state["negotiations"].items():
-        if entry.get('status') == 'pending' and entry.get('wallet',0) >= 300:
-            offer, expiry, msg, reason = decide_offer(entry)
-            start_negotiation(user_id, offer_amount=offer, expiry_days=expiry, agent_message=msg, decision_reason=reason)
-            actions += 1
-    return actions
+    return get_negotiation_engine().auto_negotiate_all()
 
 def handle_counter_offer_text(user_id, text):
     """Parse borrower counter offer and adapt decision if within acceptable bounds."""
-    if user_id not in st.session_state.get('negotiations', {}):
-        return "No active negotiation."
-    entry = st.session_state['negotiations'][user_id]
-    nums = re.findall(r"\d+", text.replace('₹',''))
-    if not nums:
-        return "I noted your response. Could you specify an amount (e.g., 300)?"
-    proposed = int(nums[0])
-    current = entry.get('offer_amount', 0)
-    min_threshold = max(200, int(current * 0.5))  # do not go below 50% of original offer (or ₹200)
-    if proposed >= current:
-        # Accept immediately at current terms
-        add_chat_message(user_id, 'agent', f"Your proposed amount matches or exceeds the offer (₹{proposed}). Proceeding to restructure.")
-        accept_offer(user_id)
-        return f"Accepted at ₹{proposed}. Restructuring confirmed."
-    elif proposed >= min_threshold:
-        # Adjust offer downward, then accept
-        entry['offer_amount'] = proposed
-        add_chat_message(user_id, 'agent', f"I can approve ₹{proposed} today with same {entry['expiry_days']} day extension. Processing...")
-        accept_offer(user_id)
-        # Log decision adaptation
-        st.session_state['agent_decision_log'].append({
-            'user_id': user_id,
-            'offer': proposed,
-            'expiry': entry['expiry_days'],
-            'reason': f"Counter-offer accepted. Proposed {proposed} >= threshold {min_threshold}.",
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        return f"Counter-offer accepted at ₹{proposed}."
-    else:
-        add_chat_message(user_id, 'agent', f"₹{proposed} is below the feasible threshold (₹{min_threshold}). Could you meet at ₹{min_threshold}?")
-        st.session_state['agent_decision_log'].append({
-            'user_id': user_id,
-            'offer': current,
-            'expiry': entry['expiry_days'],
-            'reason': f"Counter too low ({proposed} < {min_threshold}). Suggested minimum.",
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        return f"₹{proposed} is too low; minimum acceptable is ₹{min_threshold}."
+    return get_negotiation_engine().handle_counter_offer_text(user_id, text)
 
 # ============================================================================
 # CONFIGURATION
@@ -278,6 +147,7 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+RUN_PROFILE.mark("page config")
 
 # Enterprise-Grade FinTech CSS (Government/Banking Standard)
 st.markdown("""
@@ -660,144 +530,72 @@ st.markdown("""
     }
 </style>
 """, unsafe_allow_html=True)
+RUN_PROFILE.mark("css")
 
 # ============================================================================
 # CORE AGENT LOGIC FUNCTIONS (THE "BRAIN")
 # ============================================================================
 
 @st.cache_data
-def load_data():
+def load_data(columns=None):
     """
-    DATA AGGREGATION AGENT (Agent #1)
-    
-    In production: Integrates with India's Account Aggregator (AA) framework
-    - RBI-regulated consent-based data sharing
-    - Access to verified financial data from 1.6B+ linked accounts
-    - Includes: bank transactions, investments, insurance, GST returns
+    DATA AGGREGATION AGENT (Agent #1) - cached for the UI.
     
-    For demo: Generates synthetic alternative data simulating AA sources.
-    Uses caching for performance optimization.
+    See aura.data.load_data; Streamlit caching keeps reruns from re-reading data.
+    Pass columns to read only what a page needs (cheap on column stores).
     """
-    try:
-        # Try to load from CSV
-        df = pd.read_csv('synthetic_creditarax_dataset.csv')
-        return df
-    except FileNotFoundError:
-        # Generate synthetic data if file not found
+    if not os.path.exists(DATA_PATH):
         st.info("📊 Simulating Account Aggregator data sources for demo...")
-        return generate_synthetic_dataset()
+    return aura_load_data(columns=columns)
 
-def generate_synthetic_dataset():
+@st.cache_resource(max_entries=2)
+def get_borrower_lookup(data_version):
     """
-    Generate synthetic credit dataset with alternative data features.
+    user_id index over the portfolio, built once per dataset version.
     
-    Simulates data from Account Aggregator sources:
-    - Network usage → Telecom providers (income proxy)
-    - Utility payments → Electricity/water companies (payment discipline)
-    - E-commerce → Transaction platforms (spending capacity)
-    - Mobility → Location services (employment stability)
-    - Device usage → Digital behavior patterns (lifestyle consistency)
-    
-    These signals exist for 142M Indians with dormant accounts who lack credit history.
+    Typeahead searches and row fetches on the Credit-Coach page use it
+    instead of listing or scanning every user_id. Only COACHING_COLS are
+    loaded (or read per row from a column store).
     """
-    np.random.seed(42)
-    num_users = 150
-    
-    data = {
-        'user_id': [f'USR{1000 + i}' for i in range(num_users)],
-        'loan_amount': np.random.randint(5000, 50000, num_users),
-        
-        # Alternative Data Signals (Account Aggregator sources)
-        'network_usage_stability': np.random.uniform(0.2, 0.98, num_users),  # Telecom
-        'utility_payment_timeliness': np.random.uniform(0.3, 0.99, num_users),  # Utility providers
-        'mobility_score': np.random.uniform(0.4, 0.95, num_users),  # Location services
-        'ecommerce_transaction_frequency': np.random.randint(1, 50, num_users),  # E-commerce platforms
-        'social_network_connectivity': np.random.uniform(0.1, 0.9, num_users),  # Digital footprint
-        'device_usage_consistency': np.random.uniform(0.3, 0.95, num_users),  # Device analytics
-        
-        # Contextual data for agent intelligence
-        'last_active_location': np.random.choice(['Bandra', 'Andheri', 'Thane', 'Dadar', 'Navi Mumbai'], num_users),
-        'last_ecommerce_category': np.random.choice(['Groceries', 'Electronics', 'Fashion', 'Transport', 'Bills'], num_users),
-    }
-    
-    df = pd.DataFrame(data)
-    
-    # Calculate default probability based on features (ground truth for training)
-    # Weights based on global research (Tala, Branch, LenddoEFL studies)
-    df['default_probability'] = (
-        (1 - df['network_usage_stability']) * 0.25 +
-        (1 - df['utility_payment_timeliness']) * 0.30 +  # Strongest predictor
-        (1 - df['mobility_score']) * 0.15 +
-        (1 - df['device_usage_consistency']) * 0.20 +
-        (1 - df['social_network_connectivity']) * 0.10
-    )
-    
-    # Add realistic noise
-    df['default_probability'] = df['default_probability'].clip(0.01, 0.65) + np.random.normal(0, 0.05, num_users)
-    df['default_probability'] = df['default_probability'].clip(0.01, 0.85)
-    
-    # Create binary default label for model training
-    df['default_label'] = (df['default_probability'] > 0.35).astype(int)
-    
-    return df
+    return BorrowerLookup(DATA_PATH, COACHING_COLS)
 
 @st.cache_resource
 def train_model(df):
     """
-    RISK ASSESSMENT AGENT (Agent #3)
-    
-    Trains ML ensemble for default prediction using Random Forest.
+    RISK ASSESSMENT AGENT (Agent #3) - cached for the UI.
     
-    Production upgrade path:
-    - Add XGBoost, LightGBM for ensemble diversity
-    - Implement CKKS Homomorphic Encryption (TenSEAL library)
-    - Enable inference on encrypted data (zero exposure)
-    
-    Returns: trained model, scaler, feature columns, and performance metrics.
+    See aura.model.train_model. Backed by the on-disk artifact cache, so fresh
+    server processes load the fitted model instead of retraining it.
+    Returns: model, scaler, feature columns, metrics.
     """
-    # Define feature columns (alternative data sources)
-    feature_cols = [
-        'loan_amount',
-        'network_usage_stability',
-        'utility_payment_timeliness',
-        'mobility_score',
-        'ecommerce_transaction_frequency',
-        'social_network_connectivity',
-        'device_usage_consistency'
-    ]
-    
-    X = df[feature_cols]
-    y = df['default_label']
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-    
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Train Random Forest model
-    model = RandomForestClassifier(
-        n_estimators=100,
-        max_depth=10,
-        min_samples_split=5,
-        random_state=42,
-        class_weight='balanced'
-    )
-    model.fit(X_train_scaled, y_train)
-    
-    # Calculate metrics
-    train_score = model.score(X_train_scaled, y_train)
-    test_score = model.score(X_test_scaled, y_test)
-    
-    metrics = {
-        'train_accuracy': train_score,
-        'test_accuracy': test_score,
-        'feature_importance': dict(zip(feature_cols, model.feature_importances_))
-    }
+    return load_or_train(df)
+
+@st.cache_data
+def get_model_version(df):
+    """Version id of the model train_model(df) serves (its artifact key)."""
+    return artifact_key(df)
+
+@st.cache_resource(max_entries=4)
+def get_scored_portfolio(data_version, model_version, _model, _scaler, feature_cols):
+    """
+    score_portfolio frame for one (dataset version, model version), shared by reruns and sessions.
     
-    return model, scaler, feature_cols, metrics
+    Only a new dataset or model reloads SCORING_COLS and goes through the
+    ScoreCache (which then rescores only new or changed borrowers). The frame
+    is shared: callers must not modify it.
+    """
+    df = aura_load_data(columns=SCORING_COLS)
+    return get_score_cache().score_portfolio(df, _model, _scaler, feature_cols, model_version)
+
+@st.cache_data(max_entries=8)
+def get_portfolio_aggregates(data_version, model_version, _scored):
+    """Overview-card aggregates, computed once per (dataset version, model version)."""
+    return portfolio_aggregates(_scored)
+
+@st.cache_resource
+def get_score_cache():
+    """Process-wide score cache so reruns only rescore new or changed borrowers."""
+    return ScoreCache()
 
 def simulate_homomorphic_encryption(data):
     """
@@ -819,209 +617,33 @@ def simulate_homomorphic_encryption(data):
     st.caption("Production: TenSEAL library with CKKS scheme for encrypted inference")
     return data
 
-def risk_management_agent_logic(borrower_row, model, scaler, feature_cols):
-    """
-    RISK-MANAGEMENT AGENT (Agent #5) - Lender-Facing Intelligence
-    
-    Autonomous decision-making agent that:
-    1. Analyzes borrower data using ML model
-    2. Identifies risk factors proactively
-    3. Generates SPECIFIC, actionable intervention recommendations
-    4. Provides ethical recovery intelligence
-    
-    Production enhancements:
-    - SHAP values for global explainability (regulatory compliance)
-    - Reinforcement learning for optimal intervention strategies
-    - Real-time AA data sync for continuous monitoring
-    
-    Args:
-        borrower_row: Single borrower's data (pandas Series)
-        model: Trained ML model
-        scaler: Fitted StandardScaler
-        feature_cols: List of feature column names
-    
-    Returns:
-        Dictionary with status, probability, recommendation, and risk factors
-    """
-    # Extract features
-    features = borrower_row[feature_cols].values.reshape(1, -1)
-    features_scaled = scaler.transform(features)
-    
-    # Get prediction probability
-    default_prob = model.predict_proba(features_scaled)[0][1]
-    
-    # Identify risk factors (features below 0.5 are concerning)
-    risk_factors = []
-    if borrower_row['network_usage_stability'] < 0.5:
-        risk_factors.append(f"Unstable network usage ({borrower_row['network_usage_stability']:.2f})")
-    if borrower_row['utility_payment_timeliness'] < 0.6:
-        risk_factors.append(f"Delayed utility payments ({borrower_row['utility_payment_timeliness']:.2f})")
-    if borrower_row['device_usage_consistency'] < 0.5:
-        risk_factors.append(f"Inconsistent device usage ({borrower_row['device_usage_consistency']:.2f})")
-    if borrower_row['mobility_score'] < 0.5:
-        risk_factors.append(f"High mobility/instability ({borrower_row['mobility_score']:.2f})")
-    
-    # Determine status and recommendation
-    if default_prob > 0.45:
-        status = 'High Risk - Defaulted'
-        recommendation = f"""
-        **URGENT ACTION REQUIRED**
-        - **Immediate Intervention**: Assign dedicated relationship manager
-        - **Contact Strategy**: Reach out via SMS/Call during optimal window (6-8 PM)
-        - **Location Intelligence**: Last active near {borrower_row['last_active_location']}
-        - **Restructuring Offer**: Propose loan restructuring with 15-day grace period
-        - **Recovery Approach**: Empathetic, solution-focused communication
-        """
-    elif default_prob > 0.25:
-        status = 'At Risk'
-        recommendation = f"""
-        **PROACTIVE INTERVENTION RECOMMENDED**
-        - **Action**: Send personalized SMS offering 7-day payment extension
-        - **Messaging**: Emphasize this will NOT affect credit profile
-        - **Incentive**: Offer 2% discount for early repayment
-        - **Timing**: Best contact window is 6-8 PM based on activity patterns
-        - **Follow-up**: Schedule check-in call in 3 days
-        """
-    else:
-        status = 'Active & Healthy'
-        recommendation = f"""
-        **PORTFOLIO MANAGEMENT**
-        - **Status**: Borrower performing well, no immediate action needed
-        - **Opportunity**: Consider offering credit limit increase or loyalty rewards
-        - **Engagement**: Send quarterly financial wellness tips
-        - **Upsell**: Good candidate for additional financial products
-        """
-    
-    return {
-        'status': status,
-        'probability': default_prob,
-        'recommendation': recommendation,
-        'risk_factors': risk_factors,
-        'user_id': borrower_row['user_id'],
-        'loan_amount': borrower_row['loan_amount'],
-        'location': borrower_row['last_active_location']
-    }
-
-def credit_coach_agent_logic(borrower_row):
-    """
-    CREDIT-COACH AGENT (Agent #6) - Borrower-Facing Empowerment
-    
-    Transforms rejection into a growth opportunity by:
-    1. Analyzing borrower's weakest financial behaviors
-    2. Creating personalized 30-day improvement roadmap
-    3. Providing actionable steps with impact estimates (+15%, +10%)
-    4. Encouraging re-application with updated profile
-    
-    Production enhancements:
-    - LIME explanations (local, personalized transparency)
-    - Gamified financial literacy quizzes
-    - Progress tracking and milestone rewards
-    - WhatsApp/SMS chatbot integration
-    - Multilingual support (Hindi, Tamil, Telugu, etc.)
-    
-    Philosophy: "Not rejected—just not yet ready"
-    Impact: 25-35% improvement in creditworthiness over 30 days
-    
-    Args:
-        borrower_row: Single row of borrower data (pandas Series)
-    
-    Returns:
-        String containing personalized coaching plan
-    """
-    user_id = borrower_row['user_id']
-    
-    # Identify weakest areas
-    weak_areas = []
-    if borrower_row['network_usage_stability'] < 0.6:
-        weak_areas.append({
-            'area': 'Network Usage Stability',
-            'score': borrower_row['network_usage_stability'],
-            'advice': 'Maintain consistent mobile data usage patterns. This shows financial stability.'
-        })
-    if borrower_row['utility_payment_timeliness'] < 0.7:
-        weak_areas.append({
-            'area': 'Utility Payment Timeliness',
-            'score': borrower_row['utility_payment_timeliness'],
-            'advice': 'Pay electricity and water bills before due date. Set up auto-pay or reminders.'
-        })
-    if borrower_row['device_usage_consistency'] < 0.6:
-        weak_areas.append({
-            'area': 'Device Usage Consistency',
-            'score': borrower_row['device_usage_consistency'],
-            'advice': 'Regular device usage indicates stability. Try to maintain consistent patterns.'
-        })
-    if borrower_row['mobility_score'] < 0.6:
-        weak_areas.append({
-            'area': 'Location Stability',
-            'score': borrower_row['mobility_score'],
-            'advice': 'Frequent location changes can be a concern. If moving, update your profile.'
-        })
-    
-    # Sort by score (lowest first)
-    weak_areas.sort(key=lambda x: x['score'])
-    
-    # Build personalized coaching plan
-    if len(weak_areas) == 0:
-        coaching_plan = f"""
-        ### 🎉 Excellent Work, {user_id}!
-        
-        Your credit profile is looking strong! Here's how to maintain it:
-        
-        ✅ **Keep Up The Great Work:**
-        - Continue paying all bills on time
-        - Maintain your current usage patterns
-        - You're on track for better loan terms and credit limits
-        
-        💡 **Next Level:**
-        - Consider building an emergency fund (3-6 months expenses)
-        - Explore investment options to grow your wealth
-        - You may qualify for premium financial products
-        
-        **Your current loan approval probability: >85%** 🌟
-        """
-    else:
-        top_two = weak_areas[:2]
-        coaching_plan = f"""
-        ### 👋 Hi {user_id}! Let's Boost Your Credit Profile
-        
-        I've analyzed your data, and I have a simple 30-day plan to improve your loan eligibility:
-        
-        🎯 **Focus Area #1: {top_two[0]['area']}**
-        - Current Score: {top_two[0]['score']:.2f}/1.00
-        - 📋 Action: {top_two[0]['advice']}
-        - 🎁 Impact: This alone can improve your approval chances by 15-20%
-        
-        """
-        
-        if len(top_two) > 1:
-            coaching_plan += f"""
-        🎯 **Focus Area #2: {top_two[1]['area']}**
-        - Current Score: {top_two[1]['score']:.2f}/1.00
-        - 📋 Action: {top_two[1]['advice']}
-        - 🎁 Impact: Combined with Area #1, this boosts chances by 30-35%
-        
-        """
-        
-        coaching_plan += f"""
-        ⏰ **30-Day Challenge:**
-        - Week 1-2: Focus on Area #1
-        - Week 3-4: Add Area #2
-        - Check back with me in 30 days to see your progress!
-        
-        💪 **You've got this!** Small, consistent actions lead to big results.
-        
-        **Estimated improvement potential: +25-35% in approval probability**
-        """
-    
-    return coaching_plan
-
 # ============================================================================
 # UI COMPONENTS (THE "FACE")
 # ============================================================================
 
 def main():
-    """Main application entry point with navigation."""
-    
+    """Main application entry point with navigation; records the run time as "full page"."""
+    start = time.perf_counter()
+    try:
+        render_app()
+    finally:
+        record_latency("full page", time.perf_counter() - start)
+        keep_startup_profile(RUN_PROFILE)
+
+@st.cache_resource
+def startup_profile():
+    """Process-wide holder for the first script run's PhaseTimer."""
+    return {}
+
+def keep_startup_profile(profile):
+    """Keep the first run's profile (and print it when AURA_STARTUP_PROFILE is set)."""
+    holder = startup_profile()
+    if 'profile' not in holder:
+        holder['profile'] = profile
+        if os.environ.get('AURA_STARTUP_PROFILE'):
+            print(profile.report(), file=sys.stderr, flush=True)
+
+def render_app():
     # Initialize negotiation state early
     init_negotiation_state()
     
@@ -1155,47 +777,117 @@ def main():
         with col1:
             if st.button("Create USR1001"):
                 result = get_or_create_demo_user("USR1001")
-                st.json(result)
+                st.json(dict(result))
         with col2:
             if st.button("Start Negotiation"):
                 result = start_negotiation("USR1001")
                 st.success(f"Offer sent: ₹{result['offer_amount']}")
-                st.json(result)
+                st.json(dict(result))
         with col3:
             if st.button("Accept Offer"):
                 result = accept_offer("USR1001")
                 st.balloons()
                 st.success(f"✅ Restructured! Recovered: ₹{result['offer_amount']}")
-                st.json(result)
+                st.json(dict(result))
         with col4:
             if st.button("Show Summary"):
                 summary = negotiation_summary()
                 st.metric("Total Recovered", f"₹{summary['total_recovered']:,}")
-                st.json(summary)
+                st.json({**summary, "negotiations": {uid: dict(entry) for uid, entry in summary["negotiations"].items()}})
         
-        st.markdown("**Session State Snapshot:**")
+        st.markdown("**Negotiation Store Snapshot:**")
+        store = get_negotiation_engine().store
+        # First few negotiations only (chat is fetched per page in the Borrower view)
         st.json({
-            "negotiations": st.session_state.get("negotiations", {}),
-            "funds_recovered": st.session_state.get("funds_recovered", 0),
-            "negotiation_log": st.session_state.get("negotiation_log", [])[-5:]  # last 5 entries
+            "negotiations": {uid: dict(entry) for uid, entry in islice(store.negotiations.items(), 5)},
+            "total_negotiations": len(store.negotiations),
+            "funds_recovered": store.funds_recovered,
+            "negotiation_log": store.recent_log(5)  # last 5 entries
         })
+        
+        profile = startup_profile().get('profile')
+        if profile:
+            st.markdown("**Startup Profile (first run of this server process):**")
+            st.code(profile.report())
     
-    # Load data and train model
-    with st.spinner("Initializing AI agents and ML models..."):
-        df = load_data()
-        model, scaler, feature_cols, metrics = train_model(df)
+    RUN_PROFILE.mark("layout")
     
-    # Route to appropriate page
-    if page == "Risk-Management Agent":
-        render_risk_management_dashboard(df, model, scaler, feature_cols)
-    elif page == "Credit-Coach Agent":
-        render_credit_coach_demo(df)
-    elif page == "Live Negotiation":
+    # Route to appropriate page (each page loads only the columns it reads);
+    # only the scoring pages load the model, and with it sklearn
+    if page == "Live Negotiation":
         render_live_negotiation_page()
+    elif page == "Credit-Coach Agent":
+        render_credit_coach_demo(get_borrower_lookup(dataset_version(DATA_PATH)))
+    else:
+        # Load data and train model
+        with st.spinner("Initializing AI agents and ML models..."):
+            training_df = load_data(TRAINING_COLS)
+            model, scaler, feature_cols, metrics = train_model(training_df)
+        RUN_PROFILE.mark("data + model")
+        if page == "Risk-Management Agent":
+            render_risk_management_dashboard(dataset_version(DATA_PATH), model, scaler, feature_cols,
+                                             get_model_version(training_df))
+        else:
+            render_model_insights(metrics, feature_cols)
+    RUN_PROFILE.mark(f"render {page}")
+
+# Alert-list sort options: label -> (score_portfolio column, descending)
+ALERT_SORTS = {
+    "Default risk (highest first)": ('probability', True),
+    "Default risk (lowest first)": ('probability', False),
+    "Loan amount (largest first)": ('loan_amount', True),
+    "Loan amount (smallest first)": ('loan_amount', False),
+    "Location (A-Z)": ('location', False),
+}
+
+def alert_page(scored, status, key):
+    """
+    Sort / filter / page controls for one alert tab.
+    
+    Filtering, sorting and paging run over the scored frame (query_alerts);
+    only the rows of the visible page are expanded into agent outputs.
+    
+    Returns:
+        Agent outputs for the borrowers on the visible page
+    """
+    tier = (scored['status'] == status).to_numpy()
+    if not tier.any():
+        return []
+    loans = scored['loan_amount'].to_numpy()[tier]
+    loan_min, loan_max = int(loans.min()), int(loans.max())
+    
+    col_sort, col_prob, col_loan, col_loc = st.columns([2, 2, 2, 2])
+    sort_by, descending = ALERT_SORTS[col_sort.selectbox("Sort by", list(ALERT_SORTS), key=f"{key}_sort")]
+    probability_range = col_prob.slider("Default probability", 0.0, 1.0, (0.0, 1.0), step=0.01, key=f"{key}_prob")
+    loan_range = None
+    if loan_min < loan_max:
+        loan_range = col_loan.slider("Loan amount (₹)", loan_min, loan_max, (loan_min, loan_max), key=f"{key}_loan")
+    locations = col_loc.multiselect("Location", sorted(scored['location'][tier].unique()), key=f"{key}_loc")
+    
+    page_key = f"{key}_page"
+    query = dict(sort_by=sort_by, descending=descending, probability_range=probability_range,
+                 loan_range=loan_range, locations=locations, limit=ALERT_PAGE_SIZE)
+    if st.session_state.get(f"{key}_query") != query:  # new sort or filters start from page 1
+        st.session_state[f"{key}_query"] = query
+        st.session_state[page_key] = 1
+    page = st.session_state.get(page_key, 1)
+    rows, total = query_alerts(scored, status, offset=(page - 1) * ALERT_PAGE_SIZE, **query)
+    num_pages = max(1, (total + ALERT_PAGE_SIZE - 1) // ALERT_PAGE_SIZE)
+    if page > num_pages:  # filters narrowed the list below the current page
+        page = st.session_state[page_key] = num_pages
+        rows, total = query_alerts(scored, status, offset=(page - 1) * ALERT_PAGE_SIZE, **query)
+    
+    col_info, col_page = st.columns([3, 1])
+    if total:
+        first = (page - 1) * ALERT_PAGE_SIZE + 1
+        col_info.caption(f"Showing {first:,}–{first + len(rows) - 1:,} of {total:,} matching borrowers")
     else:
-        render_model_insights(metrics, feature_cols)
+        col_info.caption("No borrowers match these filters")
+    if num_pages > 1:
+        col_page.number_input(f"Page (of {num_pages:,})", min_value=1, max_value=num_pages, step=1, key=page_key)
+    return [agent_output_from_score(row) for _, row in rows.iterrows()]
 
-def render_risk_management_dashboard(df, model, scaler, feature_cols):
+def render_risk_management_dashboard(data_version, model, scaler, feature_cols, model_version):
     """
     Render the lender-facing Risk-Management Agent dashboard.
     
@@ -1217,17 +909,15 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
     </div>
     """, unsafe_allow_html=True)
     
+    # Score the whole portfolio in one batch, once per dataset and model version
+    # (unchanged borrowers come from the score cache)
+    scored = get_scored_portfolio(data_version, model_version, model, scaler, feature_cols)
+    
     # Privacy indicator
-    simulate_homomorphic_encryption(df)
+    simulate_homomorphic_encryption(scored)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # Calculate agent outputs for all borrowers
-    agent_outputs = []
-    for idx, row in df.iterrows():
-        output = risk_management_agent_logic(row, model, scaler, feature_cols)
-        agent_outputs.append(output)
-    
     # Key Portfolio Metrics with Professional Cards
     st.markdown("""
     <h2 style='color: #1a1a2e; font-size: 1.8rem; font-weight: 700; margin-bottom: 1.5rem;'>📈 Portfolio Health Overview</h2>
@@ -1235,10 +925,12 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
     
     col1, col2, col3, col4 = st.columns(4)
     
-    total_loans = len(agent_outputs)
-    at_risk = sum(1 for x in agent_outputs if x['status'] == 'At Risk')
-    defaulted = sum(1 for x in agent_outputs if x['status'] == 'High Risk - Defaulted')
-    healthy = sum(1 for x in agent_outputs if x['status'] == 'Active & Healthy')
+    aggregates = get_portfolio_aggregates(data_version, model_version, scored)
+    status_counts, exposure = aggregates['counts'], aggregates['exposure']
+    total_loans = aggregates['total']
+    at_risk = status_counts['At Risk']
+    defaulted = status_counts['High Risk - Defaulted']
+    healthy = status_counts['Active & Healthy']
     
     with col1:
         st.markdown(f"""
@@ -1246,6 +938,7 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
             <div class="metric-value">{total_loans}</div>
             <div class="metric-label">Total Loans</div>
             <div class="metric-trend trend-positive">Active Portfolio</div>
+            <div class="metric-trend">₹{aggregates['exposure_total']:,.0f} exposure</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -1255,6 +948,7 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
             <div class="metric-value">{at_risk}</div>
             <div class="metric-label">At Risk</div>
             <div class="metric-trend trend-negative">{(at_risk/total_loans)*100:.1f}% of portfolio</div>
+            <div class="metric-trend">₹{exposure['At Risk']:,.0f} exposure</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -1264,6 +958,7 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
             <div class="metric-value">{defaulted}</div>
             <div class="metric-label">High Risk</div>
             <div class="metric-trend trend-negative">{(defaulted/total_loans)*100:.1f}% requires action</div>
+            <div class="metric-trend">₹{exposure['High Risk - Defaulted']:,.0f} exposure</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -1273,9 +968,14 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
             <div class="metric-value">{healthy}</div>
             <div class="metric-label">Healthy</div>
             <div class="metric-trend trend-positive">{(healthy/total_loans)*100:.1f}% performing well</div>
+            <div class="metric-trend">₹{exposure['Active & Healthy']:,.0f} exposure</div>
         </div>
         """, unsafe_allow_html=True)
     
+    cut_points = " · ".join(f"p{p}: {value:.1%}" for p, value in aggregates['percentiles'].items())
+    if cut_points:
+        st.caption(f"Default-probability percentiles — {cut_points}")
+    
     st.markdown("<br><br>", unsafe_allow_html=True)
     
     # Agent Workspace Tabs
@@ -1292,16 +992,14 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
         </div>
         """, unsafe_allow_html=True)
         
-        at_risk_borrowers = [x for x in agent_outputs if x['status'] == 'At Risk']
-        at_risk_borrowers.sort(key=lambda x: x['probability'], reverse=True)
-        
-        if len(at_risk_borrowers) == 0:
+        if at_risk == 0:
             st.markdown("""
             <div class="alert-box alert-success">
                 <strong>Portfolio Status:</strong> No borrowers currently flagged as 'At Risk'. Excellent portfolio health!
             </div>
             """, unsafe_allow_html=True)
         else:
+            at_risk_borrowers = alert_page(scored, 'At Risk', "alerts_at_risk")
             for borrower in at_risk_borrowers:
                 with st.expander(f"**{borrower['user_id']}** - Default Risk: {borrower['probability']:.1%}", expanded=False):
                     col1, col2 = st.columns([1, 2])
@@ -1325,12 +1023,10 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
     with tab2:
         st.error("**CRITICAL ALERTS**: AURA has compiled actionable intelligence for high-risk accounts.")
         
-        defaulted_borrowers = [x for x in agent_outputs if x['status'] == 'High Risk - Defaulted']
-        defaulted_borrowers.sort(key=lambda x: x['probability'], reverse=True)
-        
-        if len(defaulted_borrowers) == 0:
+        if defaulted == 0:
             st.success("✅ No borrowers currently in default status!")
         else:
+            defaulted_borrowers = alert_page(scored, 'High Risk - Defaulted', "alerts_defaulted")
             for borrower in defaulted_borrowers:
                 with st.expander(f"🔴 **{borrower['user_id']}** - Default Risk: {borrower['probability']:.1%}", expanded=False):
                     col1, col2 = st.columns([1, 2])
@@ -1352,7 +1048,7 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
     with tab3:
         st.success("**PERFORMING WELL**: These borrowers are maintaining healthy financial behavior.")
         
-        healthy_borrowers = [x for x in agent_outputs if x['status'] == 'Active & Healthy']
+        healthy_borrowers = scored[scored['status'] == 'Active & Healthy']
         
         st.info(f"📊 {len(healthy_borrowers)} borrowers are performing well. Consider upsell opportunities.")
         
@@ -1362,11 +1058,11 @@ def render_risk_management_dashboard(df, model, scaler, feature_cols):
                 'Default Probability': f"{b['probability']:.1%}",
                 'Loan Amount': f"₹{b['loan_amount']:,}",
                 'Status': b['status']
-            } for b in healthy_borrowers[:20]])
+            } for _, b in healthy_borrowers.head(20).iterrows()])
             
             st.dataframe(healthy_df, use_container_width=True)
 
-def render_credit_coach_demo(df):
+def render_credit_coach_demo(lookup):
     """
     Render the borrower-facing Credit-Coach Agent demo.
     
@@ -1389,16 +1085,23 @@ def render_credit_coach_demo(df):
     st.subheader("👤 Select a Borrower Profile")
     st.info("📱 In production: WhatsApp chatbot accessible to 200M+ users | Alternative data = no credit history needed")
     
-    user_options = df['user_id'].tolist()
+    # Typeahead: only the first TYPEAHEAD_LIMIT ids matching the prefix reach the selectbox
+    query = st.text_input("Search by user ID:", key="coach_query", placeholder="Type the start of a user ID")
+    matches = lookup.search(query, TYPEAHEAD_LIMIT)
+    match_count = lookup.count(query)
+    if not matches:
+        st.warning(f"No borrower ID starts with '{query.strip()}'.")
+        return
+    st.caption(f"Showing {len(matches)} of {match_count:,} matching borrowers ({len(lookup):,} in portfolio)")
     selected_user = st.selectbox(
         "Choose a user to simulate their coaching session:",
-        user_options,
+        matches,
         index=0
     )
     
     if selected_user:
-        # Get borrower data
-        borrower_data = df[df['user_id'] == selected_user].iloc[0]
+        # Get borrower data (hash lookup + single-row fetch)
+        borrower_data = lookup.row(selected_user)
         
         st.markdown("---")
         
@@ -1483,7 +1186,8 @@ def render_model_insights(metrics, feature_cols):
             reverse=True
         )
         
-        # Create visualization
+        # Create visualization (plotly is imported only by the pages that chart)
+        import plotly.graph_objects as go
         fig = go.Figure(go.Bar(
             x=[x[1] for x in feature_importance],
             y=[x[0].replace('_', ' ').title() for x in feature_importance],
@@ -1577,196 +1281,310 @@ def render_model_insights(metrics, feature_cols):
 # LIVE NEGOTIATION PAGE (Borrower + Lender UI)
 # ============================================================================
 
+# Negotiation actions run as widget callbacks, before the fragment that owns
+# the widget reruns, so one click costs one fragment redraw (no st.rerun()).
+# Run timings go to st.session_state["ui_latency"]: each fragment's redraw,
+# "<fragment> (action)" for callback + redraw, and "full page" for script runs.
+LATENCY_SAMPLES = 50
+EVENT_LOG_REFRESH_SECONDS = 5
+
+def record_latency(name, seconds):
+    st.session_state.setdefault("ui_latency", {}).setdefault(name, deque(maxlen=LATENCY_SAMPLES)).append(seconds * 1000)
+
+def negotiation_fragment(name, run_every=None):
+    """st.fragment that records its redraw time (and the action that triggered it) under `name`."""
+    def decorate(render):
+        @functools.wraps(render)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return render(*args, **kwargs)
+            finally:
+                redraw = time.perf_counter() - start
+                record_latency(name, redraw)
+                action = st.session_state.pop("action_seconds", None)
+                if action is not None:
+                    record_latency(f"{name} (action)", action + redraw)
+        return st.fragment(timed, run_every=run_every)
+    return decorate
+
+def negotiation_action(action):
+    """Widget callback wrapper: times the action for the negotiation_fragment that redraws next."""
+    @functools.wraps(action)
+    def callback(*args):
+        start = time.perf_counter()
+        try:
+            action(*args)
+        finally:
+            st.session_state["action_seconds"] = time.perf_counter() - start
+    return callback
+
+def flash(kind, message, balloons=False):
+    """Queue a status message for the next redraw (callbacks cannot place elements)."""
+    st.session_state["negotiation_flash"] = (kind, message, balloons)
+
+def show_flash():
+    kind, message, balloons = st.session_state.pop("negotiation_flash", (None, None, False))
+    if message:
+        getattr(st, kind)(message)
+    if balloons:
+        st.balloons()
+
+@negotiation_action
+def run_agent_action():
+    flash("success", f"Agent executed {auto_negotiate_all()} autonomous offer(s)")
+
+@negotiation_action
+def reset_action():
+    get_negotiation_engine().reset()
+    seed_demo_users()
+
+@negotiation_action
+def demo_preset_action():
+    # Fresh seed
+    get_negotiation_engine().reset()
+    seed_demo_users()
+    # Auto initiate offers
+    auto_negotiate_all()
+    # Accept one reasonable offer (prefer USR1002 if present)
+    negotiations = get_negotiation_engine().store.negotiations
+    target_id = "USR1002" if "USR1002" in negotiations else next(iter(negotiations))
+    try:
+        # Ensure offer exists
+        entry = negotiations[target_id]
+        if entry.get("status") == "pending":
+            offer, expiry, msg, reason = decide_offer(entry)
+            start_negotiation(target_id, offer_amount=offer, expiry_days=expiry, agent_message=msg, decision_reason=reason)
+        accept_offer(target_id)
+        flash("success", f"🎯 Preset ready: {target_id} restructured. Capture screenshots now!", balloons=True)
+    except Exception as e:
+        flash("warning", f"Preset encountered an issue: {e}")
+
+@negotiation_action
+def accept_offer_action(user_id):
+    accept_offer(user_id)
+    flash("success", "Offer Accepted! Your loan has been restructured.", balloons=True)
+
+@negotiation_action
+def send_response_action(user_id):
+    reply = st.session_state.get("borrower_reply")
+    if reply:
+        add_chat_message(user_id, "borrower", reply)
+        flash("info", handle_counter_offer_text(user_id, reply))
+        st.session_state["borrower_reply"] = ""
+
+@negotiation_action
+def initiate_offer_action(user_id):
+    offer, expiry, msg, reason = decide_offer(get_negotiation_engine().store.get(user_id))
+    start_negotiation(user_id, offer_amount=offer, expiry_days=expiry, agent_message=msg, decision_reason=reason)
+    flash("success", "Offer initiated")
+
+@negotiation_action
+def force_restructure_action(user_id):
+    accept_offer(user_id)
+    flash("success", "Restructured")
+
 def render_live_negotiation_page():
     st.title("🤝 Live Negotiation Demo (Agentic AI)")
 
     init_negotiation_state()
-    if not st.session_state.get("negotiations"):
+    negotiations = get_negotiation_engine().store.negotiations
+    if not len(negotiations):
         seed_demo_users()
 
-    # Top controls
+    # Top controls (these change every panel, so they rerun the whole page)
     top_col1, top_col2, top_col3 = st.columns([2,2,1])
     with top_col1:
         view = st.radio("View As:", ["Borrower", "Lender", "Analytics"], horizontal=True)
     with top_col2:
         selected_user = None
         if view == "Borrower":
-            users = list(st.session_state["negotiations"].keys())
+            users = list(negotiations)
             selected_user = st.selectbox("Select User:", users, index=0)
     with top_col3:
-        if st.button("🤖 Run Agent", help="Autonomously initiate offers for pending users"):
-            actions = auto_negotiate_all()
-            st.success(f"Agent executed {actions} autonomous offer(s)")
-            st.rerun()
-        if st.button("🔄 Reset", help="Reset demo state"):
-            st.session_state["negotiations"] = {}
-            st.session_state["funds_recovered"] = 0
-            st.session_state["negotiation_log"] = []
-            st.session_state["agent_decision_log"] = []
-            seed_demo_users()
-            st.rerun()
-        if st.button("🎬 Demo Preset", help="Seed users, auto-run agent, accept one offer for clean screenshots"):
-            # Fresh seed
-            st.session_state["negotiations"] = {}
-            st.session_state["funds_recovered"] = 0
-            st.session_state["negotiation_log"] = []
-            st.session_state["agent_decision_log"] = []
-            seed_demo_users()
-            # Auto initiate offers
-            auto_negotiate_all()
-            # Accept one reasonable offer (prefer USR1002 if present)
-            target_id = "USR1002" if "USR1002" in st.session_state["negotiations"] else list(st.session_state["negotiations"].keys())[0]
-            try:
-                # Ensure offer exists
-                entry = st.session_state["negotiations"][target_id]
-                if entry.get("status") == "pending":
-                    offer, expiry, msg, reason = decide_offer(entry)
-                    start_negotiation(target_id, offer_amount=offer, expiry_days=expiry, agent_message=msg, decision_reason=reason)
-                accept_offer(target_id)
-                st.success(f"🎯 Preset ready: {target_id} restructured. Capture screenshots now!")
-                st.balloons()
-            except Exception as e:
-                st.warning(f"Preset encountered an issue: {e}")
-            st.rerun()
+        st.button("🤖 Run Agent", help="Autonomously initiate offers for pending users", on_click=run_agent_action)
+        st.button("🔄 Reset", help="Reset demo state", on_click=reset_action)
+        st.button("🎬 Demo Preset", help="Seed users, auto-run agent, accept one offer for clean screenshots",
+                  on_click=demo_preset_action)
 
-    # Borrower context
-    user = None
     if view == "Borrower" and selected_user:
-        user = st.session_state["negotiations"][selected_user]
+        render_borrower_panel(selected_user)
+    elif view == "Lender":
+        render_lender_records()
+        render_event_log()
+    elif view == "Analytics":
+        render_negotiation_analytics()
 
-    # ----------------------------------------
-    # BORROWER VIEW
-    # ----------------------------------------
-    if view == "Borrower" and user:
-        st.subheader(f"📌 Borrower Dashboard – {user['name']}")
+# ----------------------------------------
+# BORROWER VIEW
+# ----------------------------------------
+@negotiation_fragment("borrower panel")
+def render_borrower_panel(user_id):
+    user = get_negotiation_engine().store.get(user_id)
+    st.subheader(f"📌 Borrower Dashboard – {user['name']}")
+    show_flash()
 
-        # Missed Payment Alert
-        st.markdown(f"""
-        <div style='padding:15px;background:#fee2e2;border-left:5px solid #b91c1c;border-radius:8px;color:#7f1d1d;font-weight:600;'>
-            ⚠️ Missed Payment: You have an overdue amount of ₹{user['missed_amount']:,}
-        </div>
-        """, unsafe_allow_html=True)
+    # Missed Payment Alert
+    st.markdown(f"""
+    <div style='padding:15px;background:#fee2e2;border-left:5px solid #b91c1c;border-radius:8px;color:#7f1d1d;font-weight:600;'>
+        ⚠️ Missed Payment: You have an overdue amount of ₹{user['missed_amount']:,}
+    </div>
+    """, unsafe_allow_html=True)
 
-        st.write("")
+    st.write("")
 
-        # Auto-start negotiation (if not done)
-        if user["status"] == "pending":
-            start_negotiation(user["user_id"])
+    # Auto-start negotiation (if not done); bulk offers are rendered when first shown
+    if user["status"] == "pending":
+        user = start_negotiation(user_id)
+    elif user["status"] == "offer_sent" and not user.get("last_message"):
+        user = get_negotiation_engine().send_offer_message(user_id)
 
-        # AI Agent Message
-        if user.get("last_message"):
-            st.chat_message("ai").markdown(user["last_message"])
+    # AI Agent Message
+    if user.get("last_message"):
+        st.chat_message("ai").markdown(user["last_message"])
 
-        st.write("")
+    st.write("")
 
-        # Action buttons
-        colA, colB = st.columns(2)
+    # Action buttons
+    colA, colB = st.columns(2)
 
-        with colA:
-            if st.button("✅ Accept Offer", key="accept_offer_ui", disabled=(user['status']=='restructured')):
-                accept_offer(user["user_id"])
-                st.success("Offer Accepted! Your loan has been restructured.")
-                st.balloons()
-                st.rerun()
+    with colA:
+        st.button("✅ Accept Offer", key="accept_offer_ui", disabled=(user['status']=='restructured'),
+                  on_click=accept_offer_action, args=(user_id,))
 
-        with colB:
-            reply = st.text_input("Send a message / counter-offer (e.g., 300)")
-            if st.button("Send Response") and reply:
-                st.chat_message("human").markdown(reply)
-                add_chat_message(user["user_id"], "borrower", reply)
-                agent_feedback = handle_counter_offer_text(user["user_id"], reply)
-                st.chat_message("ai").markdown(agent_feedback)
-                st.rerun()
+    with colB:
+        st.text_input("Send a message / counter-offer (e.g., 300)", key="borrower_reply")
+        st.button("Send Response", on_click=send_response_action, args=(user_id,))
 
-        # Show status
-        st.info(f"📊 Current Status: **{user['status'].upper()}**")
+    # Show status
+    st.info(f"📊 Current Status: **{user['status'].upper()}**")
 
+    # Conversation history: only the page on screen is loaded (page 1 = most recent)
+    total_messages = chat_count(user_id)
+    if total_messages:
+        with st.expander(f"💬 Conversation ({total_messages} messages)"):
+            page_size = 10
+            num_pages = (total_messages + page_size - 1) // page_size
+            page = 1
+            if num_pages > 1:
+                # One pager per borrower; a thread shortened by a reset keeps its page in range
+                page_key = f"chat_page_{user_id}"
+                if st.session_state.get(page_key, 1) > num_pages:
+                    st.session_state[page_key] = num_pages
+                page = st.number_input(f"Page (of {num_pages})", min_value=1, max_value=num_pages, value=1,
+                                       step=1, key=page_key)
+            end = total_messages - (page - 1) * page_size
+            start = max(0, end - page_size)
+            for message in chat_page(user_id, start, end - start):
+                st.chat_message("human" if message["role"] == "borrower" else "ai").markdown(message["message"])
 
-    # ----------------------------------------
-    # LENDER VIEW
-    # ----------------------------------------
-    elif view == "Lender":
-        st.subheader("🏦 Lender Dashboard – Live Negotiations")
-
-        summary = negotiation_summary()
-
-        # Funds recovered metric card
-        metA, metB, metC, metD = st.columns(4)
-        with metA:
-            st.metric("💰 Funds Recovered", f"₹{summary['total_recovered']:,}")
-        with metB:
-            st.metric("🟢 Restructured", summary['counts']['restructured'])
-        with metC:
-            auto_actions = len(summary.get('decisions', []))
-            st.metric("🤖 Agent Actions", auto_actions)
-        with metD:
-            total_negos = sum(summary['counts'].values()) or 1
-            success_rate = summary['counts']['restructured'] / total_negos * 100
-            st.metric("✅ Success Rate", f"{success_rate:.0f}%")
-
-        st.markdown("### Active Negotiation Records")
-
-        for uid, record in summary["negotiations"].items():
-            with st.expander(f"{record['name']} ({uid}) – {record['status'].upper()}"):
-                colL, colR = st.columns(2)
-                with colL:
-                    st.write(f"Wallet: ₹{record['wallet']:,}")
-                    st.write(f"Missed: ₹{record['missed_amount']:,}")
-                    st.write(f"Offer: ₹{record['offer_amount']:,}")
-                    st.write(f"Expiry: {record['expiry_days']} days")
-                with colR:
-                    st.write(f"Started: {record.get('started_at','')[:19]}")
-                    st.write(f"Accepted: {(record.get('accepted_at') or '-')[:19]}")
-                    if record['status'] == 'pending':
-                        if st.button(f"Initiate Offer ({uid})", key=f"init_{uid}"):
-                            offer, expiry, msg, reason = decide_offer(record)
-                            start_negotiation(uid, offer_amount=offer, expiry_days=expiry, agent_message=msg, decision_reason=reason)
-                            st.success("Offer initiated")
-                            st.rerun()
-                    elif record['status'] == 'offer_sent':
-                        if st.button(f"Force Restructure ({uid})", key=f"force_{uid}"):
-                            accept_offer(uid)
-                            st.success("Restructured")
-                            st.rerun()
-                # Decision rationale history for this user
-                decisions = [d for d in summary.get('decisions', []) if d['user_id']==uid]
-                if decisions:
-                    st.markdown("**Agent Decision Rationale:**")
-                    for d in decisions[-3:]:
-                        st.caption(f"{d['timestamp']}: {d['reason']}")
-
-        st.markdown("### 📝 Event Log")
-        for ts, log in summary["log"][-25:]:
-            st.write(f"**{ts[:19]}** – {log}")
+# ----------------------------------------
+# LENDER VIEW
+# ----------------------------------------
+@negotiation_fragment("lender records")
+def render_lender_records():
+    st.subheader("🏦 Lender Dashboard – Live Negotiations")
+    show_flash()
 
-    elif view == "Analytics":
-        st.subheader("📊 Negotiation Analytics")
-        summary = negotiation_summary()
-        colA, colB, colC = st.columns(3)
-        with colA:
-            st.metric("Total Users", len(summary['negotiations']))
-            total_missed = sum(v['missed_amount'] for v in summary['negotiations'].values())
-            st.metric("Total Missed", f"₹{total_missed:,}")
-        with colB:
-            st.metric("Recovered", f"₹{summary['total_recovered']:,}")
-            recovery_rate = (summary['total_recovered']/total_missed*100) if total_missed else 0
-            st.metric("Recovery Rate", f"{recovery_rate:.1f}%")
-        with colC:
-            st.metric("Agent Actions", len(summary.get('decisions', [])))
-            st.metric("Restructures", summary['counts']['restructured'])
-        # Status distribution chart
-        status_df = pd.DataFrame([
-            {"Status": k.title(), "Count": v} for k,v in summary['counts'].items() if v>0
-        ])
-        if not status_df.empty:
-            fig = go.Figure(go.Bar(x=status_df['Status'], y=status_df['Count'], marker_color=['#fbbf24','#f59e0b','#10b981','#ef4444']))
-            fig.update_layout(title="Status Distribution", xaxis_title="Status", yaxis_title="Count")
-            st.plotly_chart(fig, use_container_width=True)
-        # Decisions table
-        if summary.get('decisions'):
-            st.markdown("### Recent Agent Decisions")
-            dec_df = pd.DataFrame(summary['decisions'])
-            st.dataframe(dec_df.tail(50), use_container_width=True)
+    summary = negotiation_summary()
+
+    # Funds recovered metric card
+    metA, metB, metC, metD = st.columns(4)
+    with metA:
+        st.metric("💰 Funds Recovered", f"₹{summary['total_recovered']:,}")
+    with metB:
+        st.metric("🟢 Restructured", summary['counts']['restructured'])
+    with metC:
+        auto_actions = summary['decisions'].total
+        st.metric("🤖 Agent Actions", auto_actions)
+    with metD:
+        total_negos = sum(summary['counts'].values()) or 1
+        success_rate = summary['counts']['restructured'] / total_negos * 100
+        st.metric("✅ Success Rate", f"{success_rate:.0f}%")
+
+    st.markdown("### Active Negotiation Records")
+
+    for uid, record in summary["negotiations"].items():
+        with st.expander(f"{record['name']} ({uid}) – {record['status'].upper()}"):
+            colL, colR = st.columns(2)
+            with colL:
+                st.write(f"Wallet: ₹{record['wallet']:,}")
+                st.write(f"Missed: ₹{record['missed_amount']:,}")
+                st.write(f"Offer: ₹{record['offer_amount']:,}")
+                st.write(f"Expiry: {record['expiry_days']} days")
+            with colR:
+                st.write(f"Started: {format_timestamp(record.get('started_at'))}")
+                st.write(f"Accepted: {format_timestamp(record.get('accepted_at'))}")
+                if record['status'] == 'pending':
+                    st.button(f"Initiate Offer ({uid})", key=f"init_{uid}", on_click=initiate_offer_action, args=(uid,))
+                elif record['status'] == 'offer_sent':
+                    st.button(f"Force Restructure ({uid})", key=f"force_{uid}", on_click=force_restructure_action,
+                              args=(uid,))
+            # Decision rationale history for this user
+            decisions = summary['decisions'].for_user(uid, 3)
+            if decisions:
+                st.markdown("**Agent Decision Rationale:**")
+                for d in decisions:
+                    st.caption(f"{format_timestamp(d['timestamp'])}: {decision_reason(d)}")
+
+# The log is appended to by every panel (and, with a shared store, by other
+# sessions), so it refreshes on a timer instead of waiting for a page rerun
+@negotiation_fragment("event log", run_every=EVENT_LOG_REFRESH_SECONDS)
+def render_event_log():
+    st.markdown("### 📝 Event Log")
+    for ts, log in get_negotiation_engine().store.recent_log(25):
+        st.write(f"**{format_timestamp(ts)}** – {log}")
+
+@negotiation_fragment("analytics")
+def render_negotiation_analytics():
+    st.subheader("📊 Negotiation Analytics")
+    summary = negotiation_summary()
+    colA, colB, colC = st.columns(3)
+    with colA:
+        st.metric("Total Users", sum(summary['counts'].values()))
+        total_missed = summary['total_missed']
+        st.metric("Total Missed", f"₹{total_missed:,}")
+    with colB:
+        st.metric("Recovered", f"₹{summary['total_recovered']:,}")
+        recovery_rate = (summary['total_recovered']/total_missed*100) if total_missed else 0
+        st.metric("Recovery Rate", f"{recovery_rate:.1f}%")
+    with colC:
+        st.metric("Agent Actions", summary['decisions'].total)
+        st.metric("Restructures", summary['counts']['restructured'])
+    # Status distribution chart
+    status_df = pd.DataFrame([
+        {"Status": k.title(), "Count": v} for k,v in summary['counts'].items() if v>0
+    ])
+    if not status_df.empty:
+        import plotly.graph_objects as go
+        fig = go.Figure(go.Bar(x=status_df['Status'], y=status_df['Count'], marker_color=['#fbbf24','#f59e0b','#10b981','#ef4444']))
+        fig.update_layout(title="Status Distribution", xaxis_title="Status", yaxis_title="Count")
+        st.plotly_chart(fig, use_container_width=True)
+    # Decisions table, paged through the decision stream (page 1 = most recent)
+    decisions = summary['decisions']
+    total_decisions = len(decisions)
+    if total_decisions:
+        st.markdown("### Recent Agent Decisions")
+        page_size = 50
+        num_pages = (total_decisions + page_size - 1) // page_size
+        page = 1
+        if num_pages > 1:
+            page = st.number_input(f"Page (of {num_pages})", min_value=1, max_value=num_pages, value=1, step=1)
+        end = total_decisions - (page - 1) * page_size
+        start = max(0, end - page_size)
+        rows = [{**d, 'reason': decision_reason(d), 'timestamp': format_timestamp(d['timestamp'])}
+                for d in decisions.page(start, end - start)]
+        dec_df = pd.DataFrame(rows, index=range(start, end)).drop(columns='ratio', errors='ignore')
+        st.dataframe(dec_df, use_container_width=True)
+    # Server-side time per redraw (this session)
+    latency = st.session_state.get("ui_latency")
+    if latency:
+        with st.expander("⏱️ Interaction Latency"):
+            st.dataframe(pd.DataFrame([
+                {"Redraw": name, "Runs": len(samples), "p50 (ms)": round(pd.Series(samples).median(), 1),
+                 "p95 (ms)": round(pd.Series(samples).quantile(0.95), 1)}
+                for name, samples in latency.items()
+            ]), use_container_width=True, hide_index=True)
 
 
 # ============================================================================
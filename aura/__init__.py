@@ -0,0 +1,58 @@
+"""
+AURA core engine - the Streamlit-free half of the platform.
+
+Data loading, model training and agent logic live here so they can be used
+from batch jobs (see `python -m aura --help`) as well as from app.py.
+
+Names are imported from their submodule on first access, so importing one
+submodule (e.g. aura.data from app.py) does not pull in sklearn through
+aura.tuning or aura.model.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'DATA_PATH': 'aura.data', 'load_data': 'aura.data', 'load_borrower': 'aura.data',
+    'generate_synthetic_dataset': 'aura.data', 'write_synthetic_dataset': 'aura.data',
+    'ColumnStore': 'aura.store', 'build_store': 'aura.store',
+    'BorrowerLookup': 'aura.lookup', 'UserIndex': 'aura.lookup',
+    'FEATURE_COLS': 'aura.model', 'TRAINING_COLS': 'aura.model', 'MODEL_PARAMS': 'aura.model',
+    'train_model': 'aura.model',
+    'load_or_train': 'aura.artifacts',
+    'SEARCH_SPACE': 'aura.tuning', 'search_model': 'aura.tuning',
+    'CompiledForest': 'aura.forest', 'ArrayScaler': 'aura.forest', 'compile_model': 'aura.forest',
+    'RISK_FACTOR_RULES': 'aura.rules', 'WEAK_AREA_RULES': 'aura.rules', 'STATUS_TIERS': 'aura.rules',
+    'rule_mask': 'aura.rules', 'status_tier_codes': 'aura.rules',
+    'SCORING_COLS': 'aura.agents', 'COACHING_COLS': 'aura.agents', 'describe_risk_factors': 'aura.agents',
+    'risk_status': 'aura.agents',
+    'risk_recommendation': 'aura.agents', 'risk_management_agent_logic': 'aura.agents',
+    'score_portfolio': 'aura.agents', 'predict_default_proba': 'aura.agents',
+    'assemble_scores': 'aura.agents', 'agent_output_from_score': 'aura.agents', 'query_alerts': 'aura.agents',
+    'score_csv': 'aura.agents', 'credit_coach_agent_logic': 'aura.agents',
+    'ScoreCache': 'aura.score_cache',
+    'SimulatedClock': 'aura.clock', 'SystemClock': 'aura.clock', 'format_timestamp': 'aura.clock',
+    'DecisionLog': 'aura.event_log', 'EventLog': 'aura.event_log',
+    'NegotiationRecord': 'aura.records', 'Status': 'aura.records',
+    'JournaledNegotiationStore': 'aura.negotiation_store', 'MemoryNegotiationStore': 'aura.negotiation_store',
+    'SQLiteNegotiationStore': 'aura.negotiation_store',
+    'parse_reply': 'aura.replies', 'parse_replies': 'aura.replies',
+    'NegotiationEngine': 'aura.negotiation', 'decide_offer': 'aura.negotiation',
+    'decide_offers': 'aura.negotiation',
+    'DeliveryError': 'aura.dispatch', 'FakeGateway': 'aura.dispatch', 'OfferDispatcher': 'aura.dispatch',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'aura' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
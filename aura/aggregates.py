@@ -0,0 +1,79 @@
+"""
+Portfolio aggregates for the dashboard cards.
+
+portfolio_aggregates() reduces a score_portfolio frame to what the
+Risk-Management overview shows: borrowers and loan exposure per status
+tier, and default-probability percentile cut-points. The tier counts and
+exposures come from one bincount pass over the status codes (no per-tier
+filtering), so the cost is a couple of array scans however many tiers
+there are.
+
+The result is small and depends only on the portfolio and the model, so
+callers cache it on (dataset_version, model version); app.py does this
+with st.cache_data.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+import aura.data
+from aura.rules import STATUS_TIERS
+
+# Default-probability percentiles reported as cut-points
+PERCENTILES = (50, 75, 90, 95, 99)
+
+
+def dataset_version(path):
+    """
+    Cheap version id of the portfolio at `path` (file or directory).
+
+    Built from file names, sizes and modification times, so it changes
+    whenever the data is rewritten without reading any of it. A missing
+    path means load_data generates the synthetic portfolio; that version is
+    taken from the generator's source file, so a changed generator is a new
+    dataset.
+    """
+    if not os.path.exists(path):
+        return 'synthetic-' + _stat_digest([aura.data.__file__])
+    paths = [path]
+    if os.path.isdir(path):
+        paths += [os.path.join(path, name) for name in sorted(os.listdir(path))]
+    return _stat_digest(paths)
+
+
+def _stat_digest(paths):
+    digest = hashlib.sha256()
+    for entry in paths:
+        stat = os.stat(entry)
+        digest.update(f"{entry}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def portfolio_aggregates(scored, percentiles=PERCENTILES):
+    """
+    Status counts, exposure by tier and probability cut-points.
+
+    Args:
+        scored: score_portfolio frame (categorical 'status' over STATUS_TIERS)
+        percentiles: Default-probability percentiles to report
+
+    Returns:
+        Dict with 'total' (borrowers), 'exposure_total', 'counts' and
+        'exposure' (tier -> borrowers / summed loan_amount, every tier
+        present) and 'percentiles' (percentile -> default probability; empty
+        for an empty portfolio)
+    """
+    codes = scored['status'].cat.codes.to_numpy()
+    loans = scored['loan_amount'].to_numpy(dtype=np.float64)
+    counts = np.bincount(codes, minlength=len(STATUS_TIERS))
+    exposure = np.bincount(codes, weights=loans, minlength=len(STATUS_TIERS))
+    cuts = np.percentile(scored['probability'].to_numpy(), percentiles) if len(scored) else []
+    return {
+        'total': int(counts.sum()),
+        'exposure_total': float(exposure.sum()),
+        'counts': dict(zip(STATUS_TIERS, counts.tolist())),
+        'exposure': dict(zip(STATUS_TIERS, exposure.tolist())),
+        'percentiles': dict(zip(percentiles, np.asarray(cuts, dtype=float).tolist())),
+    }
@@ -0,0 +1,99 @@
+"""
+On-disk model artifact cache.
+
+A fitted (model, scaler, feature_cols, metrics) bundle is persisted under a
+key derived from the training data, the hyperparameters and the library
+versions. Fresh processes (redeploys, autoscaled replicas) load the artifact
+instead of retraining the forest before the first page renders.
+
+joblib (and with it the sklearn classes in the bundle) is imported on first
+save or load, not with this module.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from importlib.metadata import version
+
+import pandas as pd
+
+from aura.model import FEATURE_COLS, MODEL_PARAMS, train_model
+
+# Bump when the artifact layout or training procedure changes
+ARTIFACT_VERSION = 1
+
+ARTIFACT_DIR = os.environ.get('AURA_ARTIFACT_DIR', '.aura_artifacts')
+
+
+def artifact_key(df, params=None):
+    """Stable hash of training data + hyperparameters + artifact/sklearn versions."""
+    params = MODEL_PARAMS if params is None else params
+    digest = hashlib.sha256()
+    digest.update(f"v{ARTIFACT_VERSION}|sklearn={version('scikit-learn')}|".encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    data = df[FEATURE_COLS + ['default_label']]
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:32]
+
+
+def artifact_path(key, artifact_dir=ARTIFACT_DIR):
+    return os.path.join(artifact_dir, f"model-{key}.joblib")
+
+
+def save_artifact(path, model, scaler, feature_cols, metrics):
+    """Write the bundle atomically so concurrent replicas never read a partial file."""
+    import joblib
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    bundle = {
+        'version': ARTIFACT_VERSION,
+        'model': model,
+        'scaler': scaler,
+        'feature_cols': list(feature_cols),
+        'metrics': metrics,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            joblib.dump(bundle, fh)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_artifact(path):
+    """Load a bundle; returns None when missing, unreadable or from another version."""
+    import joblib
+    try:
+        bundle = joblib.load(path)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupt or incompatible pickle - caller retrains and overwrites it
+        return None
+    if not isinstance(bundle, dict) or bundle.get('version') != ARTIFACT_VERSION:
+        return None
+    return bundle['model'], bundle['scaler'], bundle['feature_cols'], bundle['metrics']
+
+
+def load_or_train(df, params=None, artifact_dir=ARTIFACT_DIR):
+    """
+    Cached train_model: reuse the persisted artifact for this data/params, else
+    train and persist it.
+    
+    Returns: trained model, scaler, feature columns, and performance metrics.
+    """
+    path = artifact_path(artifact_key(df, params), artifact_dir)
+    cached = load_artifact(path)
+    if cached is not None:
+        return cached
+    model, scaler, feature_cols, metrics = train_model(df, params)
+    try:
+        save_artifact(path, model, scaler, feature_cols, metrics)
+    except OSError:
+        # Read-only or full disk: serve the freshly trained model anyway
+        pass
+    return model, scaler, feature_cols, metrics
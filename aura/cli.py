@@ -0,0 +1,146 @@
+"""
+Command-line entry point for headless AURA jobs.
+
+    python -m aura score portfolio.csv scores.csv --chunksize 100000
+    python -m aura export-forest forest.npz
+    python -m aura tune --time-budget 300 --workers 8 --report search.json
+    python -m aura generate loadtest/ --users 20000000 --workers 8
+    python -m aura build-store loadtest/ portfolio.store/
+    python -m aura campaign negotiations.db
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from aura.data import DATA_PATH, load_data, write_synthetic_dataset
+from aura.model import TRAINING_COLS
+from aura.artifacts import artifact_key, artifact_path, load_or_train, save_artifact
+from aura.agents import score_csv
+from aura.forest import compile_model
+from aura.store import build_store
+from aura.negotiation import NegotiationEngine
+from aura.negotiation_store import NEGOTIATION_DB, SQLiteNegotiationStore
+from aura.tuning import search_model
+
+
+def _cmd_score(args):
+    start = time.perf_counter()
+    model, scaler, feature_cols, metrics = load_or_train(load_data(args.train_data))
+    print(f"Model ready (test accuracy {metrics['test_accuracy']:.1%}) in {time.perf_counter() - start:.2f}s",
+          file=sys.stderr)
+    start = time.perf_counter()
+    total = score_csv(args.input, args.output, model, scaler, feature_cols, chunksize=args.chunksize)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {total:,} borrowers in {elapsed:.2f}s -> {args.output}", file=sys.stderr)
+    return 0
+
+
+def _cmd_export_forest(args):
+    model, scaler, feature_cols, metrics = load_or_train(load_data(args.train_data))
+    forest, _ = compile_model(model, scaler)
+    forest.save(args.output)
+    print(f"Exported {forest.n_trees} trees ({len(forest.feature):,} nodes) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+def _cmd_tune(args):
+    df = load_data(args.train_data, TRAINING_COLS)
+    model, scaler, feature_cols, metrics = search_model(df, time_budget=args.time_budget, workers=args.workers)
+    best_params = metrics['best_params']
+    print(f"Searched {len(metrics['search'])} candidates in {metrics['search_seconds']:.2f}s; "
+          f"best {best_params} (test accuracy {metrics['test_accuracy']:.1%})", file=sys.stderr)
+    # Persist under the best params' key, so load_or_train(df, best_params) serves it
+    path = artifact_path(artifact_key(df, best_params))
+    save_artifact(path, model, scaler, feature_cols, metrics)
+    print(f"Saved model artifact -> {path}", file=sys.stderr)
+    if args.report:
+        report = {key: metrics[key] for key in ('best_params', 'test_accuracy', 'search_seconds', 'search')}
+        with open(args.report, 'w') as fh:
+            json.dump(report, fh, indent=2, default=float)
+        print(f"Wrote search report -> {args.report}", file=sys.stderr)
+    return 0
+
+
+def _cmd_generate(args):
+    start = time.perf_counter()
+    paths = write_synthetic_dataset(args.output_dir, args.users, chunk_size=args.chunk_size,
+                                    root_seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Generated {args.users:,} borrowers in {len(paths)} chunk(s) in {elapsed:.2f}s -> {args.output_dir}",
+          file=sys.stderr)
+    return 0
+
+
+def _cmd_build_store(args):
+    start = time.perf_counter()
+    store = build_store(args.source, args.dest, chunksize=args.chunksize)
+    elapsed = time.perf_counter() - start
+    print(f"Stored {len(store):,} rows x {len(store.columns)} columns in {elapsed:.2f}s -> {args.dest}",
+          file=sys.stderr)
+    return 0
+
+
+def _cmd_campaign(args):
+    store = SQLiteNegotiationStore(args.db)
+    start = time.perf_counter()
+    engine = NegotiationEngine(store)
+    expired = engine.expire_offers()
+    actions = engine.auto_negotiate_all(bulk=True)
+    elapsed = time.perf_counter() - start
+    store.close()
+    print(f"Expired {expired:,} offers, queued {actions:,} offers in {elapsed:.2f}s -> {args.db}", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="aura", description="Headless AURA portfolio tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    score = sub.add_parser("score", help="Score a portfolio CSV in bounded-memory chunks.")
+    score.add_argument("input", help="Portfolio CSV with user_id, last_active_location and feature columns.")
+    score.add_argument("output", help="Destination CSV for scores.")
+    score.add_argument("--chunksize", type=int, default=50_000, help="Rows read and scored per chunk.")
+    score.add_argument("--train-data", default=DATA_PATH,
+                       help="Training CSV (synthetic data is generated when missing).")
+    score.set_defaults(func=_cmd_score)
+
+    export = sub.add_parser("export-forest", help="Flatten the trained forest into NumPy node arrays (.npz).")
+    export.add_argument("output", help="Destination .npz file.")
+    export.add_argument("--train-data", default=DATA_PATH,
+                        help="Training CSV (synthetic data is generated when missing).")
+    export.set_defaults(func=_cmd_export_forest)
+
+    tune = sub.add_parser("tune", help="Parallel time-budgeted hyperparameter search for the forest.")
+    tune.add_argument("--time-budget", type=float, default=60.0, help="Wall-clock seconds for the search.")
+    tune.add_argument("--workers", type=int, default=None, help="Processes training candidates (default: all cores).")
+    tune.add_argument("--report", help="Write the per-candidate metrics (accuracy, AUC, fit/predict time) as JSON.")
+    tune.add_argument("--train-data", default=DATA_PATH,
+                      help="Training CSV (synthetic data is generated when missing).")
+    tune.set_defaults(func=_cmd_tune)
+
+    generate = sub.add_parser("generate", help="Write a synthetic portfolio as reproducible Parquet chunks.")
+    generate.add_argument("output_dir", help="Directory for part-*.parquet files and _manifest.json.")
+    generate.add_argument("--users", type=int, required=True, help="Number of borrowers to generate.")
+    generate.add_argument("--chunk-size", type=int, default=1_000_000, help="Borrowers per chunk file.")
+    generate.add_argument("--seed", type=int, default=42, help="Root seed; chunk seeds are derived from it.")
+    generate.add_argument("--workers", type=int, default=1, help="Processes generating chunks in parallel.")
+    generate.set_defaults(func=_cmd_generate)
+
+    store = sub.add_parser("build-store", help="Convert a CSV/Parquet portfolio into a memory-mapped column store.")
+    store.add_argument("source", help="CSV file, Parquet file or directory of Parquet chunks.")
+    store.add_argument("dest", help="Destination store directory (point AURA_DATA_PATH at it).")
+    store.add_argument("--chunksize", type=int, default=500_000, help="Rows converted per chunk.")
+    store.set_defaults(func=_cmd_build_store)
+
+    campaign = sub.add_parser("campaign", help="Expire stale offers, then run the offer policy over every pending negotiation in bulk.")
+    campaign.add_argument("db", nargs="?", default=NEGOTIATION_DB,
+                          help="SQLite negotiation database (default: $AURA_NEGOTIATION_DB).")
+    campaign.set_defaults(func=_cmd_campaign)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,92 @@
+"""
+Clocks for the negotiation engine.
+
+Timestamps are integer epoch microseconds (UTC) everywhere on the write path:
+records, chat, the event log and the decision log store the int, and it is
+only turned into text when a page renders it (format_timestamp). A clock is
+any object with a now() method returning that int; NegotiationEngine takes
+one as `clock`.
+
+SystemClock reads the wall clock but never goes backwards (a clock step
+back, e.g. NTP, repeats the last value + 1), so timestamps order events.
+SimulatedClock only moves when told to (or by a fixed step per reading), so
+simulations of weeks of negotiations and tests of offer expiry run without
+waiting for real time to pass.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+MICROS_PER_SECOND = 1_000_000
+MICROS_PER_DAY = 86_400 * MICROS_PER_SECOND
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(timestamp):
+    """
+    Normalise a stored timestamp to integer epoch microseconds.
+
+    Args:
+        timestamp: int (returned as is), a string of digits or None
+
+    Returns:
+        int, or None for None
+    """
+    if timestamp is None or isinstance(timestamp, int):
+        return timestamp
+    return int(timestamp)
+
+
+def format_timestamp(timestamp, default='-'):
+    """Render a stored timestamp as 'YYYY-MM-DD HH:MM:SS' (UTC); `default` for None/empty."""
+    if timestamp is None or timestamp == '':
+        return default
+    seconds = to_epoch_us(timestamp) // MICROS_PER_SECOND
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(seconds))
+
+
+class SystemClock:
+    """Wall-clock epoch microseconds; every reading is later than the previous one."""
+
+    def __init__(self):
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def now(self):
+        current = time.time_ns() // 1_000
+        with self._lock:
+            if current <= self._last:
+                current = self._last + 1
+            self._last = current
+        return current
+
+
+class SimulatedClock:
+    """
+    Clock that advances only on request.
+
+    Args:
+        start: Initial time: epoch microseconds, an aware datetime, or None
+            for the current wall-clock time
+        step_seconds: Added after every now() reading (0 = frozen)
+    """
+
+    def __init__(self, start=None, step_seconds=0):
+        if start is None:
+            start = time.time_ns() // 1_000
+        elif isinstance(start, datetime):
+            start = (start - datetime(1970, 1, 1, tzinfo=timezone.utc)) // _MICROSECOND
+        self._now = int(start)
+        self.step = int(step_seconds * MICROS_PER_SECOND)
+
+    def now(self):
+        current = self._now
+        self._now += self.step
+        return current
+
+    def advance(self, seconds=0, days=0):
+        """Move the clock forward; returns the new time."""
+        self._now += int(seconds * MICROS_PER_SECOND) + int(days * MICROS_PER_DAY)
+        return self._now
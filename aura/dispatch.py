@@ -0,0 +1,206 @@
+"""
+Asynchronous outbound offer delivery.
+
+OfferDispatcher sends the negotiation engine's offers out through channel
+adapters (SMS / WhatsApp gateways). It picks up offers as the engine makes
+them (engine.add_offer_listener) and, on start-up, anything the store still
+has undelivered:
+
+- a router task renders each offer (bulk offers are rendered only here, via
+  engine.send_offer_message) and hands it to its channel's queue
+- every channel has its own bounded queue and `limit` worker tasks, so one
+  slow or rate-limited gateway never holds up the others
+- failed sends are retried with exponential backoff
+- each status change ('sending', 'retrying', 'delivered', 'failed') is
+  recorded on the negotiation (engine.record_delivery) and passed to the
+  on_status callbacks
+
+An adapter is any object with `async send(user_id, message)` that returns a
+provider message id and raises on failure. FakeGateway is an in-process
+adapter with configurable latency and failure rate, so throughput can be
+tested offline (benchmarks/bench_dispatch.py).
+"""
+
+import asyncio
+import random
+import time
+
+from aura.negotiation import offer_message
+
+# Default in-flight sends per channel
+DEFAULT_CHANNEL_LIMIT = 10
+
+
+class DeliveryError(Exception):
+    """A channel adapter could not send a message (the dispatcher retries it)."""
+
+
+class FakeGateway:
+    """Offline gateway: sleeps `latency` seconds per send and fails at `failure_rate`."""
+
+    def __init__(self, name='sms', latency=0.05, failure_rate=0.0, seed=None):
+        self.name = name
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self.sent = []  # (user_id, message) in send order
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, user_id, message):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self._rng.random() < self.failure_rate:
+                raise DeliveryError(f"{self.name} gateway rejected message to {user_id}")
+            self.sent.append((user_id, message))
+            return f"{self.name}-{len(self.sent)}"
+        finally:
+            self.in_flight -= 1
+
+
+def default_route(entry, channels):
+    """The entry's preferred channel when configured, else the first channel."""
+    preferred = entry.get('channel')
+    return preferred if preferred in channels else next(iter(channels))
+
+
+class OfferDispatcher:
+    """
+    Per-channel concurrency-limited sender for negotiation offers.
+
+    Args:
+        engine: NegotiationEngine whose offers are sent
+        channels: Dict of channel name -> adapter
+        limits: Dict of channel name -> max concurrent sends (default 10 each)
+        route: Callable (entry, channels) -> channel name (default_route)
+        max_attempts: Sends per offer before it is marked failed
+        backoff: Seconds before the first retry; doubles on every retry
+        on_status: Callables (user_id, status, info) notified on every status change
+    """
+
+    def __init__(self, engine, channels, limits=None, route=default_route, max_attempts=3, backoff=0.5,
+                 on_status=()):
+        self.engine = engine
+        self.channels = dict(channels)
+        self.limits = {name: int((limits or {}).get(name, DEFAULT_CHANNEL_LIMIT)) for name in self.channels}
+        self.route = route
+        self.max_attempts = int(max_attempts)
+        self.backoff = float(backoff)
+        self.on_status = list(on_status)
+        self.stats = {'delivered': 0, 'failed': 0, 'attempts': 0, 'skipped': 0}
+        self._loop = None
+        self._inbox = None
+        self._queues = {}
+        self._tasks = []
+
+    # -- lifecycle ------------------------------------------------------------
+
+    async def start(self, include_undelivered=True):
+        """Start the router and channel workers, and subscribe to new offers."""
+        self._loop = asyncio.get_running_loop()
+        self._inbox = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._router())]
+        for name, limit in self.limits.items():
+            self._queues[name] = asyncio.Queue(maxsize=limit * 4)  # backpressure on the router
+            self._tasks += [asyncio.create_task(self._worker(name)) for _ in range(limit)]
+        self.engine.add_offer_listener(self.submit)
+        if include_undelivered:
+            self._enqueue(self.engine.store.undelivered_offers())
+
+    async def drain(self):
+        """Wait until every submitted offer has been delivered or has failed."""
+        await self._inbox.join()
+        for queue in self._queues.values():
+            await queue.join()
+        self.engine.store.flush()
+
+    async def stop(self):
+        self.engine.remove_offer_listener(self.submit)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.engine.store.flush()
+
+    async def run_once(self):
+        """Deliver everything currently undelivered, then stop. Returns stats plus elapsed seconds."""
+        start = time.perf_counter()
+        await self.start()
+        try:
+            await self.drain()
+        finally:
+            await self.stop()
+        return {**self.stats, 'seconds': time.perf_counter() - start}
+
+    # -- intake ---------------------------------------------------------------
+
+    def submit(self, user_ids):
+        """Queue offers for delivery; safe to call from any thread (it is the engine's offer listener)."""
+        if self._loop is None:
+            raise RuntimeError("OfferDispatcher.start() has not been awaited")
+        self._loop.call_soon_threadsafe(self._enqueue, list(user_ids))
+
+    def _enqueue(self, user_ids):
+        for user_id in user_ids:
+            self._inbox.put_nowait(user_id)
+
+    # -- delivery -------------------------------------------------------------
+
+    def _notify(self, user_id, status, channel, attempts, error=None):
+        self.engine.record_delivery(user_id, status, channel, attempts, error)
+        info = {'channel': channel, 'attempts': attempts, 'error': error}
+        for callback in self.on_status:
+            callback(user_id, status, info)
+
+    async def _router(self):
+        while True:
+            user_id = await self._inbox.get()
+            channel = None
+            try:
+                entry = self.engine.store.get(user_id)
+                if entry is None or entry.get('status') != 'offer_sent' or entry.get('delivery_status') == 'delivered':
+                    self.stats['skipped'] += 1
+                    continue
+                if not entry.get('last_message'):
+                    entry = self.engine.send_offer_message(user_id)
+                channel = self.route(entry, self.channels)
+                if channel not in self._queues:
+                    raise ValueError(f"route chose unknown channel {channel!r}")
+                self._notify(user_id, 'sending', channel, 0)
+                await self._queues[channel].put((user_id, offer_message(entry)))
+            except Exception as exc:
+                # One bad offer must not stop the router (drain() would wait forever)
+                self.stats['failed'] += 1
+                self._notify(user_id, 'failed', channel, 0, str(exc))
+            finally:
+                self._inbox.task_done()
+
+    async def _worker(self, channel):
+        adapter, queue = self.channels[channel], self._queues[channel]
+        while True:
+            user_id, message = await queue.get()
+            try:
+                await self._deliver(adapter, channel, user_id, message)
+            finally:
+                queue.task_done()
+
+    async def _deliver(self, adapter, channel, user_id, message):
+        for attempt in range(1, self.max_attempts + 1):
+            self.stats['attempts'] += 1
+            try:
+                await adapter.send(user_id, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if attempt == self.max_attempts:
+                    self.stats['failed'] += 1
+                    self._notify(user_id, 'failed', channel, attempt, str(exc))
+                    return
+                self._notify(user_id, 'retrying', channel, attempt, str(exc))
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            else:
+                self.stats['delivered'] += 1
+                self._notify(user_id, 'delivered', channel, attempt)
+                return
@@ -0,0 +1,207 @@
+"""
+In-memory negotiation logs.
+
+EventLog keeps the most recent `capacity` (timestamp, message) entries in a
+ring buffer, so a long-running session holds a fixed amount of log however
+many events it produces. With spill_path set, entries that fall out of the
+buffer are appended to a JSON-lines file instead of being dropped; they are
+written in chunks rather than one write per event.
+
+DecisionLog is the agent decision trace: a global append-only stream (paged
+by the analytics table) plus a bounded deque of recent decisions per user, so
+the per-borrower rationale in the Lender view costs O(k) instead of a scan of
+every decision. With capacity set, the global stream keeps only the latest
+decisions (total still counts all of them).
+
+ChatLog holds each borrower's conversation: the last `tail` messages per user
+in memory and, with spill_path set, older ones in a JSON-lines file (one
+line per spilled chunk, located through a per-user list of file offsets).
+Conversations are read a page at a time, so only the page on screen is
+loaded from disk.
+"""
+
+import json
+import os
+from collections import defaultdict, deque
+from itertools import islice
+
+
+class EventLog:
+    """Ring buffer of (timestamp, message) with optional spill to disk."""
+
+    def __init__(self, capacity=1000, spill_path=None, spill_chunk=256):
+        self.capacity = int(capacity)
+        self.spill_path = spill_path
+        self.spill_chunk = max(1, int(spill_chunk))
+        # Without a spill file the deque drops the oldest entry itself
+        self._entries = deque(maxlen=None if spill_path else self.capacity)
+        self.total = 0  # events ever appended, including dropped/spilled ones
+        self.spilled = 0
+
+    def __len__(self):
+        return min(len(self._entries), self.capacity)
+
+    def __iter__(self):
+        """Buffered entries, oldest first."""
+        return islice(self._entries, len(self._entries) - len(self), None)
+
+    def append(self, timestamp, message):
+        self._entries.append((timestamp, message))
+        self.total += 1
+        if self.spill_path and len(self._entries) >= self.capacity + self.spill_chunk:
+            self._spill(len(self._entries) - self.capacity)
+
+    def recent(self, limit=None):
+        """The last `limit` buffered entries (all of them by default), oldest first."""
+        limit = len(self) if limit is None else min(int(limit), len(self))
+        return list(islice(reversed(self._entries), limit))[::-1]
+
+    def _spill(self, count):
+        with open(self.spill_path, 'a', encoding='utf-8') as fh:
+            fh.writelines(json.dumps(self._entries.popleft(), ensure_ascii=False) + '\n' for _ in range(count))
+        self.spilled += count
+
+    def flush(self):
+        """Spill everything outside the ring buffer now (e.g. before shutdown)."""
+        overflow = len(self._entries) - self.capacity
+        if self.spill_path and overflow > 0:
+            self._spill(overflow)
+
+    def spilled_entries(self):
+        """Iterate entries previously spilled to disk, oldest first."""
+        self.flush()
+        if not self.spill_path:
+            return
+        try:
+            with open(self.spill_path, encoding='utf-8') as fh:
+                for line in fh:
+                    yield tuple(json.loads(line))
+        except FileNotFoundError:
+            return
+
+    def clear(self):
+        self._entries.clear()
+        self.total = 0
+        self.spilled = 0
+
+
+class DecisionLog:
+    """Append-only decision stream indexed by user_id; with capacity, the stream keeps only the latest decisions."""
+
+    def __init__(self, per_user=20, capacity=None):
+        self.per_user = int(per_user)
+        self.capacity = None if capacity is None else int(capacity)
+        self._stream = [] if self.capacity is None else deque(maxlen=self.capacity)
+        self._by_user = defaultdict(self._user_log)
+        self.total = 0  # decisions ever appended, including ones dropped from the stream
+
+    def _user_log(self):
+        return deque(maxlen=self.per_user)
+
+    def __len__(self):
+        return len(self._stream)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def __bool__(self):
+        return bool(self._stream)
+
+    def append(self, decision):
+        self._stream.append(decision)
+        self._by_user[decision['user_id']].append(decision)
+        self.total += 1
+
+    def for_user(self, user_id, limit=None):
+        """Most recent decisions for one user (at most per_user), oldest first."""
+        recent = self._by_user.get(user_id, ())
+        limit = len(recent) if limit is None else min(int(limit), len(recent))
+        return list(islice(reversed(recent), limit))[::-1]
+
+    def page(self, offset=0, limit=50):
+        """Slice of the (kept) stream in decision order."""
+        offset = max(0, int(offset))
+        if self.capacity is None:
+            return self._stream[offset:offset + int(limit)]
+        return list(islice(self._stream, offset, offset + int(limit)))
+
+    def clear(self):
+        self._stream.clear()
+        self._by_user.clear()
+        self.total = 0
+
+    def __getstate__(self):
+        # Both views are pickled, so per-user history survives a snapshot of a bounded stream
+        return {'per_user': self.per_user, 'capacity': self.capacity, 'total': self.total,
+                'stream': list(self._stream), 'by_user': {user_id: list(recent) for user_id, recent in self._by_user.items()}}
+
+    def __setstate__(self, state):
+        self.__init__(state['per_user'], state['capacity'])
+        self._stream.extend(state['stream'])
+        for user_id, recent in state['by_user'].items():
+            self._by_user[user_id].extend(recent)
+        self.total = state['total']
+
+
+class ChatLog:
+    """Per-user message threads with a bounded in-memory tail and optional spill to disk."""
+
+    def __init__(self, tail=100, spill_path=None, spill_chunk=50):
+        self.tail = int(tail)
+        self.spill_path = spill_path
+        self.spill_chunk = max(1, int(spill_chunk))
+        self._tails = {}  # user_id -> deque of messages, oldest first
+        self._spilled = {}  # user_id -> [(file offset, message count)] oldest chunk first
+
+    def __contains__(self, user_id):
+        return user_id in self._tails
+
+    def append(self, user_id, message):
+        messages = self._tails.get(user_id)
+        if messages is None:
+            # Without a spill file the deque drops the oldest message itself
+            messages = self._tails[user_id] = deque(maxlen=None if self.spill_path else self.tail)
+        messages.append(message)
+        if self.spill_path and len(messages) >= self.tail + self.spill_chunk:
+            self._spill(user_id, messages, len(messages) - self.tail)
+
+    def _spill(self, user_id, messages, count):
+        chunk = [messages.popleft() for _ in range(count)]
+        with open(self.spill_path, 'ab') as fh:
+            offset = fh.tell()
+            fh.write(json.dumps(chunk, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._spilled.setdefault(user_id, []).append((offset, count))
+
+    def _read_chunk(self, offset):
+        with open(self.spill_path, 'rb') as fh:
+            fh.seek(offset)
+            return [tuple(message) if isinstance(message, list) else message for message in json.loads(fh.readline())]
+
+    def count(self, user_id):
+        """Messages kept for a user (in memory and on disk)."""
+        return sum(count for _, count in self._spilled.get(user_id, ())) + len(self._tails.get(user_id, ()))
+
+    def page(self, user_id, offset=0, limit=20):
+        """Messages offset .. offset+limit of a user's thread, oldest first; reads only the chunks it needs."""
+        offset, end = max(0, int(offset)), max(0, int(offset)) + int(limit)
+        page, position = [], 0
+        for chunk_offset, count in self._spilled.get(user_id, ()):
+            if position + count > offset and position < end:
+                chunk = self._read_chunk(chunk_offset)
+                page.extend(chunk[max(0, offset - position):end - position])
+            position += count
+            if position >= end:
+                return page
+        messages = self._tails.get(user_id, ())
+        page.extend(islice(messages, max(0, offset - position), max(0, end - position)))
+        return page
+
+    def history(self, user_id):
+        """A user's whole thread, oldest first."""
+        return self.page(user_id, 0, self.count(user_id))
+
+    def clear(self):
+        self._tails.clear()
+        self._spilled.clear()
+        if self.spill_path and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
@@ -0,0 +1,153 @@
+"""
+Compiled, array-backed inference for the Risk Assessment forest.
+
+sklearn's predict_proba spends most of a single-row call on input validation
+and joblib dispatch rather than walking the trees. compile_forest() flattens
+every tree of a fitted RandomForestClassifier into shared contiguous node
+arrays, and CompiledForest walks all trees for all rows at once with plain
+NumPy indexing. Results are bit-for-bit equal to sklearn:
+
+- inputs are cast to float32 before the split comparisons (as sklearn does)
+- per-tree leaf probabilities are accumulated in tree order, then divided by
+  the number of trees
+
+CompiledForest / ArrayScaler are drop-in replacements for the (model, scaler)
+pair accepted by risk_management_agent_logic and score_portfolio. The win is on
+single-borrower and small-batch calls; large batches are still faster through
+sklearn's multithreaded tree code (see benchmarks/bench_forest.py).
+"""
+
+from importlib.metadata import version
+
+import numpy as np
+
+# sklearn >= 1.4 stores per-node class fractions in tree_.value; older
+# releases store weighted counts and normalise inside predict_proba.
+_VALUES_ARE_FRACTIONS = tuple(int(part) for part in version('scikit-learn').split('.')[:2]) >= (1, 4)
+
+
+class CompiledForest:
+    """
+    Flattened binary-classification forest.
+
+    Node arrays are concatenated across trees; roots[t] is the global index of
+    tree t's root. Leaves point to themselves on both sides so every row can
+    take exactly `depth` steps without per-row branching.
+    """
+
+    def __init__(self, feature, threshold, left, right, leaf_value, roots, depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        # Interleaved [left, right] per node: child = children[2 * node + go_right]
+        self.children = np.ascontiguousarray(np.column_stack([left, right]).ravel())
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.depth = int(depth)
+        self.n_features = int(n_features)
+        self.classes_ = np.array([0, 1])
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def predict_default_proba(self, X):
+        """Probability of default (class 1) for scaled features, shape (n_rows,)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows = X.shape[0]
+        flat_x = X.ravel()
+        row_offset = np.arange(n_rows, dtype=np.intp) * X.shape[1]
+        # (n_trees, n_rows) so the final reduction over axis 0 runs tree by tree
+        node = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.depth):
+            go_right = ~(flat_x[row_offset + self.feature[node]] <= self.threshold[node])
+            node = self.children[2 * node + go_right]
+        # cumsum is strictly sequential, matching sklearn's tree-by-tree `out += proba`
+        return np.cumsum(self.leaf_value[node], axis=0)[-1] / self.n_trees
+
+    def predict_proba(self, X):
+        """sklearn-compatible (n_rows, 2) probabilities; column 0 is 1 - P(default)."""
+        p = self.predict_default_proba(X)
+        return np.column_stack([1.0 - p, p])
+
+    def save(self, path):
+        np.savez(
+            path,
+            feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            leaf_value=self.leaf_value, roots=self.roots,
+            meta=np.array([self.depth, self.n_features]),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            depth, n_features = data['meta']
+            return cls(data['feature'], data['threshold'], data['left'], data['right'],
+                       data['leaf_value'], data['roots'], depth, n_features)
+
+
+class ArrayScaler:
+    """StandardScaler.transform without sklearn's per-call validation."""
+
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+
+    @classmethod
+    def from_scaler(cls, scaler):
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+        scale = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+        return cls(mean, scale)
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return (X - self.mean_) / self.scale_
+
+
+def compile_forest(model):
+    """Flatten a fitted binary RandomForestClassifier into a CompiledForest."""
+    if len(model.classes_) != 2 or model.n_outputs_ != 1:
+        raise ValueError("compile_forest supports single-output binary classifiers only")
+
+    features, thresholds, lefts, rights, leaf_values, roots = [], [], [], [], [], []
+    offset = 0
+    depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        own = np.arange(offset, offset + n, dtype=np.intp)
+
+        values = tree.value[:, 0, :].astype(np.float64)
+        if not _VALUES_ARE_FRACTIONS:
+            normalizer = values.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            values = values / normalizer[:, None]
+
+        features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        lefts.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.intp))
+        rights.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.intp))
+        leaf_values.append(np.where(is_leaf, values[:, 1], 0.0))
+        roots.append(offset)
+        depth = max(depth, tree.max_depth)
+        offset += n
+
+    return CompiledForest(
+        np.ascontiguousarray(np.concatenate(features)),
+        np.ascontiguousarray(np.concatenate(thresholds)),
+        np.ascontiguousarray(np.concatenate(lefts)),
+        np.ascontiguousarray(np.concatenate(rights)),
+        np.ascontiguousarray(np.concatenate(leaf_values)),
+        np.array(roots, dtype=np.intp),
+        depth,
+        model.n_features_in_,
+    )
+
+
+def compile_model(model, scaler):
+    """Compiled (model, scaler) pair, drop-in for the output of train_model."""
+    return compile_forest(model), ArrayScaler.from_scaler(scaler)
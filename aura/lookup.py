@@ -0,0 +1,113 @@
+"""
+Indexed borrower lookup for pages that pick one borrower out of millions.
+
+UserIndex is built once per portfolio from the user_id column:
+
+- a hash index (pd.Index) from user_id to row offset, so finding a
+  borrower is one hash probe instead of a scan of the user_id column
+- the ids sorted case-insensitively, so a typeahead prefix search is two
+  binary searches plus a slice of at most `limit` ids
+
+BorrowerLookup pairs the index with row access by offset: a single-row read
+from the memory maps for column stores, an iloc into the loaded frame for
+CSV / Parquet portfolios. app.py keeps one per dataset version
+(aura.aggregates.dataset_version) with st.cache_resource.
+"""
+
+import numpy as np
+import pandas as pd
+
+from aura.data import load_data
+from aura.store import ColumnStore, is_column_store
+
+# Matches returned by a typeahead search
+TYPEAHEAD_LIMIT = 20
+
+# Sorts after every character, so prefix + _PREFIX_END bounds all ids with the prefix
+_PREFIX_END = '\U0010ffff'
+
+
+class UserIndex:
+    """user_id -> row offset, plus prefix search; the first row wins for duplicated ids."""
+
+    def __init__(self, user_ids):
+        ids = pd.Series(pd.array(user_ids, dtype=str))
+        first = ~ids.duplicated().to_numpy()
+        self._ids = pd.Index(ids[first], copy=False)
+        self._rows = np.flatnonzero(first)
+        keys = self._ids.str.casefold().to_numpy(dtype=str)
+        order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[order]
+        self._sorted_ids = self._ids.to_numpy(dtype=object)[order]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, user_id):
+        return user_id in self._ids
+
+    def get(self, user_id):
+        """Row offset of user_id, or None when unknown."""
+        try:
+            return int(self._rows[self._ids.get_loc(user_id)])
+        except KeyError:
+            return None
+
+    def _bounds(self, prefix):
+        key = prefix.strip().casefold()
+        return (np.searchsorted(self._sorted_keys, key, side='left'),
+                np.searchsorted(self._sorted_keys, key + _PREFIX_END, side='left'))
+
+    def search(self, prefix, limit=TYPEAHEAD_LIMIT):
+        """First `limit` ids starting with prefix (case-insensitive), in sorted order."""
+        start, end = self._bounds(prefix)
+        return self._sorted_ids[start:min(end, start + limit)].tolist()
+
+    def count(self, prefix):
+        """Number of ids starting with prefix."""
+        start, end = self._bounds(prefix)
+        return int(end - start)
+
+
+class BorrowerLookup:
+    """
+    UserIndex over the portfolio at `path`, with O(1) row fetch by user_id.
+
+    Args:
+        path: CSV, Parquet or column store (see aura.data.load_data)
+        columns: Columns row() returns (all by default); CSV / Parquet
+            portfolios are loaded with only these columns (plus user_id)
+    """
+
+    def __init__(self, path, columns=None):
+        self.columns = None if columns is None else list(columns)
+        if is_column_store(path):
+            self._store = ColumnStore(path)
+            self._frame = None
+            self.index = UserIndex(self._store.read(['user_id'])['user_id'])
+        else:
+            self._store = None
+            columns = self.columns
+            if columns is not None and 'user_id' not in columns:
+                columns = columns + ['user_id']
+            self._frame = load_data(path, columns)
+            self.index = UserIndex(self._frame['user_id'])
+
+    def __len__(self):
+        return len(self.index)
+
+    def search(self, prefix, limit=TYPEAHEAD_LIMIT):
+        return self.index.search(prefix, limit)
+
+    def count(self, prefix):
+        return self.index.count(prefix)
+
+    def row(self, user_id):
+        """One borrower as a Series, or None when unknown."""
+        position = self.index.get(user_id)
+        if position is None:
+            return None
+        if self._store is not None:
+            return self._store.read(self.columns, rows=[position]).iloc[0]
+        row = self._frame.iloc[position]
+        return row if self.columns is None else row[self.columns]
@@ -0,0 +1,82 @@
+"""
+RISK ASSESSMENT AGENT (Agent #3) - model training.
+
+sklearn is imported inside train_model: importing it costs about a second,
+and most processes load a persisted artifact (aura.artifacts) instead of
+training.
+"""
+
+# Feature columns (alternative data sources)
+FEATURE_COLS = [
+    'loan_amount',
+    'network_usage_stability',
+    'utility_payment_timeliness',
+    'mobility_score',
+    'ecommerce_transaction_frequency',
+    'social_network_connectivity',
+    'device_usage_consistency'
+]
+
+# Columns train_model reads (projection for load_data)
+TRAINING_COLS = FEATURE_COLS + ['default_label']
+
+# Random Forest hyperparameters used by the dashboards
+MODEL_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 10,
+    'min_samples_split': 5,
+    'random_state': 42,
+    'class_weight': 'balanced',
+}
+
+def train_model(df, params=None):
+    """
+    RISK ASSESSMENT AGENT (Agent #3)
+    
+    Trains ML ensemble for default prediction using Random Forest.
+    
+    Production upgrade path:
+    - Add XGBoost, LightGBM for ensemble diversity
+    - Implement CKKS Homomorphic Encryption (TenSEAL library)
+    - Enable inference on encrypted data (zero exposure)
+    
+    Args:
+        df: Training data with FEATURE_COLS and 'default_label'
+        params: RandomForestClassifier hyperparameters (defaults to MODEL_PARAMS)
+    
+    Returns: trained model, scaler, feature columns, and performance metrics.
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    
+    feature_cols = list(FEATURE_COLS)
+    
+    # Plain arrays: the scaler and forest are then fed ndarrays at inference time too
+    X = df[feature_cols].to_numpy(dtype=float)
+    y = df['default_label'].to_numpy()
+    
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    
+    # Train Random Forest model
+    model = RandomForestClassifier(**(MODEL_PARAMS if params is None else params))
+    model.fit(X_train_scaled, y_train)
+    
+    # Calculate metrics
+    train_score = model.score(X_train_scaled, y_train)
+    test_score = model.score(X_test_scaled, y_test)
+    
+    metrics = {
+        'train_accuracy': train_score,
+        'test_accuracy': test_score,
+        'feature_importance': dict(zip(feature_cols, model.feature_importances_))
+    }
+    
+    return model, scaler, feature_cols, metrics
+
@@ -0,0 +1,424 @@
+"""
+Live negotiation engine (Streamlit-free).
+
+NegotiationEngine holds the negotiation state transitions and the autonomous
+offer policy. State lives in a pluggable store (see aura.negotiation_store):
+app.py uses a per-session MemoryNegotiationStore by default, or one shared
+SQLiteNegotiationStore per server process when AURA_NEGOTIATION_DB is set.
+
+auto_negotiate_all(bulk=True) is the campaign path: decide_offers() evaluates
+the offer policy for every pending borrower as NumPy array operations, the
+store applies all offers in one batch, and the agent message / decision
+rationale text is only rendered when it is needed (send_offer_message,
+offer_message, decision_reason). Rendered text is identical to decide_offer.
+
+Timestamps come from the engine's clock (aura.clock) as integer epoch
+microseconds; pass a SimulatedClock to run simulations or offer-expiry
+checks (expire_offers) without waiting for real time.
+"""
+
+import numpy as np
+
+from aura.clock import MICROS_PER_DAY, SystemClock
+from aura.negotiation_store import DELIVERY_FIELDS, MemoryNegotiationStore
+from aura.replies import parse_replies
+
+DEMO_PROFILES = [
+    {"user_id": "USR1001", "name": "Gulam", "wallet": 2000, "missed_amount": 2000, "offer_amount": 500, "expiry_days": 7},
+    {"user_id": "USR1002", "name": "Priya", "wallet": 1500, "missed_amount": 1800, "offer_amount": 400, "expiry_days": 10},
+    {"user_id": "USR1003", "name": "Raj", "wallet": 3000, "missed_amount": 2500, "offer_amount": 800, "expiry_days": 5},
+    {"user_id": "USR1004", "name": "Anjali", "wallet": 1200, "missed_amount": 1500, "offer_amount": 350, "expiry_days": 14},
+]
+
+# auto_negotiate_all only approaches borrowers with at least this much in their wallet
+MIN_AUTO_WALLET = 300
+
+# Event-log entries returned by negotiation_summary (the UI shows the last 25)
+SUMMARY_LOG_LIMIT = 25
+
+
+# Expiry tier -> strategy rationale used by decide_offer
+STRATEGIES = {
+    14: "High burden detected; extending window to encourage partial recovery.",
+    10: "Moderate burden; balanced short extension.",
+    7: "Low relative burden; shorter grace to maintain momentum.",
+}
+
+
+def _policy_message(name, missed, wallet, offer, expiry):
+    return (
+        f"Hello {name}. I assessed your situation: missed ₹{missed:,} vs wallet ₹{wallet:,}. "
+        f"If you can clear ₹{offer:,} today, I will extend the remaining balance for {expiry} days."
+        " Does this work for you?"
+    )
+
+
+def _policy_reason(offer, expiry, ratio):
+    return f"offer={offer} expiry={expiry} ratio={ratio:.2f}; {STRATEGIES[expiry]}"
+
+
+def decide_offer(entry):
+    """Policy function selecting offer & expiry with rationale.
+    Heuristic tiers based on wallet and missed_amount.
+    """
+    wallet = entry.get('wallet', 0)
+    missed = entry.get('missed_amount', 0)
+    # Base offer: 25% of missed, capped by wallet, min 250
+    raw_offer = int(max(250, min(wallet, missed * 0.25)))
+    # Risk proxy: ratio missed/wallet (higher ratio => more constrained)
+    ratio = missed / wallet if wallet else 1
+    if ratio > 1.2:
+        expiry = 14
+    elif ratio > 0.8:
+        expiry = 10
+    else:
+        expiry = 7
+    message = _policy_message(entry['name'], missed, wallet, raw_offer, expiry)
+    reason = _policy_reason(raw_offer, expiry, ratio)
+    return raw_offer, expiry, message, reason
+
+
+def decide_offers(wallet, missed):
+    """
+    decide_offer for many borrowers at once, without the text.
+
+    Args:
+        wallet, missed: Integer arrays of wallet balance and missed amount
+
+    Returns:
+        (offers, expiries, ratios) arrays; element i equals the offer, expiry
+        and ratio decide_offer returns for borrower i.
+    """
+    wallet = np.asarray(wallet)
+    missed = np.asarray(missed)
+    # int() truncates toward zero, as astype does
+    offers = np.maximum(250, np.minimum(wallet, missed * 0.25)).astype(np.int64)
+    ratios = np.divide(missed, wallet, out=np.ones(len(wallet)), where=wallet != 0)
+    expiries = np.where(ratios > 1.2, 14, np.where(ratios > 0.8, 10, 7))
+    return offers, expiries, ratios
+
+
+def offer_message(entry):
+    """The agent's message for entry's current offer, rendering deferred bulk offers on demand."""
+    if entry.get('last_message') or entry.get('status') != 'offer_sent':
+        return entry.get('last_message')
+    return _policy_message(entry['name'], entry['missed_amount'], entry['wallet'],
+                           entry['offer_amount'], entry['expiry_days'])
+
+
+def decision_reason(decision):
+    """Rationale text of a decision (bulk decisions store only the ratio)."""
+    if decision.get('reason') is None and decision.get('ratio') is not None:
+        return _policy_reason(decision['offer'], decision['expiry'], decision['ratio'])
+    return decision.get('reason')
+
+
+class NegotiationEngine:
+    """Negotiation state transitions over a negotiation store."""
+
+    def __init__(self, store=None, clock=None):
+        self.store = MemoryNegotiationStore() if store is None else store
+        self.clock = SystemClock() if clock is None else clock
+        self._offer_listeners = []
+
+    # Outbound hook: listeners (e.g. aura.dispatch.OfferDispatcher) get the
+    # user_ids of every offer made, right after it is written to the store
+    def add_offer_listener(self, listener):
+        self._offer_listeners.append(listener)
+
+    def remove_offer_listener(self, listener):
+        if listener in self._offer_listeners:
+            self._offer_listeners.remove(listener)
+
+    def _offers_made(self, user_ids):
+        for listener in list(self._offer_listeners):
+            listener(user_ids)
+
+    # Create demo borrower (idempotent with custom params)
+    def get_or_create_demo_user(self, user_id="USR1001", name="Gulam", wallet=2000, missed_amount=2000,
+                                offer_amount=500, expiry_days=7):
+        entry = self.store.get(user_id)
+        if entry is None:
+            entry = {
+                "user_id": user_id,
+                "name": name,
+                "wallet": wallet,
+                "missed_amount": missed_amount,
+                "offer_amount": offer_amount,
+                "expiry_days": expiry_days,
+                "status": "pending",
+                "started_at": self.clock.now(),
+                "accepted_at": None,
+                "last_message": None,
+            }
+            self.store.save(entry)
+            self.store.append_log(self.clock.now(), f"Demo user {user_id} created")
+        return entry
+
+    # Seed multiple demo users with varied profiles
+    def seed_demo_users(self):
+        with self.store.batch():
+            for profile in DEMO_PROFILES:
+                self.get_or_create_demo_user(**profile)
+
+    def reset(self):
+        self.store.clear()
+
+    # Start negotiation (idempotent start)
+    def start_negotiation(self, user_id, offer_amount=None, expiry_days=None, agent_message=None, decision_reason=None):
+        entry = self.store.get(user_id)
+        if entry is None:
+            entry = self.get_or_create_demo_user(user_id)
+        return self._start(entry, offer_amount, expiry_days, agent_message, decision_reason)
+
+    def _start(self, entry, offer_amount=None, expiry_days=None, agent_message=None, decision_reason=None):
+        # If already restructured, do nothing
+        if entry["status"] == "restructured":
+            return entry
+        user_id = entry["user_id"]
+        # populate/overwrite offer fields if provided
+        if offer_amount is not None:
+            entry["offer_amount"] = int(offer_amount)
+        if expiry_days is not None:
+            entry["expiry_days"] = int(expiry_days)
+        now = self.clock.now()
+        entry["status"] = "offer_sent"
+        entry["started_at"] = entry.get("started_at") or now
+        entry["offered_at"] = now
+        entry["last_message"] = agent_message or (
+            f"Hi {entry['name']}, you missed your payment. I see you have ₹{entry['wallet']:,}. "
+            f"If you pay ₹{entry['offer_amount']:,} today, I can extend the rest for {entry['expiry_days']} days. Do you accept?"
+        )
+        self.store.save(entry)
+        self._clear_delivery(entry)
+        # Append agent message to chat history for continuity
+        self.store.append_chat(entry, {
+            "role": "agent",
+            "message": entry["last_message"],
+            "timestamp": self.clock.now()
+        })
+        self.store.append_log(self.clock.now(), f"Offer sent to {user_id}: ₹{entry['offer_amount']}")
+        if decision_reason:
+            self.store.append_decision({
+                "user_id": user_id,
+                "offer": entry['offer_amount'],
+                "expiry": entry['expiry_days'],
+                "reason": decision_reason,
+                "timestamp": self.clock.now()
+            })
+        self._offers_made([user_id])
+        return entry
+
+    # Accept offer (idempotent and safe)
+    def accept_offer(self, user_id):
+        entry = self.store.get(user_id)
+        if entry is None:
+            raise ValueError("No negotiation exists for user_id=" + str(user_id))
+        return self._accept(entry)
+
+    def _accept(self, entry):
+        user_id = entry["user_id"]
+        # If already accepted/restructured, return unchanged (no double counting)
+        if entry.get("status") == "restructured":
+            return entry
+        # Only accept if offer was sent (simple happy path guard)
+        if entry.get("status") not in ("offer_sent", "pending"):
+            # still allow accept for demo, but log it
+            self.store.append_log(self.clock.now(), f"Accept invoked for {user_id} but status was {entry.get('status')}")
+        # update accepted
+        entry["accepted_at"] = self.clock.now()
+        # increment funds_recovered by the offered immediate payment, counted
+        # once per negotiation even when several processes accept it
+        recovered = entry.get("offer_amount", 0)
+        self.store.restructure(entry, recovered)
+        # Add to chat history
+        self.store.append_chat(entry, {
+            "role": "borrower",
+            "message": "I accept the offer. Thank you!",
+            "timestamp": self.clock.now()
+        })
+        self.store.append_log(self.clock.now(), f"{user_id} accepted offer; recovered ₹{recovered}")
+        return entry
+
+    def _clear_delivery(self, entry):
+        """Forget the previous offer's delivery so the dispatcher sends the new one."""
+        if entry.get('delivery_status') is not None:
+            entry.update(dict.fromkeys(DELIVERY_FIELDS))
+            self.store.update_delivery(entry['user_id'], None, None, None)
+
+    def record_delivery(self, user_id, status, channel=None, attempts=0, error=None):
+        """Delivery-status callback: track the outbound offer on the negotiation record."""
+        self.store.update_delivery(user_id, status, channel, attempts)
+        if status == 'delivered':
+            self.store.append_log(self.clock.now(), f"Offer to {user_id} delivered via {channel}")
+        elif status == 'failed':
+            self.store.append_log(self.clock.now(), f"Offer to {user_id} failed via {channel} after {attempts} attempt(s): {error}")
+
+    # Add message to chat history
+    def add_chat_message(self, user_id, role, message):
+        entry = self.store.get(user_id)
+        if entry is not None:
+            self._chat(entry, role, message)
+
+    def _chat(self, entry, role, message):
+        self.store.append_chat(entry, {
+            "role": role,
+            "message": message,
+            "timestamp": self.clock.now()
+        })
+        self.store.append_log(self.clock.now(), f"{entry['user_id']} ({role}): {message[:50]}...")
+
+    # Simple getter for summary info; counters are maintained by the store
+    def negotiation_summary(self, log_limit=SUMMARY_LOG_LIMIT):
+        return {
+            "total_recovered": self.store.funds_recovered,
+            "total_missed": self.store.total_missed,
+            "counts": self.store.status_counts(),
+            "negotiations": self.store.negotiations,
+            "log": self.store.recent_log(log_limit),
+            "decisions": self.store.decisions,
+        }
+
+    def auto_negotiate_all(self, bulk=False):
+        """Scan pending users and autonomously initiate negotiations using policy.
+
+        With bulk=True the policy is evaluated as array operations over every
+        pending user and applied in one batch; messages are rendered later by
+        send_offer_message.
+        """
+        if bulk:
+            return self._auto_negotiate_bulk()
+        actions = 0
+        with self.store.batch():
+            for entry in self.store.iter_negotiations(status='pending'):
+                if entry.get('wallet', 0) >= MIN_AUTO_WALLET:
+                    offer, expiry, msg, reason = decide_offer(entry)
+                    self._start(entry, offer_amount=offer, expiry_days=expiry, agent_message=msg, decision_reason=reason)
+                    actions += 1
+        return actions
+
+    def _auto_negotiate_bulk(self):
+        user_ids, wallet, missed = self.store.pending_offer_terms(MIN_AUTO_WALLET)
+        if not user_ids:
+            return 0
+        offers, expiries, ratios = decide_offers(wallet, missed)
+        with self.store.batch():
+            now = self.clock.now()
+            self.store.apply_offers(user_ids, offers, expiries, ratios, now)
+            self.store.append_log(now, f"Agent queued {len(user_ids):,} offers in bulk")
+        self._offers_made(user_ids)
+        return len(user_ids)
+
+    def expire_offers(self):
+        """Return offers older than their expiry_days to 'pending' so they can be re-offered.
+
+        Returns:
+            Number of offers expired
+        """
+        now = self.clock.now()
+        expired = 0
+        with self.store.batch():
+            for entry in list(self.store.iter_negotiations(status='offer_sent')):
+                offered_at = entry.get('offered_at') or entry.get('started_at')
+                if offered_at is None or offered_at + entry.get('expiry_days', 0) * MICROS_PER_DAY > now:
+                    continue
+                entry['status'] = 'pending'
+                self.store.save(entry)
+                self._clear_delivery(entry)
+                self.store.append_log(now, f"Offer to {entry['user_id']} expired after {entry['expiry_days']} days")
+                expired += 1
+        return expired
+
+    def send_offer_message(self, user_id):
+        """Render a deferred bulk offer and record it as sent (no-op once sent)."""
+        entry = self.store.get(user_id)
+        if entry is None or entry.get('last_message') or entry.get('status') != 'offer_sent':
+            return entry
+        entry['last_message'] = offer_message(entry)
+        self.store.save(entry)
+        self.store.append_chat(entry, {
+            "role": "agent",
+            "message": entry["last_message"],
+            "timestamp": self.clock.now()
+        })
+        self.store.append_log(self.clock.now(), f"Offer sent to {user_id}: ₹{entry['offer_amount']}")
+        return entry
+
+    def handle_counter_offer_text(self, user_id, text):
+        """Parse one borrower reply and respond to it (see handle_replies)."""
+        return self.handle_replies([(user_id, text)])[0]
+
+    def handle_replies(self, replies):
+        """Route a batch of borrower replies to the negotiation engine.
+
+        Every reply is classified by aura.replies.parse_reply; negotiations are
+        fetched in one store round-trip and all resulting writes go out in one
+        store batch.
+
+        Args:
+            replies: Iterable of (user_id, text)
+
+        Returns:
+            The agent's response text for each reply, in order
+        """
+        replies = list(replies)
+        parsed = parse_replies([text for _, text in replies])
+        entries = self.store.get_many({user_id for user_id, _ in replies})
+        responses = []
+        with self.store.batch():
+            for (user_id, _), (intent, amount) in zip(replies, parsed):
+                entry = entries.get(user_id)
+                if entry is None:
+                    responses.append("No active negotiation.")
+                elif intent == 'counter':
+                    responses.append(self._counter_offer(entry, amount))
+                elif intent == 'accept' and entry.get('status') == 'offer_sent':
+                    self._accept(entry)
+                    responses.append(f"Offer accepted at ₹{entry.get('offer_amount', 0)}. Restructuring confirmed.")
+                elif intent == 'refuse' and entry.get('status') == 'offer_sent':
+                    responses.append(self._refuse(entry))
+                else:
+                    responses.append("I noted your response. Could you specify an amount (e.g., 300)?")
+        return responses
+
+    def _refuse(self, entry):
+        entry['status'] = 'rejected'
+        self.store.save(entry)
+        self._chat(entry, 'agent', "Understood. If a smaller payment works for you, reply with the amount you can manage.")
+        return "Offer declined. You can still reply with an amount you can pay."
+
+    def _counter_offer(self, entry, proposed):
+        """Adapt the decision to a borrower counter offer if within acceptable bounds."""
+        user_id = entry['user_id']
+        current = entry.get('offer_amount', 0)
+        min_threshold = max(200, int(current * 0.5))  # do not go below 50% of original offer (or ₹200)
+        if proposed >= current:
+            # Accept immediately at current terms
+            self._chat(entry, 'agent', f"Your proposed amount matches or exceeds the offer (₹{proposed}). Proceeding to restructure.")
+            self._accept(entry)
+            return f"Accepted at ₹{proposed}. Restructuring confirmed."
+        elif proposed >= min_threshold:
+            # Adjust offer downward, then accept
+            entry['offer_amount'] = proposed
+            self.store.save(entry)
+            self._chat(entry, 'agent', f"I can approve ₹{proposed} today with same {entry['expiry_days']} day extension. Processing...")
+            self._accept(entry)
+            # Log decision adaptation
+            self.store.append_decision({
+                'user_id': user_id,
+                'offer': proposed,
+                'expiry': entry['expiry_days'],
+                'reason': f"Counter-offer accepted. Proposed {proposed} >= threshold {min_threshold}.",
+                'timestamp': self.clock.now()
+            })
+            return f"Counter-offer accepted at ₹{proposed}."
+        else:
+            self._chat(entry, 'agent', f"₹{proposed} is below the feasible threshold (₹{min_threshold}). Could you meet at ₹{min_threshold}?")
+            self.store.append_decision({
+                'user_id': user_id,
+                'offer': current,
+                'expiry': entry['expiry_days'],
+                'reason': f"Counter too low ({proposed} < {min_threshold}). Suggested minimum.",
+                'timestamp': self.clock.now()
+            })
+            return f"₹{proposed} is too low; minimum acceptable is ₹{min_threshold}."
@@ -0,0 +1,1011 @@
+"""
+Storage backends for the negotiation engine.
+
+MemoryNegotiationStore keeps the original per-session layout (a dict of
+negotiation dicts) with a bounded, optionally spilling event log. SQLiteNegotiationStore persists the same
+state in a SQLite database in WAL mode, so it survives restarts and can be
+shared by several server processes:
+
+- negotiations are keyed by user_id and indexed on (status, user_id), so
+  pending users are found without a table scan
+- chat messages and agent decisions are separate tables indexed by user_id
+- writes are buffered and flushed with executemany in one transaction; inside
+  `with store.batch():` nothing is committed until the block ends (or the
+  buffer reaches batch_size)
+
+Chat is never attached to a negotiation entry: chat_page(user_id, offset,
+limit) / chat_count(user_id) read one page of a conversation (the memory
+store keeps the last chat_tail messages per user in memory and older ones in
+chat_spill_path, see aura.event_log.ChatLog).
+
+Both stores expose the same methods; `store.negotiations` is a read-only
+user_id -> negotiation mapping and `store.decisions` a DecisionLog-like view
+(len, iteration, for_user, page) in both cases (lazy for SQLite). Status counts
+and totals are maintained on every save (by triggers in SQLite), so
+status_counts() / total_missed never scan the negotiations.
+
+JournaledNegotiationStore is the event-sourced alternative: state is held in
+memory, every write is first appended to a JSON-lines journal, and periodic
+snapshots keep crash recovery to "load snapshot, replay the tail".
+
+    AURA_NEGOTIATION_DB=negotiations.db streamlit run app.py
+    AURA_NEGOTIATION_JOURNAL=negotiations.journal/ streamlit run app.py
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+import numpy as np
+
+from aura.event_log import ChatLog, DecisionLog, EventLog
+from aura.clock import to_epoch_us
+from aura.records import STATUS_NAMES, NegotiationRecord, Status
+
+NEGOTIATION_DB = os.environ.get('AURA_NEGOTIATION_DB')
+NEGOTIATION_JOURNAL = os.environ.get('AURA_NEGOTIATION_JOURNAL')
+
+# Decisions kept in the journaled store's memory (and snapshot): the latest
+# decisions overall and per borrower; the journal keeps them all
+JOURNAL_DECISION_CAPACITY = 10_000
+JOURNAL_DECISIONS_PER_USER = 5
+
+STATUSES = STATUS_NAMES  # ('pending', 'offer_sent', 'restructured', 'rejected')
+
+NEGOTIATION_FIELDS = (
+    'user_id', 'name', 'wallet', 'missed_amount', 'offer_amount', 'expiry_days',
+    'status', 'started_at', 'accepted_at', 'last_message', 'offered_at',
+)
+
+# Written only by update_delivery (the outbound dispatcher), never by save;
+# cleared whenever a new offer is made (engine._start, apply_offers)
+DELIVERY_FIELDS = ('delivery_status', 'delivery_channel', 'delivery_attempts')
+
+
+class MemoryNegotiationStore:
+    """In-process store of compact NegotiationRecords (see aura.records), chat kept per user."""
+
+    def __init__(self, log_capacity=1000, log_spill_path=None, chat_tail=100, chat_spill_path=None,
+                 decision_capacity=None, decisions_per_user=20):
+        self.negotiations = {}  # user_id -> NegotiationRecord
+        self._chat = ChatLog(chat_tail, chat_spill_path)  # (role, message, epoch_us) per user
+        self.funds_recovered = 0
+        self.total_missed = 0
+        self._counts = dict.fromkeys(STATUSES, 0)
+        self._log = EventLog(log_capacity, log_spill_path)
+        self.decisions = DecisionLog(decisions_per_user, decision_capacity)
+
+    def __contains__(self, user_id):
+        return user_id in self.negotiations
+
+    def __len__(self):
+        return len(self.negotiations)
+
+    def get(self, user_id):
+        return self.negotiations.get(user_id)
+
+    def get_many(self, user_ids):
+        """Dict of user_id -> entry for the user_ids that exist."""
+        return {user_id: self.negotiations[user_id] for user_id in user_ids if user_id in self.negotiations}
+
+    def save(self, entry):
+        user_id = entry['user_id']
+        record = self.negotiations.get(user_id)
+        previous = None if record is None else (record.saved_status, record.saved_missed)
+        if record is not entry:
+            # A plain dict entry (new, or a copy of a stored one) is folded into a record
+            if isinstance(entry, NegotiationRecord):
+                record, previous = entry, None
+            elif record is None:
+                record = NegotiationRecord({key: value for key, value in entry.items() if key != 'chat_history'})
+            else:
+                record.update((key, value) for key, value in entry.items() if key != 'chat_history')
+            self.negotiations[user_id] = record
+        # Records are mutated in place, so diff against what was last counted
+        status, missed = record.get('status', 'pending'), record.get('missed_amount', 0) or 0
+        if previous != (status, missed):
+            if previous is not None:
+                self._counts[previous[0]] -= 1
+                self.total_missed -= previous[1]
+            self._counts[status] = self._counts.get(status, 0) + 1
+            self.total_missed += missed
+            record.saved_status, record.saved_missed = status, missed
+
+    def iter_negotiations(self, status=None):
+        for entry in list(self.negotiations.values()):
+            if status is None or entry.get('status') == status:
+                yield entry
+
+    def status_counts(self):
+        return dict(self._counts)
+
+    def pending_offer_terms(self, min_wallet):
+        """(user_ids, wallet array, missed array) of pending users with wallet >= min_wallet."""
+        # Records are read through their slots here; this scans every negotiation
+        pending = [record for record in self.negotiations.values()
+                   if getattr(record, 'status', None) is Status.PENDING and (getattr(record, 'wallet', 0) or 0) >= min_wallet]
+        wallet = np.array([record.wallet or 0 for record in pending], dtype=np.int64)
+        missed = np.array([record.missed_amount or 0 for record in pending], dtype=np.int64)
+        return [record.user_id for record in pending], wallet, missed
+
+    def apply_offers(self, user_ids, offers, expiries, ratios, timestamp):
+        """Mark pending users offer_sent with the given terms; message text is left unrendered."""
+        timestamp = to_epoch_us(timestamp)
+        for user_id, offer, expiry, ratio in zip(user_ids, offers.tolist(), expiries.tolist(), ratios.tolist()):
+            record = self.negotiations[user_id]
+            record.offer_amount = offer
+            record.expiry_days = expiry
+            record.status = Status.OFFER_SENT
+            record.started_at = getattr(record, 'started_at', None) or timestamp
+            record.offered_at = timestamp
+            record.last_message = None
+            if getattr(record, 'delivery_status', None) is not None:
+                record.delivery_status = record.delivery_channel = record.delivery_attempts = None
+            self.save(record)
+            self.decisions.append({'user_id': user_id, 'offer': offer, 'expiry': expiry, 'reason': None,
+                                   'timestamp': timestamp, 'ratio': ratio})
+
+    def add_recovered(self, amount):
+        self.funds_recovered = int(self.funds_recovered) + int(amount)
+
+    def restructure(self, entry, amount):
+        """Save entry as restructured, adding amount to funds_recovered the first time only; True if counted now."""
+        record = self.negotiations.get(entry['user_id'])
+        counted = not (entry.get('_counted') or (record is not None and record.get('_counted')))
+        entry['status'] = 'restructured'
+        entry['_counted'] = True
+        self.save(entry)
+        if counted:
+            self.add_recovered(amount)
+        return counted
+
+    def update_delivery(self, user_id, status, channel, attempts):
+        entry = self.negotiations.get(user_id)
+        if entry is not None:
+            entry.update(zip(DELIVERY_FIELDS, (status, channel, attempts)))
+
+    def undelivered_offers(self):
+        """user_ids of offers not yet delivered or failed (includes sends cut off by a restart)."""
+        return [user_id for user_id, entry in self.negotiations.items()
+                if entry.get('status') == 'offer_sent' and entry.get('delivery_status') not in ('delivered', 'failed')]
+
+    def flush(self):
+        pass
+
+    def append_chat(self, entry, message):
+        self._chat.append(entry['user_id'], (message['role'], message['message'], to_epoch_us(message['timestamp'])))
+
+    @staticmethod
+    def _messages(rows):
+        return [{'role': role, 'message': message, 'timestamp': timestamp} for role, message, timestamp in rows]
+
+    def chat_history(self, user_id):
+        return self._messages(self._chat.history(user_id))
+
+    def chat_count(self, user_id):
+        return self._chat.count(user_id)
+
+    def chat_page(self, user_id, offset=0, limit=20):
+        """Messages offset .. offset+limit of a user's conversation, oldest first."""
+        return self._messages(self._chat.page(user_id, offset, limit))
+
+    def append_log(self, timestamp, message):
+        self._log.append(timestamp, message)
+
+    def recent_log(self, limit=None):
+        return self._log.recent(limit)
+
+    def append_decision(self, decision):
+        self.decisions.append(decision)
+
+    def clear(self):
+        self._chat.clear()
+        self.__init__(self._log.capacity, self._log.spill_path, self._chat.tail, self._chat.spill_path,
+                      self.decisions.capacity, self.decisions.per_user)
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS negotiations (
+    user_id       TEXT PRIMARY KEY,
+    name          TEXT,
+    wallet        INTEGER,
+    missed_amount INTEGER,
+    offer_amount  INTEGER,
+    expiry_days   INTEGER,
+    status        TEXT NOT NULL,
+    started_at    INTEGER,
+    accepted_at   INTEGER,
+    last_message  TEXT,
+    offered_at    INTEGER,
+    counted       INTEGER NOT NULL DEFAULT 0,
+    delivery_status   TEXT,
+    delivery_channel  TEXT,
+    delivery_attempts INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_negotiations_status ON negotiations (status, user_id);
+
+CREATE TABLE IF NOT EXISTS chat (
+    id        INTEGER PRIMARY KEY,
+    user_id   TEXT NOT NULL,
+    role      TEXT,
+    message   TEXT,
+    timestamp INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_chat_user ON chat (user_id, id);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    id        INTEGER PRIMARY KEY,
+    user_id   TEXT NOT NULL,
+    offer     INTEGER,
+    expiry    INTEGER,
+    reason    TEXT,
+    timestamp INTEGER,
+    ratio     REAL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_user ON decisions (user_id, id);
+
+CREATE TABLE IF NOT EXISTS event_log (
+    id        INTEGER PRIMARY KEY,
+    timestamp INTEGER,
+    message   TEXT
+);
+
+CREATE TABLE IF NOT EXISTS totals (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (key, value) VALUES ('funds_recovered', 0), ('total_missed', 0), ('decisions', 0);
+
+CREATE TABLE IF NOT EXISTS status_counts (
+    status TEXT PRIMARY KEY,
+    count  INTEGER NOT NULL
+);
+
+-- Counters follow every transition, so summaries never scan negotiations
+CREATE TRIGGER IF NOT EXISTS negotiations_counted_insert AFTER INSERT ON negotiations BEGIN
+    INSERT INTO status_counts (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    UPDATE totals SET value = value + COALESCE(NEW.missed_amount, 0) WHERE key = 'total_missed';
+END;
+CREATE TRIGGER IF NOT EXISTS negotiations_counted_update AFTER UPDATE OF status, missed_amount ON negotiations BEGIN
+    UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+    INSERT INTO status_counts (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    UPDATE totals SET value = value - COALESCE(OLD.missed_amount, 0) + COALESCE(NEW.missed_amount, 0)
+        WHERE key = 'total_missed';
+END;
+CREATE TRIGGER IF NOT EXISTS decisions_counted_insert AFTER INSERT ON decisions BEGIN
+    UPDATE totals SET value = value + 1 WHERE key = 'decisions';
+END;
+CREATE TRIGGER IF NOT EXISTS decisions_counted_delete AFTER DELETE ON decisions BEGIN
+    UPDATE totals SET value = value - 1 WHERE key = 'decisions';
+END;
+CREATE TRIGGER IF NOT EXISTS negotiations_counted_delete AFTER DELETE ON negotiations BEGIN
+    UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+    UPDATE totals SET value = value - COALESCE(OLD.missed_amount, 0) WHERE key = 'total_missed';
+END;
+"""
+
+_UPSERT = (
+    f"INSERT INTO negotiations ({', '.join(NEGOTIATION_FIELDS)}, counted) "
+    f"VALUES ({', '.join('?' * (len(NEGOTIATION_FIELDS) + 1))}) "
+    f"ON CONFLICT (user_id) DO UPDATE SET "
+    + ', '.join(f"{field} = excluded.{field}" for field in NEGOTIATION_FIELDS[1:] if field != 'status')
+    # A counted (restructured) negotiation stays so: a stale copy saved by
+    # another process must not revert it or make it countable again
+    + ", status = CASE WHEN negotiations.counted THEN negotiations.status ELSE excluded.status END"
+    + ", counted = MAX(negotiations.counted, excluded.counted)"
+)
+
+_SELECT = f"SELECT {', '.join(NEGOTIATION_FIELDS)}, counted, {', '.join(DELIVERY_FIELDS)} FROM negotiations"
+
+
+class _NegotiationsView(Mapping):
+    """Lazy user_id -> negotiation mapping over a SQLiteNegotiationStore."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, user_id):
+        entry = self._store.get(user_id)
+        if entry is None:
+            raise KeyError(user_id)
+        return entry
+
+    def __iter__(self):
+        for entry in self._store.iter_negotiations():
+            yield entry['user_id']
+
+    def __len__(self):
+        return len(self._store)
+
+    def __contains__(self, user_id):
+        return user_id in self._store
+
+    def items(self):
+        return ((entry['user_id'], entry) for entry in self._store.iter_negotiations())
+
+    def values(self):
+        return self._store.iter_negotiations()
+
+
+_DECISION_FIELDS = ('user_id', 'offer', 'expiry', 'reason', 'timestamp', 'ratio')
+_SELECT_DECISIONS = f"SELECT {', '.join(_DECISION_FIELDS)} FROM decisions"
+
+
+class _DecisionsView:
+    """DecisionLog-shaped view over the decisions table (indexed on user_id, id)."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def _rows(self, sql, params=()):
+        return [dict(zip(_DECISION_FIELDS, row)) for row in self._store._query(sql, params)]
+
+    def __len__(self):
+        return self._store._total('decisions')
+
+    @property
+    def total(self):
+        return len(self)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        last = 0
+        while True:
+            rows = self._store._query(f"SELECT id, {', '.join(_DECISION_FIELDS)} FROM decisions "
+                                      f"WHERE id > ? ORDER BY id LIMIT ?", (last, self._store.page_size))
+            if not rows:
+                return
+            for row in rows:
+                yield dict(zip(_DECISION_FIELDS, row[1:]))
+            last = rows[-1][0]
+
+    def for_user(self, user_id, limit=None):
+        rows = self._rows(f"{_SELECT_DECISIONS} WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                          (user_id, -1 if limit is None else int(limit)))
+        return rows[::-1]
+
+    def page(self, offset=0, limit=50):
+        return self._rows(f"{_SELECT_DECISIONS} ORDER BY id LIMIT ? OFFSET ?", (int(limit), max(0, int(offset))))
+
+
+class SQLiteNegotiationStore:
+    """Durable, multi-process negotiation store on SQLite (WAL mode)."""
+
+    def __init__(self, path, batch_size=1000, page_size=500):
+        self.path = path
+        self.batch_size = int(batch_size)
+        self.page_size = int(page_size)
+        self._lock = threading.RLock()
+        self._depth = 0
+        # Autocommit connection; transactions are opened explicitly in _flush
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self._pending_negotiations = {}  # user_id -> row (last write wins)
+        self._pending_chat = []
+        self._pending_decisions = []
+        self._pending_log = []
+        self._pending_deliveries = []
+        self._pending_recovered = 0
+
+    def _pending_count(self):
+        return (len(self._pending_negotiations) + len(self._pending_chat) + len(self._pending_decisions)
+                + len(self._pending_log) + len(self._pending_deliveries))
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    # -- writes ---------------------------------------------------------------
+
+    @contextmanager
+    def batch(self):
+        """Defer commits until the block exits (or the buffer fills up)."""
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._flush()
+
+    def _written(self):
+        if self._depth == 0 or self._pending_count() >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending_count() and not self._pending_recovered:
+            return
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._pending_negotiations:
+                conn.executemany(_UPSERT, self._pending_negotiations.values())
+            if self._pending_chat:
+                conn.executemany("INSERT INTO chat (user_id, role, message, timestamp) VALUES (?, ?, ?, ?)",
+                                 self._pending_chat)
+            if self._pending_decisions:
+                conn.executemany(
+                    "INSERT INTO decisions (user_id, offer, expiry, reason, timestamp, ratio) VALUES (?, ?, ?, ?, ?, ?)",
+                    self._pending_decisions)
+            if self._pending_log:
+                conn.executemany("INSERT INTO event_log (timestamp, message) VALUES (?, ?)", self._pending_log)
+            if self._pending_deliveries:
+                conn.executemany(
+                    "UPDATE negotiations SET delivery_status = ?, delivery_channel = ?, delivery_attempts = ? "
+                    "WHERE user_id = ?", self._pending_deliveries)
+            if self._pending_recovered:
+                # Relative update, so concurrent processes never lose each other's recoveries
+                conn.execute("UPDATE totals SET value = value + ? WHERE key = 'funds_recovered'",
+                             (self._pending_recovered,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._reset_pending()
+
+    def save(self, entry):
+        row = tuple(entry.get(field) for field in NEGOTIATION_FIELDS) + (int(bool(entry.get('_counted'))),)
+        with self._lock:
+            self._pending_negotiations[entry['user_id']] = row
+            self._written()
+
+    def add_recovered(self, amount):
+        with self._lock:
+            self._pending_recovered += int(amount)
+            self._written()
+
+    def restructure(self, entry, amount):
+        """
+        Save entry as restructured and add amount to funds_recovered, once per negotiation.
+
+        The counted flag is flipped by a conditional UPDATE in its own
+        transaction, so when several processes accept the same offer only the
+        one whose UPDATE changed the row adds the recovery.
+
+        Returns:
+            True if this call counted the recovery
+        """
+        entry['status'] = 'restructured'
+        with self._lock:
+            self.save(entry)
+            self._flush()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                counted = conn.execute("UPDATE negotiations SET status = 'restructured', counted = 1 "
+                                       "WHERE user_id = ? AND counted = 0", (entry['user_id'],)).rowcount == 1
+                if counted:
+                    conn.execute("UPDATE totals SET value = value + ? WHERE key = 'funds_recovered'", (int(amount),))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        entry['_counted'] = True
+        return counted
+
+    def append_chat(self, entry, message):
+        with self._lock:
+            self._pending_chat.append((entry['user_id'], message['role'], message['message'], message['timestamp']))
+            self._written()
+
+    def append_log(self, timestamp, message):
+        with self._lock:
+            self._pending_log.append((timestamp, message))
+            self._written()
+
+    def update_delivery(self, user_id, status, channel, attempts):
+        with self._lock:
+            self._pending_deliveries.append((status, channel, attempts, user_id))
+            self._written()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def append_decision(self, decision):
+        with self._lock:
+            self._pending_decisions.append((decision['user_id'], decision['offer'], decision['expiry'],
+                                            decision['reason'], decision['timestamp'], decision.get('ratio')))
+            self._written()
+
+    def apply_offers(self, user_ids, offers, expiries, ratios, timestamp):
+        """Mark pending users offer_sent with the given terms in one transaction (text left unrendered)."""
+        offers, expiries, ratios = offers.tolist(), expiries.tolist(), ratios.tolist()
+        with self._lock:
+            self._flush()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "UPDATE negotiations SET offer_amount = ?, expiry_days = ?, status = 'offer_sent', "
+                    "started_at = COALESCE(started_at, ?), offered_at = ?, last_message = NULL, "
+                    "delivery_status = NULL, delivery_channel = NULL, delivery_attempts = NULL "
+                    "WHERE user_id = ? AND status = 'pending'",
+                    zip(offers, expiries, [timestamp] * len(user_ids), [timestamp] * len(user_ids), user_ids))
+                conn.executemany(
+                    "INSERT INTO decisions (user_id, offer, expiry, reason, timestamp, ratio) VALUES (?, ?, ?, NULL, ?, ?)",
+                    zip(user_ids, offers, expiries, [timestamp] * len(user_ids), ratios))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        with self._lock:
+            self._reset_pending()
+            self._conn.executescript(
+                "BEGIN; DELETE FROM negotiations; DELETE FROM chat; DELETE FROM decisions; DELETE FROM event_log; "
+                "DELETE FROM status_counts; UPDATE totals SET value = 0; COMMIT;")
+
+    # -- reads (always see this process's buffered writes) ----------------------
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            self._flush()
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _entry(row):
+        n = len(NEGOTIATION_FIELDS)
+        entry = dict(zip(NEGOTIATION_FIELDS, row))
+        if row[n]:
+            entry['_counted'] = True
+        entry.update(zip(DELIVERY_FIELDS, row[n + 1:]))
+        return entry
+
+    def __contains__(self, user_id):
+        return bool(self._query("SELECT 1 FROM negotiations WHERE user_id = ?", (user_id,)))
+
+    def __len__(self):
+        return self._query("SELECT COALESCE(SUM(count), 0) FROM status_counts")[0][0]
+
+    @property
+    def negotiations(self):
+        return _NegotiationsView(self)
+
+    def _total(self, key):
+        return self._query("SELECT value FROM totals WHERE key = ?", (key,))[0][0]
+
+    @property
+    def funds_recovered(self):
+        return self._total('funds_recovered')
+
+    @property
+    def total_missed(self):
+        return self._total('total_missed')
+
+    def get(self, user_id):
+        rows = self._query(f"{_SELECT} WHERE user_id = ?", (user_id,))
+        if not rows:
+            return None
+        return self._entry(rows[0])
+
+    def get_many(self, user_ids):
+        """Dict of user_id -> entry for the user_ids that exist, one query per page of ids."""
+        user_ids = list(dict.fromkeys(user_ids))
+        found = {}
+        for start in range(0, len(user_ids), self.page_size):
+            page = user_ids[start:start + self.page_size]
+            marks = ', '.join('?' * len(page))
+            found.update((row[0], self._entry(row))
+                         for row in self._query(f"{_SELECT} WHERE user_id IN ({marks})", tuple(page)))
+        return found
+
+    def undelivered_offers(self):
+        """user_ids of offers not yet delivered or failed (includes sends cut off by a restart)."""
+        rows = self._query("SELECT user_id FROM negotiations WHERE status = 'offer_sent' AND "
+                           "(delivery_status IS NULL OR delivery_status NOT IN ('delivered', 'failed')) ORDER BY user_id")
+        return [row[0] for row in rows]
+
+    def pending_offer_terms(self, min_wallet):
+        """(user_ids, wallet array, missed array) of pending users with wallet >= min_wallet."""
+        rows = self._query("SELECT user_id, wallet, missed_amount FROM negotiations "
+                           "WHERE status = 'pending' AND wallet >= ? ORDER BY user_id", (min_wallet,))
+        if not rows:
+            return [], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        user_ids, wallet, missed = zip(*rows)
+        return list(user_ids), np.array(wallet, dtype=np.int64), np.array(missed, dtype=np.int64)
+
+    def iter_negotiations(self, status=None):
+        """Stream negotiations page by page (keyset pagination on user_id)."""
+        last = ''
+        while True:
+            if status is None:
+                rows = self._query(f"{_SELECT} WHERE user_id > ? ORDER BY user_id LIMIT ?", (last, self.page_size))
+            else:
+                rows = self._query(f"{_SELECT} WHERE status = ? AND user_id > ? ORDER BY user_id LIMIT ?",
+                                   (status, last, self.page_size))
+            if not rows:
+                return
+            yield from (self._entry(row) for row in rows)
+            last = rows[-1][0]
+
+    def status_counts(self):
+        counts = dict.fromkeys(STATUSES, 0)
+        for status, count in self._query("SELECT status, count FROM status_counts WHERE count != 0"):
+            counts[status] = count
+        return counts
+
+    def chat_history(self, user_id):
+        rows = self._query("SELECT role, message, timestamp FROM chat WHERE user_id = ? ORDER BY id", (user_id,))
+        return [{'role': role, 'message': message, 'timestamp': timestamp} for role, message, timestamp in rows]
+
+    def chat_count(self, user_id):
+        return self._query("SELECT COUNT(*) FROM chat WHERE user_id = ?", (user_id,))[0][0]
+
+    def chat_page(self, user_id, offset=0, limit=20):
+        """Messages offset .. offset+limit of a user's conversation, oldest first (idx_chat_user)."""
+        rows = self._query("SELECT role, message, timestamp FROM chat WHERE user_id = ? ORDER BY id LIMIT ? OFFSET ?",
+                           (user_id, int(limit), max(0, int(offset))))
+        return [{'role': role, 'message': message, 'timestamp': timestamp} for role, message, timestamp in rows]
+
+    def recent_log(self, limit=None):
+        if limit is None:
+            rows = self._query("SELECT timestamp, message FROM event_log ORDER BY id")
+        else:
+            rows = self._query("SELECT timestamp, message FROM event_log ORDER BY id DESC LIMIT ?", (limit,))[::-1]
+        return [tuple(row) for row in rows]
+
+    @property
+    def decisions(self):
+        return _DecisionsView(self)
+
+
+def _plain(value):
+    """json.dumps fallback for NumPy scalars in negotiation entries."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class JournaledNegotiationStore:
+    """
+    Event-sourced store: an in-memory store rebuilt from an append-only journal.
+
+    Every write (save, chat, log, decision, offers, recovered, delivery,
+    clear) is applied to a MemoryNegotiationStore and, once it has applied
+    cleanly, appended to a JSON-lines journal as one (seq, kind, payload)
+    event. Every `snapshot_every` events the live state is pickled to
+    `snapshot.pkl` and a new journal segment is started, so recovery loads the
+    latest snapshot and replays at most one segment, however long the history
+    is. The state holds only the latest `decision_capacity` decisions (and
+    the last `decisions_per_user` per borrower), so the snapshot is bounded by
+    the number of borrowers rather than the length of the history; old
+    segments are kept as the audit trail (see events()).
+
+    Args:
+        path: Journal directory (created if missing)
+        snapshot_every: Events between snapshots
+        fsync: fsync the journal on every flush (durable against power loss,
+            not just process crashes)
+        log_capacity: Event-log ring buffer size of the in-memory state
+        chat_tail: Chat messages per user kept in memory; older ones are
+            read from chat.jsonl in the journal directory
+        decision_capacity: Decisions kept in the in-memory decision stream
+        decisions_per_user: Recent decisions kept per borrower (DecisionLog.for_user)
+    """
+
+    def __init__(self, path, snapshot_every=10_000, fsync=False, log_capacity=1000, chat_tail=100,
+                 decision_capacity=JOURNAL_DECISION_CAPACITY, decisions_per_user=JOURNAL_DECISIONS_PER_USER):
+        self.path = path
+        self._decision_capacity = decision_capacity
+        self._decisions_per_user = decisions_per_user
+        self._chat_tail = chat_tail
+        self.snapshot_every = int(snapshot_every)
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._log_capacity = log_capacity
+        os.makedirs(path, exist_ok=True)
+        self.recovery_seconds, self.replayed = self._recover()
+
+    # -- journal --------------------------------------------------------------
+
+    @property
+    def _snapshot_path(self):
+        return os.path.join(self.path, 'snapshot.pkl')
+
+    @property
+    def _chat_path(self):
+        return os.path.join(self.path, 'chat.jsonl')
+
+    def _segments(self):
+        """(first seq, path) of every journal segment, oldest first."""
+        names = sorted(name for name in os.listdir(self.path) if name.startswith('events-') and name.endswith('.jsonl'))
+        return [(int(name[7:-6]), os.path.join(self.path, name)) for name in names]
+
+    @staticmethod
+    def _read_segment(segment_path):
+        """Yield (offset after line, event) for every complete event in a segment."""
+        offset = 0
+        with open(segment_path, 'rb') as fh:
+            for line in fh:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    return  # torn write at the end of the journal
+                if not line.endswith(b'\n'):
+                    return
+                offset += len(line)
+                yield offset, event
+
+    def _recover(self):
+        start = time.perf_counter()
+        self._state = MemoryNegotiationStore(self._log_capacity, chat_tail=self._chat_tail,
+                                             chat_spill_path=self._chat_path,
+                                             decision_capacity=self._decision_capacity,
+                                             decisions_per_user=self._decisions_per_user)
+        self.seq = self._snapshot_seq = 0
+        chat_size = 0
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, 'rb') as fh:
+                data = pickle.load(fh)
+            self._restore(data)
+            chat_size = data['chat_size']
+        # Replay spills the same chunks again: drop the ones written after the snapshot
+        if os.path.exists(self._chat_path) and os.path.getsize(self._chat_path) > chat_size:
+            with open(self._chat_path, 'r+b') as fh:
+                fh.truncate(chat_size)
+        segments = self._segments()
+        # Replay from the segment the snapshot falls in (normally the last one)
+        first = max([begin for begin, _ in segments if begin <= self.seq + 1], default=segments[0][0] if segments else 0)
+        replayed, good = 0, 0
+        for begin, segment_path in segments:
+            if begin < first:
+                continue
+            good = 0
+            for good, (seq, kind, payload) in self._read_segment(segment_path):
+                if seq > self.seq:
+                    self._apply(kind, payload)
+                    self.seq = seq
+                    replayed += 1
+        if segments:
+            segment_path = segments[-1][1]
+            if os.path.getsize(segment_path) != good:
+                with open(segment_path, 'r+b') as fh:  # drop a torn final line before appending
+                    fh.truncate(good)
+        else:
+            segment_path = self._segment_path(self.seq + 1)
+        self._journal = open(segment_path, 'a', encoding='utf-8')
+        return time.perf_counter() - start, replayed
+
+    def _segment_path(self, first_seq):
+        return os.path.join(self.path, f"events-{first_seq:012d}.jsonl")
+
+    @contextmanager
+    def _event(self, kind, payload):
+        """Apply one event (the with-block), journal it if that succeeded, then flush unless inside batch()."""
+        with self._lock:
+            yield
+            # Not reached when the apply raised, so recovery never replays a failing event
+            self.seq += 1
+            self._journal.write(json.dumps([self.seq, kind, payload], ensure_ascii=False, separators=(',', ':'),
+                                           default=_plain) + '\n')
+            if self._depth == 0:
+                self._written()
+
+    def _written(self):
+        self.flush()
+        if self.seq - self._snapshot_seq >= self.snapshot_every:
+            self.snapshot()
+
+    def flush(self):
+        with self._lock:
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+
+    def snapshot(self):
+        """Write the live state to snapshot.pkl and start a new journal segment."""
+        with self._lock:
+            self.flush()
+            state = self._state
+            data = {
+                'seq': self.seq,
+                'negotiations': state.negotiations,
+                'chat': state._chat,
+                'chat_size': os.path.getsize(self._chat_path) if os.path.exists(self._chat_path) else 0,
+                'funds_recovered': state.funds_recovered,
+                'log': state.recent_log(),
+                'decisions': state.decisions,
+            }
+            tmp_path = self._snapshot_path + '.tmp'
+            with open(tmp_path, 'wb') as fh:
+                pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._snapshot_path)
+            self._snapshot_seq = self.seq
+            self._journal.close()
+            self._journal = open(self._segment_path(self.seq + 1), 'a', encoding='utf-8')
+
+    def _restore(self, data):
+        state = self._state
+        for entry in data['negotiations'].values():
+            state.save(entry)
+        state._chat = data['chat']
+        state.funds_recovered = data['funds_recovered']
+        for timestamp, message in data['log']:
+            state.append_log(timestamp, message)
+        decisions = data['decisions']
+        if (decisions.capacity, decisions.per_user) != (self._decision_capacity, self._decisions_per_user):
+            decisions.__setstate__({**decisions.__getstate__(), 'capacity': self._decision_capacity,
+                                    'per_user': self._decisions_per_user})
+        state.decisions = decisions
+        self.seq = self._snapshot_seq = data['seq']
+
+    def _apply(self, kind, payload):
+        """Apply one journal event to the in-memory state."""
+        state = self._state
+        if kind == 'save':
+            entry = state.negotiations.get(payload['user_id'])
+            if entry is None:
+                state.save(payload)
+            else:
+                entry.update(payload)
+                state.save(entry)
+        elif kind == 'chat':
+            entry = state.negotiations.get(payload[0])
+            if entry is not None:
+                state.append_chat(entry, payload[1])
+        elif kind == 'log':
+            state.append_log(*payload)
+        elif kind == 'decision':
+            state.append_decision(payload)
+        elif kind == 'offers':
+            user_ids, offers, expiries, ratios, timestamp = payload
+            state.apply_offers(user_ids, np.asarray(offers, dtype=np.int64), np.asarray(expiries, dtype=np.int64),
+                               np.asarray(ratios, dtype=float), timestamp)
+        elif kind == 'recovered':
+            state.add_recovered(payload)
+        elif kind == 'delivery':
+            state.update_delivery(*payload)
+        elif kind == 'clear':
+            state.clear()
+        else:
+            raise ValueError(f"Unknown journal event kind: {kind!r}")
+
+    def events(self, since=0):
+        """Iterate (seq, kind, payload) for the whole journal history after `since`."""
+        with self._lock:
+            self.flush()
+            segments = self._segments()
+        for _, segment_path in segments:
+            for _, (seq, kind, payload) in self._read_segment(segment_path):
+                if seq > since:
+                    yield seq, kind, payload
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._journal.close()
+
+    # -- writes ---------------------------------------------------------------
+
+    @contextmanager
+    def batch(self):
+        """Write the journal (and check the snapshot cadence) once, when the block exits."""
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._written()
+
+    def save(self, entry):
+        # Chat is journaled message by message
+        with self._event('save', {key: value for key, value in entry.items() if key != 'chat_history'}):
+            self._state.save(entry)
+
+    def add_recovered(self, amount):
+        with self._event('recovered', int(amount)):
+            self._state.add_recovered(amount)
+
+    def restructure(self, entry, amount):
+        with self._lock:
+            record = self._state.get(entry['user_id'])
+            counted = not (entry.get('_counted') or (record is not None and record.get('_counted')))
+            entry['status'] = 'restructured'
+            entry['_counted'] = True
+            self.save(entry)
+            if counted:
+                self.add_recovered(amount)
+            return counted
+
+    def update_delivery(self, user_id, status, channel, attempts):
+        with self._event('delivery', [user_id, status, channel, attempts]):
+            self._state.update_delivery(user_id, status, channel, attempts)
+
+    def append_chat(self, entry, message):
+        with self._event('chat', [entry['user_id'], message]):
+            self._state.append_chat(entry, message)
+
+    def append_log(self, timestamp, message):
+        with self._event('log', [timestamp, message]):
+            self._state.append_log(timestamp, message)
+
+    def append_decision(self, decision):
+        with self._event('decision', decision):
+            self._state.append_decision(decision)
+
+    def apply_offers(self, user_ids, offers, expiries, ratios, timestamp):
+        with self._event('offers', [list(user_ids), offers.tolist(), expiries.tolist(), ratios.tolist(), timestamp]):
+            self._state.apply_offers(user_ids, offers, expiries, ratios, timestamp)
+
+    def clear(self):
+        with self._event('clear', None):
+            self._state.clear()
+
+    # -- reads ----------------------------------------------------------------
+
+    def __contains__(self, user_id):
+        return user_id in self._state
+
+    def __len__(self):
+        return len(self._state)
+
+    @property
+    def negotiations(self):
+        return self._state.negotiations
+
+    @property
+    def decisions(self):
+        return self._state.decisions
+
+    @property
+    def funds_recovered(self):
+        return self._state.funds_recovered
+
+    @property
+    def total_missed(self):
+        return self._state.total_missed
+
+    def get(self, user_id):
+        return self._state.get(user_id)
+
+    def get_many(self, user_ids):
+        return self._state.get_many(user_ids)
+
+    def iter_negotiations(self, status=None):
+        return self._state.iter_negotiations(status)
+
+    def status_counts(self):
+        return self._state.status_counts()
+
+    def pending_offer_terms(self, min_wallet):
+        return self._state.pending_offer_terms(min_wallet)
+
+    def undelivered_offers(self):
+        return self._state.undelivered_offers()
+
+    def chat_history(self, user_id):
+        return self._state.chat_history(user_id)
+
+    def chat_count(self, user_id):
+        return self._state.chat_count(user_id)
+
+    def chat_page(self, user_id, offset=0, limit=20):
+        return self._state.chat_page(user_id, offset, limit)
+
+    def recent_log(self, limit=None):
+        return self._state.recent_log(limit)
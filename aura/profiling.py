@@ -0,0 +1,69 @@
+"""
+Startup profiling.
+
+PhaseTimer records the wall time of consecutive phases of one run (imports,
+page config, data + model load, page render). app.py keeps the first script
+run of each server process, which is what the first visitor of a new replica
+waits for, and prints it to stderr when AURA_STARTUP_PROFILE is set.
+
+parse_importtime() / import_costs() read the per-module output of
+`python -X importtime` for the per-import half of the picture;
+benchmarks/bench_startup.py combines both for a cold process.
+"""
+
+import time
+
+
+class PhaseTimer:
+    """Consecutive named phases of one run: each mark() closes the phase since the previous one."""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases = []  # (name, seconds) in run order
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self.start
+
+    def report(self, title="Startup profile"):
+        """Plain-text table of the phases with their share of the total."""
+        total = self.total or 1e-12
+        width = max([len(name) for name, _ in self.phases] + [5])
+        lines = [f"{title}: {self.total * 1000:,.0f} ms"]
+        lines += [f"  {name:<{width}}  {seconds * 1000:9,.1f} ms  {seconds / total:6.1%}" for name, seconds in self.phases]
+        return "\n".join(lines)
+
+
+def parse_importtime(text):
+    """
+    Rows of `python -X importtime` output.
+
+    Returns:
+        List of (module, depth, self_seconds, cumulative_seconds) in output
+        order; depth 0 is a module imported directly by the profiled code
+    """
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():  # header line
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+
+def import_costs(rows):
+    """Import time per top-level package (summed self time of its modules), most expensive first."""
+    costs = {}
+    for module, _, self_seconds, _ in rows:
+        package = module.split(".")[0]
+        costs[package] = costs.get(package, 0.0) + self_seconds
+    return dict(sorted(costs.items(), key=lambda item: item[1], reverse=True))
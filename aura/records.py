@@ -0,0 +1,129 @@
+"""
+Compact in-memory negotiation records.
+
+A negotiation used to be a dict of ~12 keys with ISO timestamp strings and
+its chat thread embedded as a list of dicts, which costs kilobytes per
+borrower. NegotiationRecord keeps the same fields in __slots__:
+
+- status is a small Status enum (shared singletons) instead of a string
+- timestamps are integer epoch microseconds (aura.clock)
+- names are interned, so repeated names share one string
+- chat is not part of the record; MemoryNegotiationStore keeps it per user
+  as (role, message, epoch_us) tuples
+
+The record is still a MutableMapping with the original keys (status is
+decoded to its name on access), so engine and UI code that does
+entry['status'], entry.get('wallet') or dict(entry) keeps working. A field
+that was never set is a missing key, as in the dict.
+Keys outside the known fields go to a per-record overflow dict.
+"""
+
+import sys
+from collections.abc import MutableMapping
+from enum import IntEnum
+
+from aura.clock import to_epoch_us
+
+
+class Status(IntEnum):
+    PENDING = 0
+    OFFER_SENT = 1
+    RESTRUCTURED = 2
+    REJECTED = 3
+
+
+# Status names as stored in negotiation entries, in Status order
+STATUS_NAMES = tuple(status.name.lower() for status in Status)
+_STATUS_CODES = {name: status for name, status in zip(STATUS_NAMES, Status)}
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+_SLOTS = (
+    'user_id', 'name', 'wallet', 'missed_amount', 'offer_amount', 'expiry_days', 'status',
+    'started_at', 'accepted_at', 'offered_at', 'last_message', 'counted', 'delivery_status', 'delivery_channel',
+    'delivery_attempts',
+)
+_ENCODE = {
+    'name': _intern, 'delivery_status': _intern, 'delivery_channel': _intern,
+    'status': _STATUS_CODES.__getitem__,
+    'started_at': to_epoch_us, 'accepted_at': to_epoch_us, 'offered_at': to_epoch_us,
+}
+_DECODE = {'status': STATUS_NAMES.__getitem__}
+# Entry key -> (slot, encode, decode), in the original dict's key order
+_FIELDS = {
+    ('_counted' if slot == 'counted' else slot): (slot, _ENCODE.get(slot), _DECODE.get(slot)) for slot in _SLOTS
+}
+_MISSING = object()
+
+
+class NegotiationRecord(MutableMapping):
+    """One negotiation with the dict interface of the original entries."""
+
+    # saved_status / saved_missed: what the owning store last counted (not entry keys)
+    __slots__ = _SLOTS + ('extra', 'saved_status', 'saved_missed')
+
+    def __init__(self, fields=()):
+        self.extra = None
+        self.saved_status = self.saved_missed = None
+        self.update(fields)
+
+    def __getitem__(self, key):
+        field = _FIELDS.get(key)
+        if field is None:
+            if self.extra is not None and key in self.extra:
+                return self.extra[key]
+            raise KeyError(key)
+        value = getattr(self, field[0], _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value if field[2] is None else field[2](value)
+
+    def get(self, key, default=None):
+        field = _FIELDS.get(key)
+        if field is None:
+            return default if self.extra is None else self.extra.get(key, default)
+        value = getattr(self, field[0], _MISSING)
+        if value is _MISSING:
+            return default
+        return value if field[2] is None else field[2](value)
+
+    def __contains__(self, key):
+        field = _FIELDS.get(key)
+        if field is None:
+            return self.extra is not None and key in self.extra
+        return hasattr(self, field[0])
+
+    def __setitem__(self, key, value):
+        field = _FIELDS.get(key)
+        if field is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+            return
+        setattr(self, field[0], value if field[1] is None else field[1](value))
+
+    def __delitem__(self, key):
+        field = _FIELDS.get(key)
+        try:
+            if field is None:
+                del self.extra[key]
+            else:
+                delattr(self, field[0])
+        except (AttributeError, KeyError, TypeError):
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        for key, field in _FIELDS.items():
+            if hasattr(self, field[0]):
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"NegotiationRecord({dict(self)!r})"
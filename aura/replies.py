@@ -0,0 +1,141 @@
+"""
+Inbound borrower reply parsing.
+
+parse_reply() turns a free-text reply into an (intent, amount) pair:
+
+- 'counter' with the rupee amount the borrower proposes (an explicit 0 is a
+  counter offer too, below any threshold)
+- 'accept' / 'refuse' for replies without an amount
+- 'unknown' otherwise (amount None)
+
+Amounts may use Indian or western digit grouping ("₹1,50,000", "1,500"),
+decimals with a k / thousand / lakh / crore suffix ("1.5k", "2 lakh", "1.2L")
+Devanagari digits ("₹३००") and compounds ("3 lakh 50 thousand"). Dates
+("on the 5th", "5/11", "15 Nov"), phone numbers, durations ("10 days"),
+counts ("2 installments") and amounts the borrower says they cannot pay
+("can't pay 500", "not 500") are not taken as offers; a currency-marked
+amount wins over a bare number.
+
+All patterns are compiled once at import and parse_reply is memoised, so
+bursts of identical replies ("yes", "ok") cost a dict lookup. parse_replies()
+is the batch entry point used by NegotiationEngine.handle_replies.
+"""
+
+import re
+from functools import lru_cache
+
+INTENTS = ('accept', 'counter', 'refuse', 'unknown')
+
+# Distinct reply texts remembered by parse_reply
+PARSE_CACHE_SIZE = 65536
+
+_DIGITS = str.maketrans('०१२३४५६७८९', '0123456789')
+
+_UNITS = {
+    'k': 1_000, 'thousand': 1_000,
+    'l': 100_000, 'lac': 100_000, 'lacs': 100_000, 'lakh': 100_000, 'lakhs': 100_000,
+    'cr': 10_000_000, 'crore': 10_000_000, 'crores': 10_000_000,
+}
+
+_MONTHS = r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+
+# Blanked out before amounts are looked for:
+# - dates: dd/mm, dd-mm-yyyy, dd.mm.yyyy (a dot only separates a date with a
+#   year, so "2.5 lakh" and "12.50" stay amounts), "15 nov", "15th of may", "nov 15"
+#   ("may 15" is left alone: "may" is more often the verb)
+# - phone numbers: ten-digit mobiles, optionally +91 / spaced, and any longer digit run
+_NOT_AMOUNTS = re.compile(rf"""
+    \b\d{{1,2}}(?:[/-]\d{{1,2}}(?:[/.-]\d{{2,4}})?|\.\d{{1,2}}\.\d{{2,4}})\b
+  | \b\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:{_MONTHS}|may)\b
+  | \b(?:{_MONTHS})\s+\d{{1,2}}(?:st|nd|rd|th)?\b
+  | (?:\+\s?)?\b(?:91[\s-]?)?[6-9]\d{{4}}[\s-]?\d{{5}}\b
+  | \b\d{{10,}}\b
+""", re.X)
+
+_AMOUNT = re.compile(r"""
+    (?P<currency>₹|\brs\b\.?|\binr\b)?\s*
+    (?P<number>\d{1,3}(?:,\d{2})*,\d{3}|\d{1,3}(?:,\d{3})+|\d+)(?:\.(?P<fraction>\d+))?
+    (?:\s*(?P<unit>k|thousand|lakhs?|lacs?|l|crores?|cr)\b)?
+    (?P<not_amount>(?:st|nd|rd|th)\b|\s*(?:days?|weeks?|months?|din|hrs?|hours?|am|pm)\b|\s*%
+        |\s*(?:installments?|instalments?|parts|times|x)\b)?
+""", re.X)
+
+# Searched from just before an amount up to its number:
+# negation ("can't pay 500", "not 500, 400")
+_NEGATED = re.compile(r"(?:(?:can'?t|cannot|can not|won'?t|will not|unable to)\s+(?:pay|do|afford|manage)\s+"
+                      r"|\bnot\s+)(?:even\s+)?(?:₹|\brs\b\.?|\binr\b)?\s*$")
+# a day of the month ("on 15 I can pay 300"), for bare numbers up to 31
+_DAY = re.compile(r"\b(?:on|by|before|till|until|from)\s+(?:the\s+)?$")
+
+# Separates the parts of a compound amount ("3 lakh 50 thousand", "2 lakh and 20,000")
+_COMPOUND_GAP = re.compile(r"\s*(?:and|&)?\s*")
+
+# A negation is a refusal only of paying or of the offer ("can't pay", not "can't wait, yes")
+_REFUSE = re.compile(r"\b(?:no(?!\s+problem)|nope|not\s+interested|refuse[ds]?|nahi|nahin|stop"
+                     r"|(?:can'?t|cannot|can\s+not|won'?t|will\s+not|unable\s+to)\s+(?:pay|afford|accept|manage|do)"
+                     r")\b|नहीं|नही")
+_ACCEPT = re.compile(r"\b(?:yes|yeah|yep|ok|okay|sure|agreed?|accept(?:ed)?|deal|done|fine|haan|theek|thik)\b|हाँ|हां|ठीक")
+
+
+def parse_amounts(text):
+    """
+    Every amount offered in a reply, in order of appearance.
+
+    Args:
+        text: Lower-cased reply with ASCII digits
+
+    Returns:
+        List of (amount, marked) where marked is True for amounts written
+        with a currency sign or a k/lakh/crore suffix
+    """
+    text = _NOT_AMOUNTS.sub(lambda match: ' ' * len(match.group()), text)
+    amounts = []
+    unit_end, unit_size = None, 0  # end and multiplier of the last amount with a unit
+    for match in _AMOUNT.finditer(text):
+        number_start = match.start('number')
+        if match.group('not_amount') or _NEGATED.search(text, max(0, match.start() - 40), number_start):
+            continue
+        value = float(f"{match.group('number').replace(',', '')}.{match.group('fraction') or 0}")
+        currency, unit = match.group('currency'), match.group('unit')
+        if not (currency or unit or match.group('fraction')) and value <= 31 and \
+                _DAY.search(text, max(0, number_start - 20), number_start):
+            continue
+        if unit:
+            value *= _UNITS[unit]
+        size = _UNITS[unit] if unit else 1
+        if unit_end is not None and not currency and value < unit_size and \
+                _COMPOUND_GAP.fullmatch(text, unit_end, match.start()):
+            # "3 lakh 50 thousand": add the smaller part to the previous amount
+            amounts[-1] = (amounts[-1][0] + int(round(value)), True)
+        else:
+            amounts.append((int(round(value)), bool(currency or unit)))
+        unit_end, unit_size = (match.end(), size) if unit else (None, 0)
+    return amounts
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_reply(text):
+    """
+    Classify one borrower reply.
+
+    Args:
+        text: Raw reply text
+
+    Returns:
+        (intent, amount): amount is an int for 'counter', else None
+    """
+    text = text.translate(_DIGITS).lower()
+    amounts = parse_amounts(text)
+    if amounts:
+        marked = [amount for amount, is_marked in amounts if is_marked]
+        return 'counter', (marked or [amounts[0][0]])[0]
+    if _REFUSE.search(text):
+        return 'refuse', None
+    if _ACCEPT.search(text):
+        return 'accept', None
+    return 'unknown', None
+
+
+def parse_replies(texts):
+    """parse_reply over a batch of reply texts."""
+    return [parse_reply(text) for text in texts]
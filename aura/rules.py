@@ -0,0 +1,88 @@
+"""
+Rule tables for risk factors, coaching weak areas and status tiers.
+
+Each rule is a row in a table and is evaluated for the whole portfolio at once
+with a boolean mask; the per-borrower result is a compact bitmask (bit i set
+when rule i fires). Human-readable strings are only built for rows that are
+actually displayed, via describe_risk_mask / weak_areas_from_mask.
+"""
+
+import numpy as np
+
+# Risk-Management Agent: (feature column, concern threshold, description).
+# A rule fires when the feature is strictly below its threshold.
+RISK_FACTOR_RULES = [
+    ('network_usage_stability', 0.5, 'Unstable network usage'),
+    ('utility_payment_timeliness', 0.6, 'Delayed utility payments'),
+    ('device_usage_consistency', 0.5, 'Inconsistent device usage'),
+    ('mobility_score', 0.5, 'High mobility/instability'),
+]
+
+# Credit-Coach Agent: (feature column, threshold, area, advice)
+WEAK_AREA_RULES = [
+    ('network_usage_stability', 0.6, 'Network Usage Stability',
+     'Maintain consistent mobile data usage patterns. This shows financial stability.'),
+    ('utility_payment_timeliness', 0.7, 'Utility Payment Timeliness',
+     'Pay electricity and water bills before due date. Set up auto-pay or reminders.'),
+    ('device_usage_consistency', 0.6, 'Device Usage Consistency',
+     'Regular device usage indicates stability. Try to maintain consistent patterns.'),
+    ('mobility_score', 0.6, 'Location Stability',
+     'Frequent location changes can be a concern. If moving, update your profile.'),
+]
+
+# Portfolio status tiers, lowest risk first. A borrower moves up one tier for
+# every threshold its default probability strictly exceeds.
+STATUS_TIERS = ['Active & Healthy', 'At Risk', 'High Risk - Defaulted']
+STATUS_THRESHOLDS = [0.25, 0.45]
+
+
+def rule_mask(frame, rules):
+    """
+    Evaluate a rule table over every row of frame.
+
+    Returns:
+        uint8 array, one bitmask per row (bit i <=> rules[i] fired).
+    """
+    mask = np.zeros(len(frame), dtype=np.uint8)
+    for bit, rule in enumerate(rules):
+        column, threshold = rule[0], rule[1]
+        mask |= (frame[column].to_numpy() < threshold).astype(np.uint8) << np.uint8(bit)
+    return mask
+
+
+def row_rule_mask(row, rules):
+    """Scalar rule_mask for a single borrower (pandas Series or mapping)."""
+    mask = 0
+    for bit, rule in enumerate(rules):
+        if row[rule[0]] < rule[1]:
+            mask |= 1 << bit
+    return mask
+
+
+def status_tier_codes(probs):
+    """Status tier index (into STATUS_TIERS) for each default probability."""
+    probs = np.asarray(probs)
+    codes = np.zeros(probs.shape, dtype=np.int8)
+    for threshold in STATUS_THRESHOLDS:
+        codes += probs > threshold
+    return codes
+
+
+def describe_risk_mask(mask, row):
+    """Risk-factor strings for one borrower from its bitmask and feature values."""
+    return [
+        f"{label} ({row[column]:.2f})"
+        for bit, (column, _, label) in enumerate(RISK_FACTOR_RULES)
+        if mask >> bit & 1
+    ]
+
+
+def weak_areas_from_mask(mask, row):
+    """Coaching weak areas for one borrower, weakest score first."""
+    weak_areas = [
+        {'area': area, 'score': row[column], 'advice': advice}
+        for bit, (column, _, area, advice) in enumerate(WEAK_AREA_RULES)
+        if mask >> bit & 1
+    ]
+    weak_areas.sort(key=lambda x: x['score'])
+    return weak_areas
@@ -0,0 +1,97 @@
+"""
+Incremental portfolio rescoring.
+
+Between Account Aggregator refreshes only a small fraction of borrowers' feature
+rows change, so rescoring the whole portfolio on every dashboard rerun is
+mostly wasted work. ScoreCache remembers default probabilities keyed by
+(model version, fingerprint of the borrower's feature_cols values) and only
+sends new or changed rows through the model. Everything else in the scored
+frame (status tier, flags) is cheap vectorised work recomputed from the
+probabilities.
+
+The cache is bounded: once it holds more than max_entries fingerprints, the
+least recently used ones are evicted in bulk.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from aura.agents import assemble_scores, predict_default_proba
+
+
+def feature_fingerprints(df, feature_cols):
+    """64-bit content hash of each row's feature values (independent of the index)."""
+    return pd.util.hash_pandas_object(df[feature_cols], index=False).to_numpy()
+
+
+class ScoreCache:
+    """Bounded LRU map of feature fingerprint -> default probability for one model version."""
+
+    def __init__(self, max_entries=1_000_000):
+        self.max_entries = int(max_entries)
+        self.model_version = None
+        self._index = pd.Index([], dtype=np.uint64)  # fingerprint -> position
+        self._prob = np.empty(0, dtype=np.float64)
+        self._last_used = np.empty(0, dtype=np.int64)
+        self._tick = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._index)
+
+    def clear(self):
+        with self._lock:
+            self._reset(self.model_version)
+
+    def _reset(self, model_version):
+        self.model_version = model_version
+        self._index = self._index[:0]
+        self._prob = self._prob[:0]
+        self._last_used = self._last_used[:0]
+
+    def score_portfolio(self, df, model, scaler, feature_cols, model_version):
+        """
+        Cached score_portfolio: identical output, but only rows whose feature
+        fingerprint is not cached for model_version go through the model.
+        """
+        fingerprints = feature_fingerprints(df, feature_cols)
+        with self._lock:
+            if model_version != self.model_version:
+                self._reset(model_version)
+            self._tick += 1
+
+            positions = self._index.get_indexer(fingerprints)
+            missing = positions < 0
+            found = positions[~missing]
+            probs = np.empty(len(fingerprints), dtype=np.float64)
+            probs[~missing] = self._prob[found]
+            self._last_used[found] = self._tick
+
+            n_missing = int(missing.sum())
+            self.hits += len(probs) - n_missing
+            self.misses += n_missing
+
+            if n_missing:
+                probs[missing] = predict_default_proba(df[missing], model, scaler, feature_cols)
+                fresh = pd.Index(fingerprints[missing], dtype=np.uint64)
+                first = ~fresh.duplicated()
+                self._index = self._index.append(fresh[first])
+                self._prob = np.concatenate([self._prob, probs[missing][first]])
+                self._last_used = np.concatenate([self._last_used, np.full(int(first.sum()), self._tick)])
+            self._evict()
+
+        return assemble_scores(df, probs)
+
+    def _evict(self):
+        overflow = len(self._index) - self.max_entries
+        if overflow <= 0:
+            return
+        # Stable argsort keeps insertion order among entries last used together
+        keep = np.sort(np.argsort(self._last_used, kind='stable')[overflow:])
+        self._index = self._index[keep]
+        self._prob = self._prob[keep]
+        self._last_used = self._last_used[keep]
@@ -0,0 +1,239 @@
+"""
+Columnar, memory-mapped borrower store.
+
+A store is a directory with one raw binary file per column plus _schema.json:
+
+- numeric columns keep their NumPy dtype
+- low-cardinality strings (locations, categories) are stored as uint8 codes
+  with the category list in the schema
+- other strings (user_id) are fixed-width, NUL-padded UTF-8 bytes
+
+Columns are opened with np.memmap, so reading a projection only touches the
+pages of the columns asked for, and fetching one borrower touches one row of
+each column. Load time and RSS therefore scale with the columns actually used.
+
+    python -m aura build-store portfolio.csv portfolio.store/
+"""
+
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = '_schema.json'
+STORE_VERSION = 1
+
+# Strings with at most this many distinct values are stored as codes
+MAX_CATEGORIES = 255
+
+# Identifier columns are always stored as strings, never as codes
+ID_COLUMNS = ('user_id',)
+
+
+def is_column_store(path):
+    return os.path.isfile(os.path.join(path, SCHEMA_FILE))
+
+
+def iter_source_chunks(source, chunksize=500_000, columns=None):
+    """Yield DataFrame chunks of a CSV file, Parquet file or Parquet directory."""
+    if os.path.isdir(source) or source.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        files = sorted(glob.glob(os.path.join(source, '*.parquet'))) if os.path.isdir(source) else [source]
+        for path in files:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize, usecols=columns)
+
+
+def _is_text(series):
+    return not pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _utf8(values):
+    """String Series -> object array of UTF-8 bytes."""
+    return values.astype(str).str.encode('utf-8').to_numpy()
+
+
+def _byte_width(values):
+    """Longest UTF-8 encoding in a string Series (only non-ASCII values are encoded)."""
+    ascii_only = values.str.isascii()
+    width = int(values[ascii_only].str.len().max()) if ascii_only.any() else 1
+    if not ascii_only.all():
+        width = max(width, max(map(len, _utf8(values[~ascii_only]))))
+    return width
+
+
+def build_store(source, dest, chunksize=500_000):
+    """
+    Convert a CSV/Parquet portfolio into a column store at dest.
+
+    Two bounded-memory passes: the first chooses each column's encoding
+    (numeric dtypes widened over every chunk, string widths in UTF-8 bytes),
+    the second appends every chunk to the column files. A column that turns
+    from numbers into text after the first rows raises ValueError.
+
+    Returns:
+        The opened ColumnStore.
+    """
+    first = next(iter_source_chunks(source, chunksize=1000))
+    text_cols = [col for col in first.columns if _is_text(first[col])]
+
+    # Pass 1: common numeric dtypes; distinct values / max byte width of the string columns
+    dtypes = {col: first[col].to_numpy().dtype for col in first.columns if col not in text_cols}
+    distinct = {col: (None if col in ID_COLUMNS else set()) for col in text_cols}
+    width = {col: 1 for col in text_cols}
+    for chunk in iter_source_chunks(source, chunksize):
+        for col, dtype in dtypes.items():
+            if _is_text(chunk[col]):
+                raise ValueError(f"Column {col!r} is numeric in the first rows but contains text later")
+            # e.g. int64 in the first chunk, float64 in a later one -> float64
+            dtypes[col] = np.result_type(dtype, chunk[col].to_numpy().dtype)
+        for col in text_cols:
+            values = chunk[col].astype(str)
+            width[col] = max(width[col], _byte_width(values))
+            if distinct[col] is not None:
+                distinct[col].update(values.unique())
+                if len(distinct[col]) > MAX_CATEGORIES:
+                    distinct[col] = None
+
+    schema = []
+    for col in first.columns:
+        if col not in text_cols:
+            schema.append({'name': col, 'kind': 'numeric', 'dtype': dtypes[col].str})
+        elif distinct[col] is not None:
+            schema.append({'name': col, 'kind': 'category', 'dtype': '|u1', 'categories': sorted(distinct[col])})
+        else:
+            schema.append({'name': col, 'kind': 'string', 'dtype': f'|S{width[col]}'})
+
+    # Pass 2: append each chunk to the raw column files
+    os.makedirs(dest, exist_ok=True)
+    if is_column_store(dest):
+        os.remove(os.path.join(dest, SCHEMA_FILE))
+    files = {spec['name']: open(os.path.join(dest, f"{spec['name']}.bin"), 'wb') for spec in schema}
+    num_rows = 0
+    try:
+        for chunk in iter_source_chunks(source, chunksize):
+            for spec in schema:
+                values = chunk[spec['name']]
+                if spec['kind'] == 'category':
+                    codes = pd.Categorical(values.astype(str), categories=spec['categories']).codes
+                    data = codes.astype(np.uint8)
+                elif spec['kind'] == 'string':
+                    data = _utf8(values).astype(spec['dtype'])
+                else:
+                    data = values.to_numpy().astype(spec['dtype'], casting='safe')
+                files[spec['name']].write(np.ascontiguousarray(data).tobytes())
+            num_rows += len(chunk)
+    finally:
+        for fh in files.values():
+            fh.close()
+
+    # Schema last: a store without one is incomplete and never opened
+    with open(os.path.join(dest, SCHEMA_FILE), 'w') as fh:
+        json.dump({'version': STORE_VERSION, 'num_rows': num_rows, 'columns': schema}, fh, indent=2)
+    return ColumnStore(dest)
+
+
+def _decode_strings(values):
+    """
+    Fixed-width, NUL-padded UTF-8 bytes -> pandas strings.
+
+    With pyarrow the padded bytes are compacted into an Arrow string buffer
+    directly, avoiding one Python object per row.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return np.char.decode(values, 'utf-8')
+    n, width = len(values), values.dtype.itemsize
+    lengths = np.char.str_len(values).astype(np.int32)
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    grid = values.view(np.uint8).reshape(n, width)
+    data = grid[np.arange(width) < lengths[:, None]]
+    arrow = pa.StringArray.from_buffers(n, pa.py_buffer(offsets), pa.py_buffer(data))
+    return pd.array(pd.arrays.ArrowStringArray(arrow), dtype=pd.StringDtype(storage='pyarrow', na_value=np.nan))
+
+
+class ColumnStore:
+    """Read-only view over a column store directory."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, SCHEMA_FILE)) as fh:
+            schema = json.load(fh)
+        if schema.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported column store version in {path}: {schema.get('version')}")
+        self.num_rows = schema['num_rows']
+        self.schema = {spec['name']: spec for spec in schema['columns']}
+        self._maps = {}
+
+    def __len__(self):
+        return self.num_rows
+
+    @property
+    def columns(self):
+        return list(self.schema)
+
+    def raw(self, name):
+        """Memory-mapped raw column (codes for categories, bytes for strings)."""
+        if name not in self._maps:
+            spec = self.schema[name]
+            if self.num_rows == 0:
+                self._maps[name] = np.empty(0, dtype=spec['dtype'])
+            else:
+                self._maps[name] = np.memmap(os.path.join(self.path, f"{name}.bin"),
+                                             dtype=spec['dtype'], mode='r', shape=(self.num_rows,))
+        return self._maps[name]
+
+    def _decode(self, name, values):
+        spec = self.schema[name]
+        if spec['kind'] == 'category':
+            return pd.Categorical.from_codes(np.asarray(values, dtype=np.int16), categories=spec['categories'])
+        if spec['kind'] == 'string':
+            return _decode_strings(np.asarray(values))
+        return np.asarray(values)
+
+    def read(self, columns=None, rows=None):
+        """
+        DataFrame with only the requested columns (all by default).
+
+        rows may be a slice, integer positions or a boolean mask; only those
+        rows are copied out of the memory maps.
+        """
+        columns = self.columns if columns is None else list(columns)
+        missing = [col for col in columns if col not in self.schema]
+        if missing:
+            raise KeyError(f"Columns not in store: {missing}")
+        data = {}
+        for col in columns:
+            raw = self.raw(col)
+            data[col] = self._decode(col, raw if rows is None else raw[rows])
+        index = None
+        if rows is not None and not isinstance(rows, slice):
+            rows = np.asarray(rows)
+            index = np.flatnonzero(rows) if rows.dtype == bool else rows
+        elif isinstance(rows, slice):
+            index = np.arange(self.num_rows)[rows]
+        # copy=False leaves numeric columns backed by the read-only memory maps
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def find(self, user_id):
+        """Row position of user_id, or None (scans only the user_id column)."""
+        spec = self.schema['user_id']
+        key = str(user_id).encode('utf-8')
+        if len(key) > np.dtype(spec['dtype']).itemsize:
+            return None  # would be truncated to a different id
+        key = np.array(key, dtype=spec['dtype'])
+        hits = np.flatnonzero(self.raw('user_id') == key)
+        return int(hits[0]) if len(hits) else None
+
+    def row(self, user_id, columns=None):
+        """One borrower as a Series, or None when unknown."""
+        position = self.find(user_id)
+        if position is None:
+            return None
+        return self.read(columns, rows=[position]).iloc[0]
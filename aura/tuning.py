@@ -0,0 +1,175 @@
+"""
+Parallel hyperparameter search for the Risk Assessment forest.
+
+search_model() explores forest size, depth and min_samples_split within a
+wall-clock budget. Every (max_depth, min_samples_split) pair is one task in a
+process pool; inside a task the forest is grown with warm_start through the
+n_estimators grid, so a 400-tree candidate reuses the trees already fitted for
+the 50/100/200-tree candidates instead of starting over.
+
+Candidates are ranked on a validation split carved out of the training data;
+the held-out test split is only used to report the winner, as in train_model.
+"""
+
+import os
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import product
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from aura.model import FEATURE_COLS, MODEL_PARAMS, train_model
+
+SEARCH_SPACE = {
+    'n_estimators': [50, 100, 200, 400],
+    'max_depth': [6, 10, 14, None],
+    'min_samples_split': [2, 5, 10],
+}
+
+
+def _grow_candidates(X_train, y_train, X_val, y_val, max_depth, min_samples_split, sizes, deadline):
+    """
+    One search task: grow a forest through `sizes`, scoring each size.
+
+    Stops before a size whose extra trees would not finish by the deadline
+    (estimated from the time per tree so far). Returns the per-size reports
+    and the forest truncated to its best size (None if nothing finished).
+    """
+    forest = RandomForestClassifier(
+        n_estimators=sizes[0],
+        max_depth=max_depth,
+        min_samples_split=min_samples_split,
+        random_state=MODEL_PARAMS['random_state'],
+        class_weight=MODEL_PARAMS['class_weight'],
+        warm_start=True,
+        n_jobs=1,  # parallelism comes from the process pool
+    )
+    reports, best = [], None
+    fit_seconds = 0.0
+    for size in sizes:
+        grown = len(getattr(forest, 'estimators_', ()))
+        if grown and time.time() + fit_seconds / grown * (size - grown) > deadline:
+            break
+        if time.time() >= deadline:
+            break
+        forest.set_params(n_estimators=size)
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            # class_weight='balanced' is safe here: every warm-start fit sees the same data
+            warnings.filterwarnings('ignore', message='class_weight presets', category=UserWarning)
+            forest.fit(X_train, y_train)
+        fit_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        proba = forest.predict_proba(X_val)[:, 1]
+        predict_seconds = time.perf_counter() - start
+        report = {
+            'params': {'n_estimators': size, 'max_depth': max_depth, 'min_samples_split': min_samples_split},
+            'val_accuracy': float(np.mean((proba > 0.5) == y_val)),
+            'val_auc': float(roc_auc_score(y_val, proba)) if len(np.unique(y_val)) > 1 else float('nan'),
+            'fit_seconds': fit_seconds,  # cumulative: includes the smaller sizes this forest grew from
+            'predict_seconds': predict_seconds,
+        }
+        reports.append(report)
+        if best is None or _rank(report) > _rank(best):
+            best = report
+    if best is None:
+        return reports, None
+    # Warm start appends trees, so the first k estimators are exactly the k-tree forest
+    size = best['params']['n_estimators']
+    forest.estimators_ = forest.estimators_[:size]
+    forest.set_params(n_estimators=size, warm_start=False)
+    return reports, forest
+
+
+def _rank(report):
+    """Higher is better: validation accuracy, then AUC, then fewer trees."""
+    auc = report['val_auc']
+    return (report['val_accuracy'], -1.0 if np.isnan(auc) else auc, -report['params']['n_estimators'])
+
+
+def search_model(df, space=None, time_budget=60.0, workers=None, val_size=0.25, refit=True):
+    """
+    RISK ASSESSMENT AGENT (Agent #3) - search training mode.
+
+    Args:
+        df: Training data with FEATURE_COLS and 'default_label'
+        space: Dict of n_estimators / max_depth / min_samples_split lists
+               (defaults to SEARCH_SPACE)
+        time_budget: Wall-clock seconds for the whole search
+        workers: Pool processes (defaults to all cores)
+        val_size: Fraction of the training split used for validation
+        refit: Retrain the winning parameters on the full training split with
+               train_model (the model load_or_train(df, best_params) serves);
+               otherwise return the searched forest itself
+
+    Returns:
+        Same shape as train_model - model, scaler, feature columns, metrics -
+        with metrics['best_params'] and metrics['search'] (one report per
+        candidate: params, validation accuracy/AUC, fit and predict seconds).
+    """
+    space = SEARCH_SPACE if space is None else space
+    workers = workers or os.cpu_count() or 1
+    started = time.time()
+    deadline = started + time_budget
+    feature_cols = list(FEATURE_COLS)
+
+    X = df[feature_cols].to_numpy(dtype=float)
+    y = df['default_label'].to_numpy()
+    # Same outer split as train_model, so test accuracy is comparable
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=val_size, random_state=42, stratify=y_train)
+
+    scaler = StandardScaler().fit(X_fit)
+    X_fit_scaled, X_val_scaled = scaler.transform(X_fit), scaler.transform(X_val)
+    sizes = sorted(space['n_estimators'])
+    tasks = list(product(space['max_depth'], space['min_samples_split']))
+
+    reports, winners = [], []
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        pending = {
+            pool.submit(_grow_candidates, X_fit_scaled, y_fit, X_val_scaled, y_val, depth, split, sizes, deadline)
+            for depth, split in tasks
+        }
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                # Queued tasks are dropped; running ones stop at their next size
+                for future in pending:
+                    future.cancel()
+                remaining = None
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                task_reports, forest = future.result()
+                reports.extend(task_reports)
+                if forest is not None:
+                    winners.append((max(task_reports, key=_rank), forest))
+            if remaining is None:
+                pending = {future for future in pending if not future.cancelled()}
+
+    if not winners:
+        raise RuntimeError(f"No candidate finished within the {time_budget:.1f}s time budget")
+
+    best_report, model = max(winners, key=lambda item: _rank(item[0]))
+    best_params = {**MODEL_PARAMS, **best_report['params']}
+    search = {
+        'best_params': best_params,
+        'search': sorted(reports, key=_rank, reverse=True),
+        'search_seconds': time.time() - started,
+    }
+    if refit:
+        model, scaler, feature_cols, metrics = train_model(df, best_params)
+        return model, scaler, feature_cols, {**metrics, **search}
+
+    metrics = {
+        'train_accuracy': model.score(X_fit_scaled, y_fit),
+        'test_accuracy': model.score(scaler.transform(X_test), y_test),
+        'feature_importance': dict(zip(feature_cols, model.feature_importances_)),
+    }
+    return model, scaler, feature_cols, {**metrics, **search}
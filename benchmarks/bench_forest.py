@@ -0,0 +1,58 @@
+"""
+Per-call latency: sklearn predict_proba vs the compiled NumPy forest.
+
+    python benchmarks/bench_forest.py [--rows 10000] [--calls 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura.data import generate_synthetic_dataset
+from aura.model import FEATURE_COLS, train_model
+from aura.forest import compile_model
+
+
+def _per_call_us(fn, calls):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000, help="Batch size for the batch benchmark.")
+    parser.add_argument("--calls", type=int, default=200, help="Single-row calls to time.")
+    args = parser.parse_args(argv)
+
+    df = generate_synthetic_dataset()
+    model, scaler, feature_cols, _ = train_model(df)
+    fast_model, fast_scaler = compile_model(model, scaler)
+
+    X = df[FEATURE_COLS].to_numpy(dtype=float)
+    row = X[:1]
+    batch = X[np.random.default_rng(0).integers(0, len(X), args.rows)]
+
+    expected = model.predict_proba(scaler.transform(batch))[:, 1]
+    assert np.array_equal(expected, fast_model.predict_default_proba(fast_scaler.transform(batch)))
+
+    single_sk = _per_call_us(lambda: model.predict_proba(scaler.transform(row))[0, 1], args.calls)
+    single_fast = _per_call_us(lambda: fast_model.predict_default_proba(fast_scaler.transform(row))[0], args.calls)
+    batch_sk = _per_call_us(lambda: model.predict_proba(scaler.transform(batch)), 5)
+    batch_fast = _per_call_us(lambda: fast_model.predict_default_proba(fast_scaler.transform(batch)), 5)
+
+    print(f"Forest: {fast_model.n_trees} trees, {len(fast_model.feature):,} nodes, depth {fast_model.depth}")
+    print(f"{'path':<22}{'sklearn':>14}{'compiled':>14}{'speedup':>10}")
+    print(f"{'single row (us/call)':<22}{single_sk:>14.1f}{single_fast:>14.1f}{single_sk / single_fast:>9.1f}x")
+    print(f"{f'batch {args.rows:,} (ms/call)':<22}{batch_sk / 1e3:>14.2f}{batch_fast / 1e3:>14.2f}{batch_sk / batch_fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Live Negotiation interaction latency: fragment redraws vs full-page runs.
+
+    python benchmarks/bench_negotiation_ui.py [--actions 20]
+
+Drives app.py headlessly with Streamlit's AppTest: accepts, restructures
+and counter-offers on the Live Negotiation page, then prints the
+server-side timings the app records in st.session_state["ui_latency"]:
+
+- "<fragment>": one redraw of that fragment
+- "<fragment> (action)": the widget callback plus that redraw, which is
+  what one click costs in a browser session
+- "full page": one run of the whole script, which is what each click cost
+  before (twice, since every action ended in st.rerun())
+
+AppTest itself always reruns the whole script, so the fragment rows are
+taken from inside those runs.
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def button(at, label):
+    return next(b for b in at.button if b.label.startswith(label))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--actions", type=int, default=20, help="Clicks per interaction type.")
+    args = parser.parse_args(argv)
+
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.run()
+    at.sidebar.radio[0].set_value("Live Negotiation").run()
+    at.main.radio[0].set_value("Lender").run()
+    for _ in range(args.actions):
+        button(at, "🔄").click().run()
+        button(at, "Initiate Offer (USR1001)").click().run()
+        button(at, "Force Restructure (USR1001)").click().run()
+    at.main.radio[0].set_value("Borrower").run()
+    for i in range(args.actions):
+        button(at, "🔄").click().run()
+        at.text_input(key="borrower_reply").set_value(f"maybe next week {i}").run()
+        button(at, "Send Response").click().run()
+        button(at, "✅ Accept Offer").click().run()
+    if at.exception:
+        sys.exit(f"App raised: {at.exception}")
+
+    rows = [{"redraw": name, "runs": len(samples), "p50 ms": pd.Series(samples).median(),
+             "p95 ms": pd.Series(samples).quantile(0.95)}
+            for name, samples in at.session_state["ui_latency"].items()]
+    print(pd.DataFrame(rows).sort_values("p50 ms").to_string(index=False, float_format="{:,.1f}".format))
+
+
+if __name__ == "__main__":
+    main()
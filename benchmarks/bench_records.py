@@ -0,0 +1,55 @@
+"""
+Memory footprint of in-memory negotiation state.
+
+    python benchmarks/bench_records.py [--negotiations 1000000]
+
+Creates the given number of negotiations in a MemoryNegotiationStore the way
+the engine does (demo user, bulk campaign, rendered offer message in the
+chat), then reports the traced Python heap per negotiation and extrapolated
+to 1M negotiations. The decision log and event log are excluded, so the
+number is the cost of the negotiation records and their chat.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura.negotiation import NegotiationEngine
+from aura.negotiation_store import MemoryNegotiationStore
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--negotiations", type=int, default=1_000_000, help="Negotiations to create.")
+    args = parser.parse_args(argv)
+
+    names = ["Gulam", "Priya", "Raj", "Anjali", "Meena", "Arjun", "Kavya", "Vikram"]
+    start = time.perf_counter()
+    store = MemoryNegotiationStore(log_capacity=1)
+    engine = NegotiationEngine(store)
+    gc.collect()
+    tracemalloc.start()
+    for i in range(args.negotiations):
+        engine.get_or_create_demo_user(f"USR{i:07d}", name=names[i % len(names)], wallet=500 + i % 4000,
+                                       missed_amount=1000 + i % 3000)
+    engine.auto_negotiate_all(bulk=True)
+    store.decisions.clear()
+    for user_id in list(store.negotiations):
+        engine.send_offer_message(user_id)
+    gc.collect()
+    used, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per = used / args.negotiations
+    print(f"{args.negotiations:,} negotiations in {time.perf_counter() - start:.1f}s")
+    print(f"Heap: {used / 2**20:,.1f} MB ({per:,.0f} bytes per negotiation, "
+          f"{per * 1_000_000 / 2**20:,.0f} MB per 1M); peak {peak / 2**20:,.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
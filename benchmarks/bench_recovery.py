@@ -0,0 +1,78 @@
+"""
+Crash-recovery time of the journaled negotiation store as history grows.
+
+    python benchmarks/bench_recovery.py [--users 10000] [--events 100000 300000 1000000]
+
+For every history length a journal is written by cycling borrowers through
+offers, chat, counter-offers and accepts, then reopened twice: once with
+snapshots (load snapshot + replay the tail) and once by replaying the whole
+journal from the first event. With snapshots, recovery costs one snapshot
+load (proportional to the live state: negotiations, chat tails, the bounded
+decision stream) plus at most one journal segment, not the length of the
+journal.
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura.negotiation import NegotiationEngine
+from aura.negotiation_store import JournaledNegotiationStore
+
+
+def write_history(path, users, events, snapshot_every):
+    store = JournaledNegotiationStore(path, snapshot_every=snapshot_every)
+    engine = NegotiationEngine(store)
+    with store.batch():
+        for i in range(users):
+            engine.get_or_create_demo_user(f"USR{i:07d}", wallet=500 + i % 4000, missed_amount=1000 + i % 3000)
+    round_no = 0
+    while store.seq < events:
+        engine.auto_negotiate_all(bulk=True)
+        replies = [(f"USR{i:07d}", ("yes", "₹1,500", "no", "300 on the 5th")[(i + round_no) % 4])
+                   for i in range(0, users, 3)]
+        for start in range(0, len(replies), 500):
+            engine.handle_replies(replies[start:start + 500])
+        for entry in store.iter_negotiations():
+            if store.seq >= events:
+                break
+            if entry['status'] != 'pending':  # back to pending for the next round of offers
+                entry['status'] = 'pending'
+                store.save(entry)
+        round_no += 1
+    store.close()
+    return store.seq
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000, help="Negotiations in the store.")
+    parser.add_argument("--events", type=int, nargs="+", default=[100_000, 300_000, 1_000_000],
+                        help="History lengths (journal events).")
+    parser.add_argument("--snapshot-every", type=int, default=10_000, help="Events between snapshots.")
+    args = parser.parse_args(argv)
+
+    print(f"{'events':>12}{'snapshot + tail (s)':>22}{'replayed':>10}{'full replay (s)':>18}")
+    for events in args.events:
+        path = tempfile.mkdtemp(prefix='aura-journal-')
+        try:
+            written = write_history(path, args.users, events, args.snapshot_every)
+            store = JournaledNegotiationStore(path)
+            store.close()
+            fast, replayed = store.recovery_seconds, store.replayed
+            with contextlib.suppress(FileNotFoundError):  # no snapshot yet when events < snapshot_every
+                os.remove(os.path.join(path, 'snapshot.pkl'))
+            store = JournaledNegotiationStore(path, snapshot_every=written + 1)
+            store.close()
+            print(f"{written:>12,}{fast:>22.3f}{replayed:>10,}{store.recovery_seconds:>18.3f}")
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Inbound reply throughput: parsing alone and routed through the engine.
+
+    python benchmarks/bench_replies.py [--replies 100000] [--db negotiations.db]
+
+Replies are drawn from a mix of templates (amounts in several notations,
+dates, yes/no in English and Hindi) with random amounts, so most texts are
+distinct and the parse cache is exercised realistically.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura.negotiation import NegotiationEngine
+from aura.negotiation_store import MemoryNegotiationStore, SQLiteNegotiationStore
+from aura.replies import parse_replies, parse_reply
+
+TEMPLATES = [
+    "{n}", "₹{g}", "Rs. {g}", "I can pay {n} on the {d}th", "{k}k", "can do {n} by {d}/11",
+    "can't pay {g}, maybe {n}", "₹{dev}", "yes", "ok deal", "no", "नहीं", "हाँ", "who is this?",
+]
+_DEVANAGARI = str.maketrans('0123456789', '०१२३४५६७८९')
+
+
+def make_replies(count, seed=0):
+    rng = random.Random(seed)
+    replies = []
+    for _ in range(count):
+        n = rng.randrange(100, 5000)
+        replies.append(rng.choice(TEMPLATES).format(
+            n=n, g=f"{n * 10:,}", d=rng.randrange(1, 28), k=n / 1000, dev=str(n).translate(_DEVANAGARI)))
+    return replies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--replies", type=int, default=100_000, help="Replies to parse and route.")
+    parser.add_argument("--users", type=int, default=10_000, help="Negotiations the replies are spread over.")
+    parser.add_argument("--db", help="Use a fresh SQLite store at this path instead of memory.")
+    args = parser.parse_args(argv)
+
+    texts = make_replies(args.replies)
+    parse_reply.cache_clear()
+    start = time.perf_counter()
+    parse_replies(texts)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    parse_replies(texts)
+    warm = time.perf_counter() - start
+    print(f"Parse (cold cache): {args.replies / cold:,.0f} msgs/s")
+    print(f"Parse (warm cache): {args.replies / warm:,.0f} msgs/s")
+
+    if args.db:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+        store = SQLiteNegotiationStore(args.db)
+    else:
+        store = MemoryNegotiationStore()
+    engine = NegotiationEngine(store)
+    with store.batch():
+        for i in range(args.users):
+            engine.get_or_create_demo_user(f"USR{i:07d}", wallet=500 + i % 4000, missed_amount=1000 + i % 3000)
+    engine.auto_negotiate_all(bulk=True)
+
+    rng = random.Random(1)
+    replies = [(f"USR{rng.randrange(args.users):07d}", text) for text in texts]
+    parse_reply.cache_clear()
+    start = time.perf_counter()
+    engine.handle_replies(replies)
+    elapsed = time.perf_counter() - start
+    print(f"Routed through {type(store).__name__}: {args.replies / elapsed:,.0f} msgs/s ({elapsed:.2f}s)")
+    print(f"Status counts: {store.status_counts()}")
+
+
+if __name__ == "__main__":
+    main()
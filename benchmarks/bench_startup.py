@@ -0,0 +1,64 @@
+"""
+Cold-start profile of the dashboard: per-import and per-phase cost.
+
+    python benchmarks/bench_startup.py [--top 12]
+
+Two fresh interpreters, as on a new replica:
+
+- `python -X importtime -c "import app"`: import time per top-level package
+  (and whether sklearn / plotly were loaded at all)
+- a headless first run of app.py (Streamlit AppTest) with
+  AURA_STARTUP_PROFILE=1: the app's own phase report (imports, page config,
+  CSS, layout, data + model, page render)
+
+The model artifact cache is used as configured, so run it twice to see both
+the cache-miss (training) and the cache-hit start-up.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aura.profiling import import_costs, parse_importtime
+
+FIRST_RUN = (
+    "from streamlit.testing.v1 import AppTest\n"
+    "at = AppTest.from_file('app.py', default_timeout=600)\n"
+    "at.run()\n"
+    "assert not at.exception, at.exception\n"
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=12, help="Packages listed in the import table.")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    rows = parse_importtime(result.stderr)
+    app_row = next(row for row in rows if row[0] == "app")
+    print(f"import app: {app_row[3] * 1000:,.0f} ms ({wall * 1000:,.0f} ms including interpreter start)")
+    costs = import_costs(rows)
+    for package, seconds in list(costs.items())[:args.top]:
+        print(f"  {package:<24} {seconds * 1000:9,.1f} ms")
+    print("  deferred: " + ", ".join(f"{name} {costs.get(name, 0.0) * 1000:,.1f} ms"
+                                      for name in ("sklearn", "scipy", "joblib", "plotly")))
+
+    env = dict(os.environ, AURA_STARTUP_PROFILE="1")
+    result = subprocess.run([sys.executable, "-c", FIRST_RUN], cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode:
+        sys.exit(result.stderr)
+    report = result.stderr[result.stderr.index("Startup profile"):].split("\n\n")[0]
+    print("\nFirst run of app.py\n" + report.strip())
+
+
+if __name__ == "__main__":
+    main()
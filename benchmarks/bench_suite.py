@@ -0,0 +1,174 @@
+"""
+Headless benchmark suite for the scoring and agent hot paths.
+
+    python benchmarks/bench_suite.py [--sizes 1000 100000 1000000] [--output run.json]
+    python benchmarks/bench_suite.py --sizes 1000 --compare baseline.json
+
+For every portfolio size a synthetic portfolio is generated and timed through
+train_model, batch score_portfolio, single-row risk_management_agent_logic /
+credit_coach_agent_logic and risk-factor extraction. Each size runs in a fresh
+process so its peak RSS is measured in isolation. Results are written as JSON
+(one record per size plus environment details) so runs can be diffed.
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def _latency_ms(fn, rows):
+    """p50/p99/mean per-call latency of fn(row) over rows, in milliseconds."""
+    fn(rows[0])  # warm-up
+    samples = np.empty(len(rows))
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        fn(row)
+        samples[i] = time.perf_counter() - start
+    samples *= 1e3
+    return {
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'mean_ms': float(samples.mean()),
+    }
+
+
+def run_size(num_rows, calls=500, seed=42):
+    """Benchmark one portfolio size; returns a JSON-serialisable record."""
+    from aura.agents import (
+        credit_coach_agent_logic, describe_risk_factors, risk_management_agent_logic, score_portfolio,
+    )
+    from aura.data import generate_synthetic_dataset
+    from aura.model import train_model
+    from aura.rules import RISK_FACTOR_RULES, rule_mask
+
+    record = {'rows': num_rows}
+
+    start = time.perf_counter()
+    df = generate_synthetic_dataset(num_rows, seed=seed)
+    record['generate_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model, scaler, feature_cols, metrics = train_model(df)
+    record['train_seconds'] = time.perf_counter() - start
+    record['test_accuracy'] = metrics['test_accuracy']
+
+    start = time.perf_counter()
+    scored = score_portfolio(df, model, scaler, feature_cols)
+    elapsed = time.perf_counter() - start
+    record['batch_score_seconds'] = elapsed
+    record['batch_score_rows_per_second'] = len(scored) / elapsed
+
+    positions = np.random.default_rng(seed).integers(0, num_rows, min(calls, num_rows))
+    rows = [df.iloc[int(i)] for i in positions]
+    record['risk_agent_latency'] = _latency_ms(
+        lambda row: risk_management_agent_logic(row, model, scaler, feature_cols), rows)
+    record['coach_agent_latency'] = _latency_ms(credit_coach_agent_logic, rows)
+
+    start = time.perf_counter()
+    rule_mask(df, RISK_FACTOR_RULES)
+    record['risk_mask_seconds'] = time.perf_counter() - start
+    record['describe_risk_factors_latency'] = _latency_ms(describe_risk_factors, rows)
+
+    record['peak_rss_mb'] = _peak_rss_mb()
+    return record
+
+
+def _environment():
+    import numpy
+    import pandas
+    import sklearn
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def _flatten(record, prefix=''):
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def print_results(results, baseline=None):
+    """Table of every metric per size; with a baseline, the new/old ratio too."""
+    old = {record['rows']: _flatten(record) for record in (baseline or {}).get('results', [])}
+    for record in results:
+        print(f"\n== {record['rows']:,} rows ==")
+        base = old.get(record['rows'], {})
+        for key, value in _flatten(record).items():
+            if key == 'rows':
+                continue
+            line = f"{key:<40}{value:>16.4f}"
+            if base.get(key):
+                line += f"{value / base[key]:>9.2f}x"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Portfolio sizes (rows).")
+    parser.add_argument("--calls", type=int, default=500, help="Single-row calls timed per agent.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated portfolios.")
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/<timestamp>.json).")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against.")
+    args = parser.parse_args(argv)
+
+    # A fresh interpreter per size keeps peak RSS from carrying over between sizes
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for num_rows in args.sizes:
+        print(f"Benchmarking {num_rows:,} rows...", file=sys.stderr)
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_size, (num_rows, args.calls, args.seed)))
+
+    run = {'environment': _environment(), 'calls': args.calls, 'results': results}
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = run['environment']['timestamp'].replace(':', '').replace('-', '')
+        output = os.path.join(RESULTS_DIR, f"bench-{stamp}.json")
+    with open(output, 'w') as fh:
+        json.dump(run, fh, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+    print_results(results, baseline)
+    print(f"\nResults -> {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Verification tests for the dashboard portfolio aggregates (aura.aggregates).
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import aura.data
+from aura.aggregates import PERCENTILES, dataset_version, portfolio_aggregates
+from aura.agents import score_portfolio
+from aura.data import generate_synthetic_dataset
+from aura.model import train_model
+from aura.rules import STATUS_TIERS
+
+
+@pytest.fixture(scope="module")
+def scored():
+    df = generate_synthetic_dataset()
+    model, scaler, feature_cols, _ = train_model(df)
+    return score_portfolio(df, model, scaler, feature_cols)
+
+
+def test_aggregates_match_per_tier_filters(scored):
+    aggregates = portfolio_aggregates(scored)
+    assert aggregates['total'] == len(scored)
+    assert aggregates['exposure_total'] == scored['loan_amount'].sum()
+    for tier in STATUS_TIERS:
+        rows = scored[scored['status'] == tier]
+        assert aggregates['counts'][tier] == len(rows)
+        assert aggregates['exposure'][tier] == rows['loan_amount'].sum()
+    assert list(aggregates['percentiles']) == list(PERCENTILES)
+    assert list(aggregates['percentiles'].values()) == \
+        pytest.approx(np.percentile(scored['probability'], PERCENTILES))
+
+    empty = portfolio_aggregates(scored.iloc[:0])
+    assert empty['counts'] == dict.fromkeys(STATUS_TIERS, 0) and empty['percentiles'] == {}
+
+
+def test_dataset_version_tracks_rewrites(tmp_path):
+    path = tmp_path / "portfolio.csv"
+    synthetic = dataset_version(str(path))
+    assert synthetic.startswith('synthetic-') and dataset_version(str(tmp_path / "other.csv")) == synthetic
+    path.write_text("user_id\nU1\n")
+    first = dataset_version(str(path))
+    assert dataset_version(str(path)) == first
+    path.write_text("user_id\nU1\nU2\n")
+    os.utime(path, ns=(1, 1))
+    assert dataset_version(str(path)) != first
+    assert dataset_version(str(tmp_path)) != dataset_version(str(path))
+
+
+def test_synthetic_version_follows_the_generator(tmp_path, monkeypatch):
+    generator = tmp_path / "data.py"
+    generator.write_text("SEED = 42\n")
+    monkeypatch.setattr(aura.data, '__file__', str(generator))
+    before = dataset_version(str(tmp_path / "missing.csv"))
+    generator.write_text("SEED = 7\n")
+    assert dataset_version(str(tmp_path / "missing.csv")) != before
@@ -0,0 +1,45 @@
+"""
+Verification tests for the on-disk model artifact cache (aura.artifacts).
+"""
+
+import numpy as np
+
+from aura import artifacts
+from aura.data import generate_synthetic_dataset
+from aura.model import FEATURE_COLS, MODEL_PARAMS
+
+
+def test_second_load_skips_training(tmp_path, monkeypatch):
+    df = generate_synthetic_dataset()
+    model, scaler, feature_cols, metrics = artifacts.load_or_train(df, artifact_dir=tmp_path)
+    assert len(list(tmp_path.glob("model-*.joblib"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("train_model should not run on a warm cache")
+    monkeypatch.setattr(artifacts, "train_model", fail)
+
+    model2, scaler2, feature_cols2, metrics2 = artifacts.load_or_train(df, artifact_dir=tmp_path)
+    X = scaler.transform(df[FEATURE_COLS].to_numpy(dtype=float))
+    assert np.array_equal(model.predict_proba(X), model2.predict_proba(scaler2.transform(df[FEATURE_COLS].to_numpy(dtype=float))))
+    assert feature_cols2 == feature_cols
+    assert metrics2['test_accuracy'] == metrics['test_accuracy']
+
+
+def test_key_tracks_data_and_params():
+    df = generate_synthetic_dataset()
+    key = artifacts.artifact_key(df)
+    assert key == artifacts.artifact_key(df.copy())
+    assert key != artifacts.artifact_key(df, {**MODEL_PARAMS, 'n_estimators': 50})
+    changed = df.copy()
+    changed.loc[0, 'mobility_score'] += 0.01
+    assert key != artifacts.artifact_key(changed)
+
+
+def test_corrupt_artifact_is_retrained(tmp_path):
+    df = generate_synthetic_dataset()
+    path = artifacts.artifact_path(artifacts.artifact_key(df), tmp_path)
+    with open(path, "wb") as fh:
+        fh.write(b"not a pickle")
+    model, scaler, feature_cols, metrics = artifacts.load_or_train(df, artifact_dir=tmp_path)
+    assert feature_cols == FEATURE_COLS
+    assert artifacts.load_artifact(path) is not None
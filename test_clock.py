@@ -0,0 +1,30 @@
+"""
+Verification tests for the engine clocks (aura.clock).
+"""
+
+from datetime import datetime, timezone
+
+from aura.clock import MICROS_PER_DAY, SimulatedClock, SystemClock, format_timestamp, to_epoch_us
+
+
+def test_system_clock_is_strictly_increasing():
+    clock = SystemClock()
+    readings = [clock.now() for _ in range(10_000)]
+    assert all(later > earlier for earlier, later in zip(readings, readings[1:]))
+
+
+def test_simulated_clock_moves_only_when_told():
+    clock = SimulatedClock(start=datetime(2025, 1, 1, tzinfo=timezone.utc))
+    start = clock.now()
+    assert clock.now() == start
+    assert clock.advance(days=2, seconds=1.5) == start + 2 * MICROS_PER_DAY + 1_500_000
+    stepping = SimulatedClock(start=0, step_seconds=60)
+    assert [stepping.now() for _ in range(3)] == [0, 60_000_000, 120_000_000]
+
+
+def test_timestamps_normalise_and_format():
+    epoch_us = 1_735_734_645_123_456
+    assert epoch_us == to_epoch_us(str(epoch_us)) == to_epoch_us(epoch_us)
+    assert format_timestamp(epoch_us) == format_timestamp(str(epoch_us)) == "2025-01-01 12:30:45"
+    assert format_timestamp(None) == format_timestamp("") == "-"
+    assert to_epoch_us(None) is None
@@ -0,0 +1,43 @@
+"""
+Verification tests for chunked synthetic data generation (aura.data).
+"""
+
+import json
+
+import pandas as pd
+
+from aura.data import generate_chunk, generate_synthetic_dataset, write_synthetic_dataset
+
+
+def test_demo_dataset_is_unchanged():
+    df = generate_synthetic_dataset()
+    assert len(df) == 150
+    assert df.loc[0, 'user_id'] == 'USR1000'
+    assert df.loc[0, 'loan_amount'] == 20795
+    assert df['default_label'].equals((df['default_probability'] > 0.35).astype(int))
+
+
+def test_chunks_are_reproducible_and_independent():
+    a = generate_chunk(2, 1000, 10_000, root_seed=7)
+    assert a.equals(generate_chunk(2, 1000, 10_000, root_seed=7))
+    assert not a['network_usage_stability'].equals(generate_chunk(3, 1000, 10_000, root_seed=7)['network_usage_stability'])
+    assert not a['network_usage_stability'].equals(generate_chunk(2, 1000, 10_000, root_seed=8)['network_usage_stability'])
+    assert a['user_id'].iloc[0] == 'USR3000'
+
+    # Distributions match the demo generator's ranges
+    assert a['loan_amount'].between(5000, 49999).all()
+    assert a['mobility_score'].between(0.4, 0.95).all()
+    assert a['default_probability'].between(0.01, 0.85).all()
+
+
+def test_parallel_write_matches_serial(tmp_path):
+    serial = write_synthetic_dataset(tmp_path / "serial", 2500, chunk_size=1000, root_seed=3)
+    parallel = write_synthetic_dataset(tmp_path / "parallel", 2500, chunk_size=1000, root_seed=3, workers=2)
+    assert len(serial) == len(parallel) == 3
+    for s, p in zip(serial, parallel):
+        pd.testing.assert_frame_equal(pd.read_parquet(s), pd.read_parquet(p))
+
+    manifest = json.loads((tmp_path / "serial" / "_manifest.json").read_text())
+    assert [c['rows'] for c in manifest['chunks']] == [1000, 1000, 500]
+    full = pd.read_parquet(tmp_path / "serial")
+    assert full['user_id'].is_unique and len(full) == 2500
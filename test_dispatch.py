@@ -0,0 +1,122 @@
+"""
+Verification tests for the asynchronous offer dispatcher (aura.dispatch).
+"""
+
+import asyncio
+
+import pytest
+
+from aura.dispatch import DeliveryError, FakeGateway, OfferDispatcher
+from aura.negotiation import NegotiationEngine, offer_message
+from aura.negotiation_store import SQLiteNegotiationStore
+
+
+def _engine(num_users=60):
+    engine = NegotiationEngine()
+    for i in range(num_users):
+        engine.get_or_create_demo_user(f"USR{i:03d}", name=f"N{i}", wallet=500 + 10 * i, missed_amount=2000)
+    return engine
+
+
+class FlakyGateway:
+    """Fails the first `failures` sends to every user."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = {}
+
+    async def send(self, user_id, message):
+        self.calls[user_id] = self.calls.get(user_id, 0) + 1
+        if self.calls[user_id] <= self.failures:
+            raise DeliveryError("gateway timeout")
+        return "ok"
+
+
+def test_bulk_offers_are_delivered_within_channel_limits():
+    engine = _engine()
+    engine.auto_negotiate_all(bulk=True)
+    channels = {'sms': FakeGateway('sms', latency=0.01), 'whatsapp': FakeGateway('whatsapp', latency=0.01)}
+    route = lambda entry, names: 'whatsapp' if entry['user_id'].endswith(('0', '5')) else 'sms'
+    dispatcher = OfferDispatcher(engine, channels, limits={'sms': 4, 'whatsapp': 2}, route=route)
+    stats = asyncio.run(dispatcher.run_once())
+
+    assert (stats['delivered'], stats['failed']) == (60, 0)
+    assert channels['sms'].max_in_flight == 4 and channels['whatsapp'].max_in_flight == 2
+    assert len(channels['whatsapp'].sent) == 12
+    for user_id, message in channels['sms'].sent:
+        entry = engine.store.get(user_id)
+        assert message == entry['last_message'] == offer_message(entry)
+        assert (entry['delivery_status'], entry['delivery_channel'], entry['delivery_attempts']) == ('delivered', 'sms', 1)
+    assert engine.store.undelivered_offers() == []
+
+
+def test_retries_with_backoff_then_fails():
+    engine = _engine(3)
+    engine.auto_negotiate_all()
+    events = []
+    dispatcher = OfferDispatcher(engine, {'sms': FlakyGateway(failures=2)}, max_attempts=3, backoff=0.001,
+                                 on_status=[lambda user_id, status, info: events.append((user_id, status))])
+    stats = asyncio.run(dispatcher.run_once())
+    assert (stats['delivered'], stats['attempts']) == (3, 9)
+    assert [status for user_id, status in events if user_id == 'USR001'] == \
+        ['sending', 'retrying', 'retrying', 'delivered']
+
+    engine = _engine(2)
+    engine.auto_negotiate_all()
+    stats = asyncio.run(OfferDispatcher(engine, {'sms': FlakyGateway(failures=5)}, max_attempts=2,
+                                        backoff=0.001).run_once())
+    assert stats['failed'] == 2
+    assert engine.store.get('USR000')['delivery_status'] == 'failed'
+
+
+def test_new_offers_are_picked_up_while_running():
+    engine = _engine(5)
+    gateway = FakeGateway(latency=0.001)
+
+    async def scenario():
+        dispatcher = OfferDispatcher(engine, {'sms': gateway})
+        await dispatcher.start()
+        engine.start_negotiation('USR003')
+        await asyncio.sleep(0.01)
+        await dispatcher.drain()
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert [user_id for user_id, _ in gateway.sent] == ['USR003']
+
+
+
+def test_bad_route_fails_the_offer_and_keeps_dispatching():
+    engine = _engine(4)
+    engine.auto_negotiate_all()
+    gateway = FakeGateway(latency=0.001)
+
+    def route(entry, names):
+        if entry['user_id'] == 'USR001':
+            raise LookupError("no channel for USR001")
+        return 'email' if entry['user_id'] == 'USR002' else 'sms'
+
+    stats = asyncio.run(asyncio.wait_for(OfferDispatcher(engine, {'sms': gateway}, route=route).run_once(), 5))
+    assert (stats['delivered'], stats['failed']) == (2, 2)
+    assert sorted(user_id for user_id, _ in gateway.sent) == ['USR000', 'USR003']
+    assert [engine.store.get(user_id)['delivery_status'] for user_id in ('USR001', 'USR002')] == ['failed', 'failed']
+
+
+@pytest.mark.parametrize("store", ["memory", "sqlite"])
+def test_revised_offer_is_dispatched_again(store, tmp_path):
+    engine = NegotiationEngine(SQLiteNegotiationStore(str(tmp_path / "n.db")) if store == "sqlite" else None)
+    engine.get_or_create_demo_user("USR001", name="Asha", wallet=2000, missed_amount=2000)
+    gateway = FakeGateway(latency=0.001)
+
+    engine.start_negotiation("USR001", offer_amount=500)
+    asyncio.run(OfferDispatcher(engine, {'sms': gateway}).run_once())
+    engine.start_negotiation("USR001", offer_amount=400)
+    assert engine.store.get("USR001")['delivery_status'] is None
+    assert engine.store.undelivered_offers() == ["USR001"]
+    stats = asyncio.run(OfferDispatcher(engine, {'sms': gateway}).run_once())
+
+    assert (stats['delivered'], stats['skipped']) == (1, 0)
+    assert [message for _, message in gateway.sent] == [
+        engine.store.chat_history("USR001")[0]['message'], engine.store.get("USR001")['last_message']]
+    assert '₹400' in gateway.sent[1][1]
+    assert engine.store.get("USR001")['delivery_status'] == 'delivered'
@@ -0,0 +1,48 @@
+"""
+Verification tests for the compiled array-backed forest (aura.forest).
+"""
+
+import numpy as np
+import pytest
+
+from aura.agents import risk_management_agent_logic
+from aura.data import generate_synthetic_dataset
+from aura.forest import CompiledForest, compile_model
+from aura.model import FEATURE_COLS, train_model
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    df = generate_synthetic_dataset()
+    model, scaler, feature_cols, _ = train_model(df)
+    return df, model, scaler, feature_cols
+
+
+def test_compiled_forest_equals_sklearn(fitted):
+    df, model, scaler, _ = fitted
+    fast_model, fast_scaler = compile_model(model, scaler)
+    X = df[FEATURE_COLS].to_numpy(dtype=float)
+    X = np.vstack([X, X * np.random.default_rng(1).uniform(0.7, 1.3, X.shape)])
+
+    expected = model.predict_proba(scaler.transform(X))[:, 1]
+    assert np.array_equal(fast_model.predict_default_proba(fast_scaler.transform(X)), expected)
+    for i in range(0, len(X), 17):
+        assert fast_model.predict_default_proba(fast_scaler.transform(X[i]))[0] == expected[i]
+
+
+def test_compiled_pair_is_drop_in_for_agent(fitted):
+    df, model, scaler, feature_cols = fitted
+    fast_model, fast_scaler = compile_model(model, scaler)
+    for _, row in df.head(20).iterrows():
+        assert (risk_management_agent_logic(row, fast_model, fast_scaler, feature_cols)
+                == risk_management_agent_logic(row, model, scaler, feature_cols))
+
+
+def test_save_load_roundtrip(fitted, tmp_path):
+    df, model, scaler, _ = fitted
+    fast_model, fast_scaler = compile_model(model, scaler)
+    path = tmp_path / "forest.npz"
+    fast_model.save(path)
+    loaded = CompiledForest.load(path)
+    X = fast_scaler.transform(df[FEATURE_COLS].to_numpy(dtype=float))
+    assert np.array_equal(loaded.predict_default_proba(X), fast_model.predict_default_proba(X))
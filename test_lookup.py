@@ -0,0 +1,67 @@
+"""
+Verification tests for the indexed borrower lookup (aura.lookup).
+"""
+
+import pandas as pd
+import pytest
+
+from aura.agents import COACHING_COLS, credit_coach_agent_logic
+from aura.data import generate_synthetic_dataset
+from aura.lookup import BorrowerLookup, UserIndex
+from aura.store import build_store
+
+
+@pytest.fixture
+def csv_portfolio(tmp_path):
+    df = generate_synthetic_dataset()
+    path = tmp_path / "portfolio.csv"
+    df.to_csv(path, index=False)
+    return pd.read_csv(path), str(path)
+
+
+def test_index_maps_ids_to_first_row():
+    index = UserIndex(['b2', 'A1', 'b2', 'c3'])
+    assert len(index) == 3
+    assert index.get('b2') == 0 and index.get('A1') == 1 and index.get('c3') == 3
+    assert index.get('zz') is None
+    assert 'c3' in index and 'zz' not in index
+
+
+def test_prefix_search_is_sorted_limited_and_case_insensitive():
+    index = UserIndex(['USR_10', 'usr_2', 'USR_1', 'ABC', 'USR_11'])
+    assert index.search('usr_1') == ['USR_1', 'USR_10', 'USR_11']
+    assert index.search('USR', limit=2) == ['USR_1', 'USR_10']
+    assert index.count(' usr ') == 4
+    assert index.search('x') == [] and index.count('x') == 0
+    assert index.search('') == ['ABC', 'USR_1', 'USR_10', 'USR_11', 'usr_2']
+
+
+@pytest.mark.parametrize('as_store', [False, True])
+def test_row_matches_scan(csv_portfolio, tmp_path, as_store):
+    df, csv_path = csv_portfolio
+    path = build_store(csv_path, str(tmp_path / "store")).path if as_store else csv_path
+    lookup = BorrowerLookup(path)
+    assert len(lookup) == len(df)
+    for user_id in df['user_id'].iloc[[0, 7, -1]]:
+        expected = df[df['user_id'] == user_id].iloc[0]
+        row = lookup.row(user_id)
+        assert row['loan_amount'] == expected['loan_amount']
+        assert row['utility_payment_timeliness'] == pytest.approx(expected['utility_payment_timeliness'])
+    assert lookup.row('no-such-user') is None
+
+    projected = BorrowerLookup(path, columns=['loan_amount']).row(df['user_id'].iloc[3])
+    assert projected.index.tolist() == ['loan_amount']
+    assert projected['loan_amount'] == df['loan_amount'].iloc[3]
+
+
+@pytest.mark.parametrize('as_store', [False, True])
+def test_coaching_lookup_reads_only_coaching_columns(csv_portfolio, tmp_path, as_store):
+    df, csv_path = csv_portfolio
+    path = build_store(csv_path, str(tmp_path / "store")).path if as_store else csv_path
+    lookup = BorrowerLookup(path, COACHING_COLS)
+    if not as_store:
+        assert sorted(lookup._frame.columns) == sorted(COACHING_COLS)
+    user_id = df['user_id'].iloc[11]
+    row = lookup.row(user_id)
+    assert row.index.tolist() == COACHING_COLS
+    assert credit_coach_agent_logic(row) == credit_coach_agent_logic(df[df['user_id'] == user_id].iloc[0])
@@ -0,0 +1,375 @@
+"""
+Verification tests for the negotiation engine over every store
+(aura.negotiation, aura.negotiation_store, aura.records).
+"""
+
+import asyncio
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from aura.clock import SimulatedClock
+from aura.dispatch import FakeGateway, OfferDispatcher
+from aura.event_log import ChatLog, EventLog
+from aura.negotiation import NegotiationEngine, decide_offer, decide_offers, decision_reason, offer_message
+from aura.negotiation_store import JournaledNegotiationStore, MemoryNegotiationStore, SQLiteNegotiationStore
+from aura.records import NegotiationRecord, Status
+
+
+@pytest.fixture(params=["memory", "sqlite", "journal"])
+def engine(request, tmp_path):
+    if request.param == "memory":
+        return NegotiationEngine(MemoryNegotiationStore())
+    if request.param == "journal":
+        return NegotiationEngine(JournaledNegotiationStore(str(tmp_path / "journal"), snapshot_every=7))
+    return NegotiationEngine(SQLiteNegotiationStore(str(tmp_path / "negotiations.db")))
+
+
+def test_offer_accept_flow(engine):
+    engine.seed_demo_users()
+    assert engine.auto_negotiate_all() == 4
+    engine.accept_offer("USR1002")
+    engine.accept_offer("USR1002")  # idempotent: counted once
+
+    summary = engine.negotiation_summary()
+    offer = decide_offer(engine.store.get("USR1002"))[0]
+    assert summary["total_recovered"] == offer
+    assert summary["counts"] == {"pending": 0, "offer_sent": 3, "restructured": 1, "rejected": 0}
+    assert len(summary["decisions"]) == 4
+    assert list(summary["negotiations"]) == ["USR1001", "USR1002", "USR1003", "USR1004"]
+    roles = [message["role"] for message in engine.store.chat_history("USR1002")]
+    assert roles == ["agent", "borrower"]
+
+
+def test_counter_offer(engine):
+    engine.seed_demo_users()
+    engine.start_negotiation("USR1001")
+    assert engine.handle_counter_offer_text("USR1001", "100") == "₹100 is too low; minimum acceptable is ₹250."
+    assert engine.handle_counter_offer_text("USR1001", "I can do 300") == "Counter-offer accepted at ₹300."
+    entry = engine.store.get("USR1001")
+    assert (entry["status"], entry["offer_amount"]) == ("restructured", 300)
+    assert engine.store.funds_recovered == 300
+    assert engine.handle_counter_offer_text("NOBODY", "300") == "No active negotiation."
+
+
+
+def test_handle_replies_routes_each_intent(engine):
+    engine.seed_demo_users()
+    engine.auto_negotiate_all()
+    offer = engine.store.get("USR1003")["offer_amount"]
+    responses = engine.handle_replies([
+        ("USR1001", "I can pay ₹३०० on the 5th"),
+        ("USR1002", "yes, deal"),
+        ("USR1003", "sorry, not interested"),
+        ("USR1004", "hmm?"),
+        ("NOBODY", "yes"),
+    ])
+    assert responses[0] == "Counter-offer accepted at ₹300."
+    assert responses[1].startswith("Offer accepted")
+    assert responses[2].startswith("Offer declined")
+    assert responses[3].startswith("I noted your response")
+    assert responses[4] == "No active negotiation."
+    statuses = {user_id: engine.store.get(user_id)["status"] for user_id in ("USR1001", "USR1002", "USR1003", "USR1004")}
+    assert statuses == {"USR1001": "restructured", "USR1002": "restructured", "USR1003": "rejected",
+                        "USR1004": "offer_sent"}
+    assert engine.negotiation_summary()["counts"]["rejected"] == 1
+    assert engine.store.get("USR1003")["offer_amount"] == offer
+    assert engine.store.get_many(["USR1001", "NOBODY"]).keys() == {"USR1001"}
+    assert engine.handle_replies([("USR1004", "ok 0")])[0].startswith("₹0 is too low")
+    assert engine.store.get("USR1004")["status"] == "offer_sent"
+
+def test_sqlite_store_is_durable_and_batched(tmp_path):
+    path = str(tmp_path / "negotiations.db")
+    store = SQLiteNegotiationStore(path)
+    engine = NegotiationEngine(store)
+    with store.batch():
+        for i in range(2000):
+            engine.get_or_create_demo_user(f"USR{i:05d}", wallet=1000 + i, missed_amount=1500)
+    assert store.batch_size < 2000 and len(store) == 2000
+    engine.auto_negotiate_all()
+    engine.accept_offer("USR00042")
+    store.close()
+
+    reopened = SQLiteNegotiationStore(path)
+    assert reopened.status_counts()["offer_sent"] == 1999
+    assert reopened.get("USR00042")["status"] == "restructured"
+    assert reopened.funds_recovered == decide_offer(reopened.get("USR00042"))[0]
+    assert len(reopened.decisions) == 2000
+    assert reopened.decisions.for_user("USR00042", 5) == [next(d for d in reopened.decisions if d["user_id"] == "USR00042")]
+    assert [d["user_id"] for d in reopened.decisions.page(1990, 50)] == [f"USR{i:05d}" for i in range(1990, 2000)]
+    mode = reopened._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+
+def test_sqlite_accept_is_counted_once_across_processes(tmp_path):
+    path = str(tmp_path / "negotiations.db")
+    first = NegotiationEngine(SQLiteNegotiationStore(path))
+    first.seed_demo_users()
+    first.start_negotiation("USR1002")
+    second = NegotiationEngine(SQLiteNegotiationStore(path))
+    stale = second.store.get("USR1002")
+
+    first.accept_offer("USR1002")
+    second._accept(second.store.get("USR1002"))
+    second._accept(dict(stale))  # read before the first process accepted
+    second.store.save(stale)
+    offer = first.store.get("USR1002")["offer_amount"]
+    for store in (first.store, second.store):
+        assert store.funds_recovered == offer
+        assert store.get("USR1002")["status"] == "restructured"
+        assert store.status_counts()["restructured"] == 1
+
+
+def _state(store):
+    return (dict(store.negotiations), store.status_counts(), store.funds_recovered, store.total_missed,
+            list(store.decisions), store.recent_log())
+
+
+@pytest.mark.parametrize("snapshot_every", [50, 1_000_000])
+def test_journal_recovers_state(tmp_path, snapshot_every):
+    path = str(tmp_path / "journal")
+    store = JournaledNegotiationStore(path, snapshot_every=snapshot_every, chat_tail=1)
+    engine = NegotiationEngine(store)
+    for i in range(40):
+        engine.get_or_create_demo_user(f"USR{i:03d}", wallet=300 + 50 * i, missed_amount=1500)
+    engine.auto_negotiate_all(bulk=True)
+    engine.send_offer_message("USR005")
+    engine.handle_replies([("USR001", "₹1,000"), ("USR002", "no"), ("USR003", "100")])
+    engine.accept_offer("USR010")
+    engine.record_delivery("USR011", "delivered", "sms", 1)
+    for i in range(60):  # past chat_tail + one spill chunk
+        engine.add_chat_message("USR001", "borrower", f"message {i}")
+    expected = _state(store)
+    chat = store.chat_history("USR001")
+    store.close()
+
+    reopened = JournaledNegotiationStore(path, snapshot_every=snapshot_every, chat_tail=1)
+    assert _state(reopened) == expected
+    assert reopened.chat_history("USR001") == chat and len(chat) == 62
+    assert reopened.replayed <= snapshot_every
+    assert reopened.seq == store.seq == sum(1 for _ in reopened.events())
+    spilled = os.path.getsize(os.path.join(path, "chat.jsonl"))
+    reopened.close()
+
+    again = JournaledNegotiationStore(path, snapshot_every=snapshot_every, chat_tail=1)
+    assert again.chat_history("USR001") == chat
+    assert os.path.getsize(os.path.join(path, "chat.jsonl")) == spilled  # replay does not spill twice
+
+
+def test_journal_drops_torn_write(tmp_path):
+    path = str(tmp_path / "journal")
+    store = JournaledNegotiationStore(path)
+    engine = NegotiationEngine(store)
+    engine.seed_demo_users()
+    expected = _state(store)
+    store.close()
+    segment = sorted((tmp_path / "journal").glob("events-*.jsonl"))[-1]
+    with open(segment, "a", encoding="utf-8") as fh:
+        fh.write('[999,"save",{"user_id":"USR')
+
+    reopened = JournaledNegotiationStore(path)
+    assert _state(reopened) == expected
+    NegotiationEngine(reopened).accept_offer("USR1001")
+    reopened.close()
+    assert JournaledNegotiationStore(path).get("USR1001")["status"] == "restructured"
+
+
+def test_journal_skips_events_that_fail_to_apply(tmp_path):
+    path = str(tmp_path / "journal")
+    store = JournaledNegotiationStore(path)
+    NegotiationEngine(store).seed_demo_users()
+    seq = store.seq
+    with pytest.raises(KeyError):
+        store.apply_offers(["USR9999"], np.array([300]), np.array([7]), np.array([1.0]), 0)
+    assert store.seq == seq
+    expected = _state(store)
+    store.close()
+
+    reopened = JournaledNegotiationStore(path)
+    assert _state(reopened) == expected and reopened.seq == seq
+
+
+def test_journal_snapshot_keeps_bounded_decisions(tmp_path):
+    path = str(tmp_path / "journal")
+    store = JournaledNegotiationStore(path, snapshot_every=25, decision_capacity=10, decisions_per_user=2)
+    for i in range(60):
+        store.append_decision({"user_id": f"USR{i % 3}", "offer": i, "expiry": 7, "reason": "r", "timestamp": i})
+    assert (len(store.decisions), store.decisions.total) == (10, 60)
+    assert [d["offer"] for d in store.decisions.for_user("USR0")] == [54, 57]
+    expected = (list(store.decisions), store.decisions.for_user("USR1"), store.decisions.total)
+    store.close()
+
+    reopened = JournaledNegotiationStore(path, snapshot_every=25, decision_capacity=10, decisions_per_user=2)
+    assert reopened.replayed == 10
+    assert (list(reopened.decisions), reopened.decisions.for_user("USR1"), reopened.decisions.total) == expected
+    assert sum(1 for _, kind, _ in reopened.events() if kind == "decision") == 60
+
+
+def test_memory_store_keeps_compact_records():
+    engine = NegotiationEngine(MemoryNegotiationStore())
+    created = dict(engine.get_or_create_demo_user("USR1001", name="Gulam"))
+    engine.start_negotiation("USR1001")
+    engine.accept_offer("USR1001")
+
+    record = engine.store.get("USR1001")
+    assert isinstance(record, NegotiationRecord) and not hasattr(record, "__dict__")
+    assert (record.status, record["status"]) == (Status.RESTRUCTURED, "restructured")
+    assert isinstance(record.started_at, int) and record["started_at"] == created["started_at"]
+    assert record["name"] is engine.get_or_create_demo_user("USR1002", name="Gulam")["name"]
+    assert "chat_history" not in record and "delivery_status" not in record
+    assert dict(pickle.loads(pickle.dumps(record))) == dict(record)
+    record["channel"] = "whatsapp"
+    assert record.get("channel") == "whatsapp" and json.loads(json.dumps(dict(record)))["_counted"] is True
+    assert [m["role"] for m in engine.store.chat_history("USR1001")] == ["agent", "borrower"]
+
+def test_counters_follow_transitions(engine):
+    for i in range(50):
+        engine.get_or_create_demo_user(f"USR{i:03d}", wallet=200 + 40 * i, missed_amount=1000 + i)
+    engine.auto_negotiate_all()
+    for i in range(0, 50, 7):
+        engine.accept_offer(f"USR{i:03d}")
+
+    recount = {"pending": 0, "offer_sent": 0, "restructured": 0, "rejected": 0}
+    for entry in engine.store.negotiations.values():
+        recount[entry["status"]] += 1
+    summary = engine.negotiation_summary()
+    assert summary["counts"] == recount
+    assert summary["total_missed"] == sum(1000 + i for i in range(50))
+    assert len(summary["log"]) == 25
+
+
+def test_event_log_is_bounded_and_spills(tmp_path):
+    dropped = EventLog(capacity=10)
+    for i in range(100):
+        dropped.append(i, f"event {i}")
+    assert len(dropped) == 10 and dropped.total == 100
+    assert dropped.recent(3) == [(97, "event 97"), (98, "event 98"), (99, "event 99")]
+
+    spill = tmp_path / "log.jsonl"
+    log = EventLog(capacity=10, spill_path=str(spill), spill_chunk=4)
+    for i in range(100):
+        log.append(i, f"event {i}")
+    assert len(log._entries) < 14
+    assert log.recent() == [(i, f"event {i}") for i in range(90, 100)]
+    assert list(log.spilled_entries()) == [(i, f"event {i}") for i in range(90)]
+
+
+
+def test_chat_log_keeps_a_tail_and_pages_from_disk(tmp_path):
+    dropped = ChatLog(tail=5)
+    for i in range(12):
+        dropped.append("USR1", ("agent", f"m{i}", i))
+    assert dropped.count("USR1") == 5 and dropped.page("USR1", 0, 2) == [("agent", "m7", 7), ("agent", "m8", 8)]
+
+    chat = ChatLog(tail=5, spill_path=str(tmp_path / "chat.jsonl"), spill_chunk=3)
+    for i in range(40):
+        chat.append("USR1", ("agent", f"m{i}", i))
+        chat.append("USR2", ("borrower", f"r{i}", i))
+    assert len(chat._tails["USR1"]) < 8 and chat.count("USR1") == 40
+    assert chat.page("USR1", 9, 4) == [("agent", f"m{i}", i) for i in range(9, 13)]
+    assert chat.page("USR2", 36, 10) == [("borrower", f"r{i}", i) for i in range(36, 40)]
+    assert chat.history("USR1") == [("agent", f"m{i}", i) for i in range(40)]
+    assert chat.page("NOBODY") == [] and chat.count("NOBODY") == 0
+
+
+def test_chat_pages(engine):
+    engine.seed_demo_users()
+    engine.start_negotiation("USR1001")
+    for i in range(30):
+        engine.add_chat_message("USR1001", "borrower", f"message {i}")
+    assert engine.store.chat_count("USR1001") == 31
+    assert [m["message"] for m in engine.store.chat_page("USR1001", 26, 10)] == [f"message {i}" for i in range(25, 30)]
+    assert engine.store.chat_page("USR1001", 0, 1)[0]["role"] == "agent"
+    assert "chat_history" not in engine.store.get("USR1001")
+
+def test_decision_log_per_user_and_paging(engine):
+    for i in range(30):
+        engine.get_or_create_demo_user(f"USR{i:03d}", wallet=1000, missed_amount=2000)
+    for round_ in range(4):
+        for i in range(30):
+            engine.store.append_decision({"user_id": f"USR{i:03d}", "offer": round_, "expiry": 7,
+                                          "reason": f"round {round_}", "timestamp": str(round_)})
+    decisions = engine.negotiation_summary()["decisions"]
+    assert len(decisions) == 120
+    assert [d["offer"] for d in decisions.for_user("USR007", 3)] == [1, 2, 3]
+    assert decisions.for_user("NOBODY", 3) == []
+    page = decisions.page(55, 10)
+    assert [(d["user_id"], d["offer"]) for d in page] == [(f"USR{i:03d}", 1) for i in range(25, 30)] + \
+        [(f"USR{i:03d}", 2) for i in range(5)]
+    assert list(decisions)[55:65] == page
+
+
+def test_decide_offers_matches_decide_offer():
+    rng = np.random.default_rng(0)
+    wallet = np.concatenate([rng.integers(0, 5000, 5000), [0, 1000, 1000, 1000, 200]])
+    missed = np.concatenate([rng.integers(0, 8000, 5000), [500, 1200, 800, 4000, 0]])
+    offers, expiries, ratios = decide_offers(wallet, missed)
+    for i in range(len(wallet)):
+        entry = {"name": "X", "wallet": int(wallet[i]), "missed_amount": int(missed[i])}
+        offer, expiry, _, reason = decide_offer(entry)
+        assert (offers[i], expiries[i]) == (offer, expiry)
+        assert decision_reason({"offer": int(offers[i]), "expiry": int(expiries[i]), "reason": None,
+                                "ratio": float(ratios[i])}) == reason
+
+
+def test_bulk_campaign_matches_per_user_policy(engine):
+    reference = NegotiationEngine(MemoryNegotiationStore())
+    for target in (engine, reference):
+        for i in range(200):
+            target.get_or_create_demo_user(f"USR{i:03d}", name=f"N{i}", wallet=100 + 37 * i, missed_amount=3000 - 11 * i)
+    assert engine.auto_negotiate_all(bulk=True) == reference.auto_negotiate_all()
+
+    assert engine.store.status_counts() == reference.store.status_counts()
+    expected = {d["user_id"]: d for d in reference.store.decisions}
+    assert [d["user_id"] for d in engine.store.decisions] == list(expected)
+    for decision in engine.store.decisions:
+        assert decision_reason(decision) == expected[decision["user_id"]]["reason"]
+    for user_id, entry in reference.store.negotiations.items():
+        bulk = engine.store.get(user_id)
+        assert (bulk["status"], bulk["offer_amount"], bulk["expiry_days"]) == \
+            (entry["status"], entry["offer_amount"], entry["expiry_days"])
+        assert offer_message(bulk) == entry["last_message"]
+
+    sent = engine.send_offer_message("USR150")
+    assert sent["last_message"] == reference.store.get("USR150")["last_message"]
+    assert [m["role"] for m in engine.store.chat_history("USR150")] == ["agent"]
+
+
+def test_offers_expire_on_simulated_clock(engine):
+    engine.clock = SimulatedClock(start=1_700_000_000_000_000)
+    engine.seed_demo_users()
+    engine.start_negotiation("USR1003")  # 5-day expiry
+    engine.clock.advance(days=3)
+    engine.auto_negotiate_all(bulk=True)  # USR1001 / USR1002 10 days, USR1004 14 days
+    engine.accept_offer("USR1004")
+
+    engine.clock.advance(days=5)
+    assert engine.expire_offers() == 1
+    assert engine.store.get("USR1003")["status"] == "pending"
+    engine.clock.advance(days=4)
+    assert engine.expire_offers() == 0
+    engine.clock.advance(days=1)
+    assert engine.expire_offers() == 2
+    assert engine.store.status_counts() == {"pending": 3, "offer_sent": 0, "restructured": 1, "rejected": 0}
+    assert engine.store.get("USR1003")["started_at"] == 1_700_000_000_000_000
+    assert engine.store.recent_log(1)[0] == (engine.clock.now(), "Offer to USR1002 expired after 10 days")
+
+
+def test_expired_offer_is_dispatched_again(engine):
+    engine.clock = SimulatedClock(start=1_700_000_000_000_000)
+    engine.seed_demo_users()
+    engine.auto_negotiate_all(bulk=True)
+    gateway = FakeGateway(latency=0.001)
+    assert asyncio.run(OfferDispatcher(engine, {'sms': gateway}).run_once())['delivered'] == 4
+
+    engine.clock.advance(days=14)
+    assert engine.expire_offers() == 4  # as the campaign command does: expire, then re-offer
+    assert engine.store.get("USR1001")["delivery_status"] is None
+    assert engine.auto_negotiate_all(bulk=True) == 4
+    assert sorted(engine.store.undelivered_offers()) == ["USR1001", "USR1002", "USR1003", "USR1004"]
+    stats = asyncio.run(OfferDispatcher(engine, {'sms': gateway}).run_once())
+    assert (stats['delivered'], stats['skipped']) == (4, 0) and len(gateway.sent) == 8
@@ -0,0 +1,40 @@
+"""
+Verification tests for startup profiling and deferred imports (aura.profiling).
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from aura.profiling import PhaseTimer, import_costs, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     numpy._core
+import time:       300 |        420 |   numpy
+import time:        50 |        470 | app
+"""
+
+
+def test_phase_timer_splits_run_into_phases():
+    timer = PhaseTimer()
+    timer.mark("imports")
+    timer.mark("render")
+    assert [name for name, _ in timer.phases] == ["imports", "render"]
+    assert sum(seconds for _, seconds in timer.phases) == timer.total
+    assert timer.report().splitlines()[0].startswith("Startup profile:")
+
+
+def test_importtime_is_parsed_per_module_and_package():
+    rows = parse_importtime(IMPORTTIME)
+    assert rows == [("numpy._core", 2, 0.00012, 0.00012), ("numpy", 1, 0.0003, 0.00042), ("app", 0, 0.00005, 0.00047)]
+    assert import_costs(rows) == pytest.approx({"numpy": 0.00042, "app": 0.00005})
+
+
+def test_engine_imports_do_not_load_sklearn_or_plotly():
+    code = ("import sys, aura.data, aura.agents, aura.artifacts, aura.negotiation, aura.score_cache\n"
+            "from aura import NegotiationEngine\n"
+            "print(sorted({'sklearn', 'plotly', 'joblib'} & {m.split('.')[0] for m in sys.modules}))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
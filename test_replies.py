@@ -0,0 +1,61 @@
+"""
+Verification tests for inbound reply parsing (aura.replies).
+"""
+
+import pytest
+
+from aura.replies import parse_replies, parse_reply
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("300", ("counter", 300)),
+    ("₹1,500", ("counter", 1500)),
+    ("Rs. 1,50,000", ("counter", 150000)),
+    ("1.5k", ("counter", 1500)),
+    ("2 lakh", ("counter", 200000)),
+    ("1.2L", ("counter", 120000)),
+    ("2.5 lakh", ("counter", 250000)),
+    ("₹2.5 lakh", ("counter", 250000)),
+    ("1.2 L", ("counter", 120000)),
+    ("1.5 k", ("counter", 1500)),
+    ("I can pay 1.5 k", ("counter", 1500)),
+    ("pay 12.50 today", ("counter", 12)),
+    ("pay 12.75 today", ("counter", 13)),
+    ("pay on 05.11.2025 about 400", ("counter", 400)),
+    ("₹३००", ("counter", 300)),
+    ("मैं १५०० दे सकता हूँ", ("counter", 1500)),
+    ("I can pay 300 on the 5th", ("counter", 300)),
+    ("On the 5th I can pay 300", ("counter", 300)),
+    ("pay on 5/11 about 400", ("counter", 400)),
+    ("in 10 days I can give ₹250", ("counter", 250)),
+    ("can't pay 500, can do 300", ("counter", 300)),
+    ("3 lakh 50 thousand", ("counter", 350000)),
+    ("2 lakh and 20,000", ("counter", 220000)),
+    ("I can pay on 15 Nov 300", ("counter", 300)),
+    ("15th of May 250", ("counter", 250)),
+    ("on 15 I can pay 300", ("counter", 300)),
+    ("I'll settle on 500", ("counter", 500)),
+    ("2 installments of 300", ("counter", 300)),
+    ("pay 300 in 3 parts", ("counter", 300)),
+    ("not 500, 400", ("counter", 400)),
+    ("call +91 98765 43210, I can pay 300", ("counter", 300)),
+    ("call me at 9876543210", ("unknown", None)),
+    ("I cannot pay 500", ("refuse", None)),
+    ("I can't afford this", ("refuse", None)),
+    ("I can't wait, yes", ("accept", None)),
+    ("won't accept", ("refuse", None)),
+    ("no", ("refuse", None)),
+    ("नहीं", ("refuse", None)),
+    ("Yes, deal", ("accept", None)),
+    ("No problem, I accept", ("accept", None)),
+    ("हाँ", ("accept", None)),
+    ("who is this?", ("unknown", None)),
+    ("0", ("counter", 0)),
+    ("ok 0", ("counter", 0)),
+])
+def test_parse_reply(text, expected):
+    assert parse_reply(text) == expected
+
+
+def test_parse_replies_keeps_order():
+    assert parse_replies(["ok", "₹1,500", "stop"]) == [("accept", None), ("counter", 1500), ("refuse", None)]
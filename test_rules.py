@@ -0,0 +1,48 @@
+"""
+Verification tests for the vectorised rule tables (aura.rules).
+"""
+
+import numpy as np
+
+from aura.agents import risk_status
+from aura.data import generate_synthetic_dataset
+from aura.rules import (
+    RISK_FACTOR_RULES,
+    STATUS_TIERS,
+    WEAK_AREA_RULES,
+    describe_risk_mask,
+    row_rule_mask,
+    rule_mask,
+    status_tier_codes,
+    weak_areas_from_mask,
+)
+
+
+def test_vector_masks_match_scalar_rules():
+    df = generate_synthetic_dataset()
+    for rules in (RISK_FACTOR_RULES, WEAK_AREA_RULES):
+        masks = rule_mask(df, rules)
+        assert masks.dtype == np.uint8
+        for mask, (_, row) in zip(masks, df.iterrows()):
+            assert mask == row_rule_mask(row, rules)
+
+
+def test_mask_bits_decode_to_strings():
+    row = {
+        'network_usage_stability': 0.42,
+        'utility_payment_timeliness': 0.65,
+        'device_usage_consistency': 0.9,
+        'mobility_score': 0.55,
+    }
+    assert row_rule_mask(row, RISK_FACTOR_RULES) == 0b0001
+    assert describe_risk_mask(0b0001, row) == ["Unstable network usage (0.42)"]
+
+    weak = weak_areas_from_mask(row_rule_mask(row, WEAK_AREA_RULES), row)
+    assert [w['area'] for w in weak] == ['Network Usage Stability', 'Location Stability', 'Utility Payment Timeliness']
+
+
+def test_status_tier_codes_match_scalar_tiering():
+    probs = np.array([0.0, 0.25, 0.2500001, 0.45, 0.4500001, 1.0])
+    codes = status_tier_codes(probs)
+    assert codes.tolist() == [0, 0, 1, 1, 2, 2]
+    assert [STATUS_TIERS[c] for c in codes] == [risk_status(p) for p in probs]
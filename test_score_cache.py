@@ -0,0 +1,53 @@
+"""
+Verification tests for incremental rescoring (aura.score_cache).
+"""
+
+import pandas as pd
+import pytest
+
+from aura.agents import score_portfolio
+from aura.data import generate_synthetic_dataset
+from aura.model import train_model
+from aura.score_cache import ScoreCache
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    df = generate_synthetic_dataset()
+    model, scaler, feature_cols, _ = train_model(df)
+    return df, model, scaler, feature_cols
+
+
+def test_only_changed_rows_are_rescored(fitted):
+    df, model, scaler, feature_cols = fitted
+    cache = ScoreCache()
+    first = cache.score_portfolio(df, model, scaler, feature_cols, "v1")
+    pd.testing.assert_frame_equal(first, score_portfolio(df, model, scaler, feature_cols))
+    assert (cache.hits, cache.misses) == (0, len(df))
+
+    refreshed = df.copy()
+    refreshed.loc[[3, 7], 'utility_payment_timeliness'] = 0.31
+    second = cache.score_portfolio(refreshed, model, scaler, feature_cols, "v1")
+    pd.testing.assert_frame_equal(second, score_portfolio(refreshed, model, scaler, feature_cols))
+    assert (cache.hits, cache.misses) == (len(df) - 2, len(df) + 2)
+
+
+def test_model_version_change_invalidates(fitted):
+    df, model, scaler, feature_cols = fitted
+    cache = ScoreCache()
+    cache.score_portfolio(df, model, scaler, feature_cols, "v1")
+    cache.score_portfolio(df, model, scaler, feature_cols, "v2")
+    assert cache.hits == 0 and cache.misses == 2 * len(df)
+
+
+def test_eviction_keeps_most_recently_used(fitted):
+    df, model, scaler, feature_cols = fitted
+    cache = ScoreCache(max_entries=100)
+    cache.score_portfolio(df.iloc[:100], model, scaler, feature_cols, "v1")
+    cache.score_portfolio(df.iloc[:10], model, scaler, feature_cols, "v1")
+    cache.score_portfolio(df.iloc[100:], model, scaler, feature_cols, "v1")
+    assert len(cache) == 100
+
+    hits = cache.hits
+    cache.score_portfolio(df.iloc[:10], model, scaler, feature_cols, "v1")
+    assert cache.hits == hits + 10
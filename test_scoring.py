@@ -0,0 +1,90 @@
+"""
+Verification tests for the headless AURA scoring engine (aura package).
+Run with: python -m pytest -q test_scoring.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aura.data import generate_synthetic_dataset
+from aura.model import train_model
+from aura.agents import (
+    risk_status,
+    risk_management_agent_logic,
+    score_portfolio,
+    agent_output_from_score,
+    assemble_scores,
+    query_alerts,
+    score_csv,
+)
+
+
+@pytest.fixture(scope="module")
+def portfolio():
+    df = generate_synthetic_dataset()
+    model, scaler, feature_cols, metrics = train_model(df)
+    return df, model, scaler, feature_cols
+
+
+def test_risk_status_tiers():
+    assert risk_status(0.46) == 'High Risk - Defaulted'
+    assert risk_status(0.45) == 'At Risk'
+    assert risk_status(0.26) == 'At Risk'
+    assert risk_status(0.25) == 'Active & Healthy'
+
+
+def test_batch_status_counts_use_the_same_tiers(portfolio):
+    df = portfolio[0].head(6)
+    probs = np.array([0.0, 0.25, 0.2500001, 0.45, 0.4500001, 1.0])
+    scored = assemble_scores(df, probs)
+    assert scored['status'].tolist() == [risk_status(p) for p in probs]
+    assert scored['status'].value_counts().to_dict() == {
+        'Active & Healthy': 2, 'At Risk': 2, 'High Risk - Defaulted': 2}
+
+
+def test_batch_scoring_matches_per_row_agent(portfolio):
+    df, model, scaler, feature_cols = portfolio
+    scored = score_portfolio(df, model, scaler, feature_cols)
+    assert list(scored.index) == list(df.index)
+    for idx, row in df.iterrows():
+        expected = risk_management_agent_logic(row, model, scaler, feature_cols)
+        assert agent_output_from_score(scored.loc[idx]) == expected
+
+
+def test_score_csv_streams_chunks(portfolio, tmp_path):
+    df, model, scaler, feature_cols = portfolio
+    src, dst = tmp_path / "portfolio.csv", tmp_path / "scores.csv"
+    df.to_csv(src, index=False)
+
+    total = score_csv(src, dst, model, scaler, feature_cols, chunksize=32)
+
+    out = pd.read_csv(dst)
+    expected = score_portfolio(pd.read_csv(src), model, scaler, feature_cols)
+    assert total == len(df) == len(out)
+    assert list(out['user_id']) == list(expected['user_id'])
+    assert list(out['status']) == list(expected['status'])
+    assert out['probability'].tolist() == pytest.approx(expected['probability'].tolist())
+    assert 'network_usage_stability' not in out.columns
+    assert out['risk_mask'].tolist() == expected['risk_mask'].tolist()
+
+
+def test_query_alerts_pages_filtered_sorted_tier(portfolio):
+    df, model, scaler, feature_cols = portfolio
+    scored = score_portfolio(df, model, scaler, feature_cols)
+    at_risk = scored[scored['status'] == 'At Risk']
+    expected = at_risk.sort_values('probability', ascending=False, kind='stable')
+
+    pages = [query_alerts(scored, 'At Risk', offset=offset, limit=7) for offset in range(0, len(at_risk), 7)]
+    assert {total for _, total in pages} == {len(at_risk)}
+    assert list(pd.concat([page for page, _ in pages]).index) == list(expected.index)
+
+    location = at_risk['location'].iloc[0]
+    page, total = query_alerts(scored, 'At Risk', sort_by='loan_amount', descending=False,
+                               probability_range=(0.3, 0.4), loan_range=(0, 60_000), locations=[location])
+    matches = at_risk[at_risk['probability'].between(0.3, 0.4) & (at_risk['loan_amount'] <= 60_000)
+                      & (at_risk['location'] == location)]
+    assert total == len(matches)
+    assert list(page.index) == list(matches.sort_values('loan_amount', kind='stable').index[:20])
+    with pytest.raises(ValueError):
+        query_alerts(scored, 'At Risk', sort_by='user_id')
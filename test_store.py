@@ -0,0 +1,93 @@
+"""
+Verification tests for the memory-mapped column store (aura.store).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aura.agents import SCORING_COLS
+from aura.data import generate_synthetic_dataset, load_borrower, load_data, write_synthetic_dataset
+from aura.store import build_store, is_column_store
+
+
+@pytest.fixture
+def csv_portfolio(tmp_path):
+    df = generate_synthetic_dataset()
+    path = tmp_path / "portfolio.csv"
+    df.to_csv(path, index=False)
+    return df, str(path)
+
+
+def test_store_roundtrip_from_csv(csv_portfolio, tmp_path):
+    df, csv_path = csv_portfolio
+    store = build_store(csv_path, str(tmp_path / "store"), chunksize=40)
+    assert len(store) == len(df)
+    assert store.schema['last_active_location']['kind'] == 'category'
+    assert store.schema['user_id']['kind'] == 'string'
+    assert isinstance(store.raw('loan_amount'), np.memmap)
+
+    back = store.read()
+    df = pd.read_csv(csv_path)
+    for col in df.columns:
+        assert back[col].astype(df[col].dtype).tolist() == df[col].tolist()
+
+
+def test_load_data_projects_columns(csv_portfolio, tmp_path):
+    df, csv_path = csv_portfolio
+    store_path = str(tmp_path / "store")
+    build_store(csv_path, store_path)
+    assert is_column_store(store_path)
+
+    projected = load_data(store_path, columns=SCORING_COLS)
+    assert list(projected.columns) == SCORING_COLS
+    assert projected['user_id'].tolist() == df['user_id'].tolist()
+    assert list(load_data(csv_path, columns=['user_id', 'loan_amount']).columns) == ['user_id', 'loan_amount']
+
+
+def test_load_borrower_reads_one_row(csv_portfolio, tmp_path):
+    df, csv_path = csv_portfolio
+    store_path = str(tmp_path / "store")
+    build_store(csv_path, store_path)
+
+    row = load_borrower('USR1042', store_path)
+    expected = df[df['user_id'] == 'USR1042'].iloc[0]
+    assert row['user_id'] == 'USR1042'
+    assert row['mobility_score'] == expected['mobility_score']
+    assert row['last_active_location'] == expected['last_active_location']
+    assert load_borrower('USR9999', store_path) is None
+    assert load_borrower('USR1042', csv_path)['loan_amount'] == expected['loan_amount']
+
+
+def test_build_from_parquet_chunks(tmp_path):
+    write_synthetic_dataset(tmp_path / "chunks", 2500, chunk_size=1000, root_seed=5)
+    store = build_store(str(tmp_path / "chunks"), str(tmp_path / "store"), chunksize=700)
+    expected = pd.read_parquet(tmp_path / "chunks")
+    assert len(store) == 2500
+    assert store.read(['user_id'])['user_id'].tolist() == expected['user_id'].tolist()
+    np.testing.assert_array_equal(store.read(['default_label'], rows=slice(1000, 1010))['default_label'],
+                                  expected['default_label'].to_numpy()[1000:1010])
+
+
+def test_numeric_dtype_is_widened_across_chunks(tmp_path):
+    path = tmp_path / "mixed.csv"
+    amounts = [str(1000 + i) for i in range(1500)] + ["2500.75"]
+    pd.DataFrame({'user_id': [f"U{i}" for i in range(1501)], 'loan_amount': amounts}).to_csv(path, index=False)
+    store = build_store(str(path), str(tmp_path / "store"), chunksize=500)
+    assert store.schema['loan_amount']['dtype'] == '<f8'
+    assert store.read(['loan_amount'])['loan_amount'].iloc[-1] == 2500.75
+
+    pd.DataFrame({'user_id': [f"U{i}" for i in range(1501)], 'loan_amount': amounts[:-1] + ["unknown"]}).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="loan_amount"):
+        build_store(str(path), str(tmp_path / "bad"), chunksize=500)
+
+
+def test_non_ascii_user_ids(tmp_path):
+    ids = ['USR1', 'उपयोगकर्ता-2', 'Zoë-3']
+    path = tmp_path / "utf8.csv"
+    pd.DataFrame({'user_id': ids, 'loan_amount': [100, 200, 300]}).to_csv(path, index=False)
+    store = build_store(str(path), str(tmp_path / "store"))
+    assert store.schema['user_id']['dtype'] == f"|S{len(ids[1].encode('utf-8'))}"
+    assert store.read(['user_id'])['user_id'].tolist() == ids
+    assert store.find('Zoë-3') == 2 and store.row('उपयोगकर्ता-2')['loan_amount'] == 200
+    assert store.find('उपयोगकर्ता-2-and-longer') is None
@@ -0,0 +1,43 @@
+"""
+Verification tests for the parallel hyperparameter search (aura.tuning).
+"""
+
+import pytest
+
+from aura.data import generate_synthetic_dataset
+from aura.model import MODEL_PARAMS, train_model
+from aura.tuning import search_model
+
+SMALL_SPACE = {'n_estimators': [5, 10], 'max_depth': [4, 8], 'min_samples_split': [2, 10]}
+
+
+@pytest.fixture(scope="module")
+def df():
+    return generate_synthetic_dataset(400)
+
+
+def test_search_reports_every_candidate(df):
+    model, scaler, feature_cols, metrics = search_model(df, SMALL_SPACE, time_budget=120, workers=2)
+    assert len(metrics['search']) == 8
+    for report in metrics['search']:
+        assert set(report) == {'params', 'val_accuracy', 'val_auc', 'fit_seconds', 'predict_seconds'}
+    best = metrics['search'][0]['params']
+    assert metrics['best_params'] == {**MODEL_PARAMS, **best}
+    assert model.n_estimators == best['n_estimators']
+    assert 0.0 <= metrics['test_accuracy'] <= 1.0
+
+
+def test_refit_matches_train_model(df):
+    model, scaler, feature_cols, metrics = search_model(df, SMALL_SPACE, time_budget=120, workers=2)
+    _, _, _, expected = train_model(df, metrics['best_params'])
+    assert metrics['test_accuracy'] == expected['test_accuracy']
+
+
+def test_searched_forest_is_truncated_to_best_size(df):
+    model, scaler, feature_cols, metrics = search_model(df, SMALL_SPACE, time_budget=120, workers=2, refit=False)
+    assert len(model.estimators_) == metrics['best_params']['n_estimators']
+
+
+def test_exhausted_budget_raises(df):
+    with pytest.raises(RuntimeError):
+        search_model(df, SMALL_SPACE, time_budget=0, workers=1)